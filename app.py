@@ -1,42 +1,877 @@
+import atexit
+import bisect
+import contextvars
+import csv
+import functools
+import io
+import json
+import logging
+import logging.handlers
+import math
 import os
+import queue
+import re
 import sqlite3
-from datetime import datetime, date
-from typing import Any, Dict, List, Tuple
+import threading
+import time
+import uuid
+import zipfile
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
+from datetime import datetime, date, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+from urllib.parse import parse_qsl, urlencode
+from xml.sax.saxutils import escape as xml_escape
 
-from flask import Flask, jsonify, request, render_template
+from flask import Flask, Response, g, has_request_context, jsonify, request, render_template
 from flask_cors import CORS
+from werkzeug.exceptions import HTTPException
 
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'kdt_dashboard.db')
 
+# Connection pool settings (KDT_DB_POOL_SIZE=0 disables pooling)
+DB_POOL_SIZE = int(os.environ.get('KDT_DB_POOL_SIZE', 8))
+DB_WRITE_POOL_SIZE = int(os.environ.get('KDT_DB_WRITE_POOL_SIZE', 2))
+DB_POOL_TIMEOUT = float(os.environ.get('KDT_DB_POOL_TIMEOUT', 10))
+# 한 요청 안의 독립적인 읽기 쿼리를 동시에 실행할 스레드 수 (0이면 순차 실행)
+READ_FANOUT_WORKERS = int(os.environ.get('KDT_READ_FANOUT_WORKERS', 2))
+# WSGI environ 키: False면 그 요청은 fan-out 없이 순차로 읽는다 (asgi.py가 이미 동시에 돌리는 부분 요청)
+READ_FANOUT_ENVIRON = 'kdt.read_fanout'
+
+# SQLite storage settings, applied by configure_sqlite()
+SQLITE_JOURNAL_MODE = os.environ.get('KDT_SQLITE_JOURNAL_MODE', 'WAL').upper()
+SQLITE_SYNCHRONOUS = os.environ.get('KDT_SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+SQLITE_CACHE_SIZE = int(os.environ.get('KDT_SQLITE_CACHE_SIZE', -20000))  # 음수: KiB 단위
+SQLITE_MMAP_SIZE = int(os.environ.get('KDT_SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+SQLITE_TEMP_STORE = os.environ.get('KDT_SQLITE_TEMP_STORE', 'MEMORY').upper()
+
+if SQLITE_JOURNAL_MODE not in ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'):
+    raise ValueError(f"invalid KDT_SQLITE_JOURNAL_MODE: {SQLITE_JOURNAL_MODE}")
+if SQLITE_SYNCHRONOUS not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+    raise ValueError(f"invalid KDT_SQLITE_SYNCHRONOUS: {SQLITE_SYNCHRONOUS}")
+if SQLITE_TEMP_STORE not in ('DEFAULT', 'FILE', 'MEMORY'):
+    raise ValueError(f"invalid KDT_SQLITE_TEMP_STORE: {SQLITE_TEMP_STORE}")
+
+
+def configure_sqlite(conn: sqlite3.Connection, readonly: bool = False) -> None:
+    """Apply per-connection PRAGMAs; read connections are also made query-only."""
+    conn.execute(f"PRAGMA synchronous = {SQLITE_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = {SQLITE_CACHE_SIZE}")
+    conn.execute(f"PRAGMA mmap_size = {SQLITE_MMAP_SIZE}")
+    conn.execute(f"PRAGMA temp_store = {SQLITE_TEMP_STORE}")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON")
+
+
+# Logging settings (KDT_LOG_LEVEL=DEBUG enables per-request trace logs)
+LOG_LEVEL = os.environ.get('KDT_LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = '%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s'
+REQUEST_ID_HEADER = 'X-Request-ID'
+REQUEST_ID_PATTERN = re.compile(r'[A-Za-z0-9._-]{1,64}')
+
+if LOG_LEVEL not in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'):
+    raise ValueError(f"invalid KDT_LOG_LEVEL: {LOG_LEVEL}")
+
+logger = logging.getLogger('kdt_dashboard')
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the current request's correlation id ('-' outside requests)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, 'request_id'):
+            record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+def configure_logging() -> None:
+    """Send kdt_dashboard logs through a queue; a listener thread does the actual stream I/O."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    logger.addHandler(queue_handler)
+    logger.setLevel(LOG_LEVEL)
+    logger.propagate = False
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+def _restart_logging_after_fork() -> None:
+    # 리스너 스레드는 fork된 자식에 없으므로 (pre-fork 서버 워커) 큐와 리스너를 새로 만든다
+    global _log_listener
+    if _log_listener is None:
+        return
+    for handler in [h for h in logger.handlers if isinstance(h, logging.handlers.QueueHandler)]:
+        logger.removeHandler(handler)
+    _log_listener = None
+    configure_logging()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_logging_after_fork)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Cursor that charges fetch time and fetched rows to the statement that produced it."""
+
+    metrics: 'RequestMetrics | None' = None
+    sql_key = ''
+
+    def _charge(self, started: float, rows: int) -> None:
+        if self.metrics is not None:
+            self.metrics.observe_sql(self.sql_key, time.perf_counter() - started, rows, False)
+
+    def fetchone(self) -> Any:
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._charge(started, row is not None)
+        return row
+
+    def fetchmany(self, size: int = -1) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size < 0 else size)
+        self._charge(started, len(rows))
+        return rows
+
+    def fetchall(self) -> List[Any]:
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._charge(started, len(rows))
+        return rows
+
+    def __iter__(self):
+        # 행마다 시간을 재지 않도록 묶음 단위로 가져온다
+        while True:
+            rows = self.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3 connection that records each execute()/executemany() in ``metrics`` (None: no-op)."""
+
+    metrics: 'RequestMetrics | None' = None
+
+    def _timed(self, method: Callable, sql: str, params: Any) -> sqlite3.Cursor:
+        cur = self.cursor(TimedCursor)
+        started = time.perf_counter()
+        method(cur, sql, params)
+        elapsed = time.perf_counter() - started
+        cur.metrics = self.metrics
+        cur.sql_key = normalize_sql(sql)
+        # SELECT 행 수는 fetch 시점에 더하고, DML은 영향받은 행 수를 쓴다
+        rows = max(cur.rowcount, 0) if cur.description is None else 0
+        self.metrics.observe_sql(cur.sql_key, elapsed, rows, True)
+        return cur
+
+    def execute(self, sql: str, parameters: Any = ()) -> sqlite3.Cursor:
+        if self.metrics is None:
+            return super().execute(sql, parameters)
+        return self._timed(sqlite3.Cursor.execute, sql, parameters)
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        if self.metrics is None:
+            return super().executemany(sql, seq_of_parameters)
+        return self._timed(sqlite3.Cursor.executemany, sql, seq_of_parameters)
+
+
+class PooledConnection(TimedConnection):
+    """sqlite3 connection whose close() hands it back to its pool."""
+
+    pool: 'ConnectionPool | None' = None
+    checked_out = False
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def discard(self) -> None:
+        self.pool = None
+        super().close()
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of SQLite connections.
+
+    Connections are created lazily up to ``size``; acquire() blocks for at most
+    ``timeout`` seconds when all of them are checked out (with wait=False it
+    returns None at once instead). Idle connections are health-checked before
+    reuse and replaced if broken.
+    """
+
+    def __init__(self, db_path: str, size: int, timeout: float, init: Callable[[sqlite3.Connection], None]):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.init = init
+        self._idle: 'queue.LifoQueue[PooledConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self) -> PooledConnection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False, factory=PooledConnection)
+        self.init(conn)
+        conn.pool = self
+        return conn
+
+    def acquire(self, wait: bool = True) -> PooledConnection | None:
+        if not (self._slots.acquire(timeout=self.timeout) if wait else self._slots.acquire(blocking=False)):
+            if not wait:
+                return None
+            raise sqlite3.OperationalError('connection pool exhausted')
+        try:
+            conn = None
+            while conn is None:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    conn = self._connect()
+                    break
+                try:
+                    conn.execute('SELECT 1').fetchone()
+                except sqlite3.Error:
+                    conn.discard()
+                    conn = None
+            conn.checked_out = True
+            return conn
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: PooledConnection) -> None:
+        if not conn.checked_out:
+            return
+        conn.checked_out = False
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put(conn)
+        except sqlite3.Error:
+            conn.discard()
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().discard()
+            except queue.Empty:
+                break
+
+
+DATE_COLUMNS = ('개강일', '종강일', '개강', '종강')
+ISO_DATE_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+# 저장된 날짜를 ISO로 한 번 정규화하는 시작 시 작업 (KDT_MIGRATE_DATES=0 disables)
+MIGRATE_DATES = os.environ.get('KDT_MIGRATE_DATES', '1') == '1'
+# 월별 테이블의 N개월차 열 (1M, 2M, ...)
+MONTH_COLUMN = re.compile(r'^([1-9][0-9]*)M$')
+# 과정명/과정코드 부분 문자열 검색용 FTS5 trigram 색인 (KDT_PROGRAM_NAME_FTS=0 disables)
+PROGRAM_NAME_FTS = os.environ.get('KDT_PROGRAM_NAME_FTS', '1') == '1'
+PROGRAM_NAME_COLUMNS = ('HRD_Net_과정명', '과정명', '과정코드')
+
+
+class KpiPeriod(NamedTuple):
+    """KPI reporting period.
+
+    year: 모집률/수료율/만족도 대상 종강 연도
+    window_start/window_end: 취업률 대상 종강일 윈도우 (양 끝 포함)
+    excluded_teams: 수료율/만족도에서 제외할 담당팀 (소문자)
+    """
+    year: int
+    window_start: date
+    window_end: date
+    excluded_teams: Tuple[str, ...]
+
+
+class KpiPeriodError(ValueError):
+    """Invalid KPI period arguments (period=/window_start=/window_end=); routes answer 400."""
+
+
+def make_kpi_period(year: int, window_start: date | None = None, window_end: date | None = None,
+                    excluded_teams: Any = None) -> KpiPeriod:
+    # 기본 취업률 윈도우: 전년도 7/1 ~ 대상 연도 6/30
+    window_start = window_start or date(year - 1, 7, 1)
+    window_end = window_end or date(year, 6, 30)
+    if window_start > window_end:
+        raise KpiPeriodError(f"window_start({window_start}) must not be after window_end({window_end})")
+    if excluded_teams is None:
+        excluded_teams = ('impact hub',)
+    elif isinstance(excluded_teams, str):
+        excluded_teams = excluded_teams.split(',')
+    teams = tuple(sorted({str(t).strip().lower() for t in excluded_teams if str(t).strip()}))
+    return KpiPeriod(year, window_start, window_end, teams)
+
+
+# Default KPI reporting period; requests can pick another with period= / window_start= / window_end= / exclude_teams=
+DEFAULT_KPI_PERIOD = make_kpi_period(
+    int(os.environ.get('KDT_KPI_PERIOD_YEAR', 2025)),
+    date.fromisoformat(os.environ['KDT_KPI_WINDOW_START']) if os.environ.get('KDT_KPI_WINDOW_START') else None,
+    date.fromisoformat(os.environ['KDT_KPI_WINDOW_END']) if os.environ.get('KDT_KPI_WINDOW_END') else None,
+    os.environ.get('KDT_KPI_EXCLUDED_TEAMS'),
+)
+KPI_PERIOD_ARGS = ('period', 'window_start', 'window_end', 'exclude_teams')
+# 만족도는 10^-6 단위 정수로 더한다: 행/SQL 그룹/버킷 증분 어느 순서로 더해도 합이 같아 반올림 결과가 일치한다
+SATISFACTION_SCALE = 1_000_000
+
+# Batch / tab views: 한 요청으로 여러 GET 조회를 돌려준다 (POST /api/batch, GET /api/views/<tab>)
+BATCH_MAX_REQUESTS = int(os.environ.get('KDT_BATCH_MAX_REQUESTS', 20))
+# 탭 -> (응답 키, 경로, 넘겨줄 쿼리 인자)
+BATCH_VIEWS = {
+    'dashboard': (
+        ('kpi', '/api/dashboard/kpi', ('year', 'quarter', 'category', 'status') + KPI_PERIOD_ARGS),
+        ('trends', '/api/dashboard/trends', ('year',) + KPI_PERIOD_ARGS),
+    ),
+    'business': (
+        ('revenue_metrics', '/api/business/revenue-metrics', ('year',)),
+        ('yearly_monthly_revenue', '/api/business/yearly-monthly-revenue', ('year', 'program_like')),
+        ('monthly_expected', '/api/business/monthly-expected', ('year', 'month', 'program_like')),
+    ),
+}
+
+# In-process columnar snapshot of kdt_programs for the KPI endpoints (KDT_PROGRAM_SNAPSHOT=1 enables)
+PROGRAM_SNAPSHOT = os.environ.get('KDT_PROGRAM_SNAPSHOT', '0') == '1'
+
+# KPI sums per (년도, 분기, 팀, 상태, 종강 월) bucket, delta-updated on every program write (KDT_KPI_BUCKETS=0 disables)
+KPI_BUCKETS = os.environ.get('KDT_KPI_BUCKETS', '1') == '1'
+
+# Result cache for read-only analytics endpoints (KDT_RESULT_CACHE_SIZE=0 disables)
+RESULT_CACHE_SIZE = int(os.environ.get('KDT_RESULT_CACHE_SIZE', 256))
+RESULT_CACHE_TTL = float(os.environ.get('KDT_RESULT_CACHE_TTL', 300))
+
+
+class ResultCache:
+    """Thread-safe LRU cache with a per-entry TTL and hit/miss counters."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: 'OrderedDict[Any, Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return None
+
+    def set(self, key: Any, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+            }
+
+
+# Request / SQL metrics (KDT_METRICS=0 disables); 분위수는 라우트별 최근 KDT_METRICS_WINDOW건으로 계산
+METRICS_ENABLED = os.environ.get('KDT_METRICS', '1') == '1'
+METRICS_WINDOW = int(os.environ.get('KDT_METRICS_WINDOW', 1024))
+METRICS_MAX_STATEMENTS = 200
+METRICS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SQL_IN_LIST = re.compile(r'\(\?(?:\s*,\s*\?)+\)')
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and IN (?, ?, ...) lists so one query shape is one metrics key."""
+    return SQL_IN_LIST.sub('(?, ...)', ' '.join(sql.split()))[:300]
+
+
+class LatencySeries:
+    """Cumulative histogram (METRICS_BUCKETS) plus a window of recent samples for p50/p95/p99."""
+
+    def __init__(self, window: int):
+        self.buckets = [0] * (len(METRICS_BUCKETS) + 1)
+        self.sum = 0.0
+        self.max = 0.0
+        self.recent: 'deque[float]' = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect.bisect_left(METRICS_BUCKETS, seconds)] += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.recent.append(seconds)
+
+    def summary(self, count: int) -> Dict[str, float]:
+        recent = sorted(self.recent)
+
+        def pct(p: float) -> float:
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3) if recent else 0.0
+
+        return {
+            'p50': pct(0.50),
+            'p95': pct(0.95),
+            'p99': pct(0.99),
+            'mean': round(self.sum / count * 1000, 3) if count else 0.0,
+            'max': round(self.max * 1000, 3),
+        }
+
+
+class RouteStats:
+    def __init__(self, window: int):
+        self.count = 0
+        self.statuses: Dict[int, int] = {}
+        self.total = LatencySeries(window)
+        self.sql = LatencySeries(window)
+        self.python = LatencySeries(window)
+        self.sql_statements = 0
+        self.sql_rows = 0
+
+
+class RequestMetrics:
+    """Thread-safe per-route latency histograms and per-statement SQL totals.
+
+    SQL time is charged to the current request (flask.g) as well as to the
+    statement; Python time is the rest of the request's wall time.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.started = time.time()
+        self.routes: Dict[Tuple[str, str], RouteStats] = {}
+        # normalized SQL -> [calls, seconds, rows, max seconds]
+        self.statements: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.started = time.time()
+            self.routes.clear()
+            self.statements.clear()
+
+    def observe_sql(self, key: str, seconds: float, rows: int, executed: bool) -> None:
+        if has_request_context():
+            acc = g.get('sql_metrics')
+            if acc is not None:
+                acc[0] += seconds
+                acc[1] += executed
+                acc[2] += rows
+        with self._lock:
+            st = self.statements.get(key)
+            if st is None:
+                if len(self.statements) >= METRICS_MAX_STATEMENTS:
+                    key = '<other>'
+                st = self.statements.setdefault(key, [0, 0.0, 0, 0.0])
+            st[0] += executed
+            st[1] += seconds
+            st[2] += rows
+            if seconds > st[3]:
+                st[3] = seconds
+
+    def observe_request(self, method: str, route: str, status: int, seconds: float,
+                        sql_seconds: float, statements: int, rows: int) -> None:
+        with self._lock:
+            rs = self.routes.get((method, route))
+            if rs is None:
+                rs = self.routes[(method, route)] = RouteStats(self.window)
+            rs.count += 1
+            rs.statuses[status] = rs.statuses.get(status, 0) + 1
+            rs.total.observe(seconds)
+            rs.sql.observe(sql_seconds)
+            rs.python.observe(max(seconds - sql_seconds, 0.0))
+            rs.sql_statements += statements
+            rs.sql_rows += rows
+
+    def summary(self, top: int = 50) -> Dict[str, Any]:
+        with self._lock:
+            routes = [{
+                'method': method,
+                'route': route,
+                'count': rs.count,
+                'statuses': {str(k): v for k, v in sorted(rs.statuses.items())},
+                'latency_ms': rs.total.summary(rs.count),
+                'sql_ms': rs.sql.summary(rs.count),
+                'python_ms': rs.python.summary(rs.count),
+                'sql_statements': rs.sql_statements,
+                'sql_rows': rs.sql_rows,
+            } for (method, route), rs in self.routes.items()]
+            statements = [{
+                'sql': key,
+                'calls': int(st[0]),
+                'total_ms': round(st[1] * 1000, 3),
+                'mean_ms': round(st[1] / st[0] * 1000, 3) if st[0] else 0.0,
+                'max_ms': round(st[3] * 1000, 3),
+                'rows': int(st[2]),
+            } for key, st in self.statements.items()]
+        routes.sort(key=lambda x: x['latency_ms']['mean'] * x['count'], reverse=True)
+        statements.sort(key=lambda x: x['total_ms'], reverse=True)
+        return {
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'window': self.window,
+            'routes': routes,
+            'statements': statements[:top],
+        }
+
+    def prometheus(self) -> str:
+        def esc(v: Any) -> str:
+            return str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+        lines = [
+            '# HELP kdt_http_requests_total HTTP requests by route and status.',
+            '# TYPE kdt_http_requests_total counter',
+        ]
+        histograms = (
+            ('kdt_http_request_duration_seconds', 'Request wall time.', 'total'),
+            ('kdt_http_request_sql_seconds', 'Time spent executing and fetching SQL per request.', 'sql'),
+            ('kdt_http_request_python_seconds', 'Request time outside SQL (aggregation, serialization).', 'python'),
+        )
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for (method, route), rs in routes:
+                for status, n in sorted(rs.statuses.items()):
+                    lines.append(f'kdt_http_requests_total{{method="{method}",route="{esc(route)}",status="{status}"}} {n}')
+            for name, help_text, attr in histograms:
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (method, route), rs in routes:
+                    series: LatencySeries = getattr(rs, attr)
+                    labels = f'method="{method}",route="{esc(route)}"'
+                    cumulative = 0
+                    for le, n in zip(METRICS_BUCKETS + ('+Inf',), series.buckets):
+                        cumulative += n
+                        lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {series.sum:.6f}')
+                    lines.append(f'{name}_count{{{labels}}} {rs.count}')
+            for name, help_text, attr in (
+                ('kdt_sql_statements_total', 'SQL statements executed by route.', 'sql_statements'),
+                ('kdt_sql_rows_total', 'Rows fetched or modified by route.', 'sql_rows'),
+            ):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} counter')
+                for (method, route), rs in routes:
+                    lines.append(f'{name}{{method="{method}",route="{esc(route)}"}} {getattr(rs, attr)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Export writers: 행 iterator를 받아 조각(chunk) 단위로 내보내는 generator.
+# 전체 결과를 메모리에 만들지 않으므로 Response에 바로 넘길 수 있다.
+EXPORT_BATCH_SIZE = 500
+XLSX_ILLEGAL_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+XLSX_STATIC_PARTS = (
+    ('[Content_Types].xml',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+     '<Default Extension="xml" ContentType="application/xml"/>'
+     '<Override PartName="/xl/workbook.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+     '<Override PartName="/xl/worksheets/sheet1.xml" '
+     'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+     '</Types>'),
+    ('_rels/.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+     'Target="xl/workbook.xml"/>'
+     '</Relationships>'),
+    ('xl/_rels/workbook.xml.rels',
+     '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+     '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+     '<Relationship Id="rId1" '
+     'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+     'Target="worksheets/sheet1.xml"/>'
+     '</Relationships>'),
+)
+
+
+class ExportFormatError(ValueError):
+    """Unsupported export format= (or year=) value; export routes answer 400."""
+
+
+def iter_csv(header: List[str], rows: Any) -> Any:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    buf.write('\ufeff')  # Excel에서 UTF-8 한글이 깨지지 않도록 BOM
+    writer.writerow(header)
+    for i, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buf.getvalue()
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink; zipfile then streams entries with data descriptors."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def xlsx_row(values: Any) -> bytes:
+    cells = []
+    for v in values:
+        if v is None or v == '':
+            cells.append('<c/>')
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            cells.append(f'<c><v>{v}</v></c>')
+        else:
+            text = xml_escape(XLSX_ILLEGAL_CHARS.sub('', str(v)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>".encode('utf-8')
+
+
+def iter_xlsx(sheet_name: str, header: List[str], rows: Any) -> Any:
+    """Single-sheet XLSX (inline strings, no shared string table) written in constant memory."""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, xml in XLSX_STATIC_PARTS:
+            zf.writestr(name, xml)
+        zf.writestr(
+            'xl/workbook.xml',
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{xml_escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+            '</workbook>'
+        )
+        yield sink.drain()
+        with zf.open('xl/worksheets/sheet1.xml', 'w') as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(xlsx_row(header))
+            for i, row in enumerate(rows, start=1):
+                sheet.write(xlsx_row(row))
+                if i % EXPORT_BATCH_SIZE == 0:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
+
 
 def create_app() -> Flask:
+    configure_logging()
     app = Flask(__name__, static_folder='static', template_folder='templates')
-    CORS(app)
+    request_metrics = RequestMetrics(METRICS_WINDOW) if METRICS_ENABLED else None
+    app.extensions['kdt_metrics'] = request_metrics
+    CORS(app, expose_headers=['X-Next-After-Id', REQUEST_ID_HEADER])
 
     # --------------------
     # DB Utilities
     # --------------------
-    def get_db_connection() -> sqlite3.Connection:
-        conn = sqlite3.connect(DB_PATH)
+    def safe_date(s: Any) -> date | None:
+        if not s:
+            return None
+        # Accept 'YYYY-MM-DD' or 'YYYY.MM.DD' or 'YYYY/MM/DD'
+        ss = str(s).strip()
+        # 저장 시 ISO로 정규화되므로 대부분 fromisoformat 한 번으로 끝난다
+        if len(ss) == 10 and ss[4] == '-' and ss[7] == '-':
+            try:
+                return date.fromisoformat(ss)
+            except ValueError:
+                pass
+        for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d"):
+            try:
+                return datetime.strptime(ss, fmt).date()
+            except Exception:
+                pass
+        return None
+
+    def parse_int(value: Any, default: int = 0) -> int:
+        try:
+            if value is None:
+                return default
+            return int(value)
+        except Exception:
+            return default
+
+    def parse_float(value: Any, default: float = 0.0) -> float:
+        try:
+            if value is None:
+                return default
+            return float(value)
+        except Exception:
+            return default
+
+    def sql_date_iso(v: Any) -> str | None:
+        dt = safe_date(v)
+        return dt.isoformat() if dt else None
+
+    def init_connection(conn: sqlite3.Connection, readonly: bool = False) -> None:
         conn.row_factory = sqlite3.Row
+        conn.create_function('kdt_date', 1, sql_date_iso, deterministic=True)
+        # 숫자로 저장되지 않은 값(TEXT '12' 등)을 parse_int/parse_float와 같게 읽는다 (sql_int/sql_float)
+        conn.create_function('kdt_int', 1, parse_int, deterministic=True)
+        conn.create_function('kdt_float', 1, parse_float, deterministic=True)
+        configure_sqlite(conn, readonly)
+        conn.metrics = request_metrics
+
+    def init_read_connection(conn: sqlite3.Connection) -> None:
+        init_connection(conn, readonly=True)
+
+    # 읽기 전용 커넥션과 쓰기 커넥션을 분리: WAL 모드에서 읽기는 쓰기를 기다리지 않는다
+    if DB_POOL_SIZE > 0:
+        read_pool = ConnectionPool(DB_PATH, DB_POOL_SIZE, DB_POOL_TIMEOUT, init_read_connection)
+        write_pool = ConnectionPool(DB_PATH, max(DB_WRITE_POOL_SIZE, 1), DB_POOL_TIMEOUT, init_connection)
+    else:
+        read_pool = write_pool = None
+    app.extensions['kdt_db_pool'] = {'read': read_pool, 'write': write_pool}
+
+    def get_db_connection(readonly: bool = False) -> sqlite3.Connection:
+        pool = read_pool if readonly else write_pool
+        if pool is not None:
+            return pool.acquire()
+        conn = sqlite3.connect(DB_PATH, timeout=DB_POOL_TIMEOUT, factory=TimedConnection)
+        init_connection(conn, readonly)
         return conn
 
+    # 읽기 fan-out 실행기: fork 이후 자식 프로세스에는 스레드가 없으므로 프로세스마다 새로 만든다
+    fanout: Dict[str, Any] = {'pid': None, 'executor': None}
+    fanout_lock = threading.Lock()
+
+    def fanout_executor() -> ThreadPoolExecutor | None:
+        if READ_FANOUT_WORKERS <= 0:
+            return None
+        with fanout_lock:
+            if fanout['pid'] != os.getpid():
+                fanout['executor'] = ThreadPoolExecutor(READ_FANOUT_WORKERS, thread_name_prefix='kdt-read')
+                fanout['pid'] = os.getpid()
+            return fanout['executor']
+
+    def concurrent_reads(conn: sqlite3.Connection, *loads: Callable[[sqlite3.Connection], Any]) -> List[Any]:
+        """Run independent read loads concurrently and return their results in order.
+
+        loads[0] runs on ``conn`` in the calling thread; the others run on the
+        fan-out executor, each with its own read connection. sqlite3 releases the
+        GIL while a statement runs, so the request costs about the slowest load.
+
+        Only connections that are free right now are used: a load that gets none
+        runs on ``conn`` after loads[0]. The caller already holds ``conn``, so
+        waiting on the pool here could leave every request holding one
+        connection while waiting for another (deadlock).
+        """
+        executor = fanout_executor() if len(loads) > 1 else None
+        if executor is not None and has_request_context() and request.environ.get(READ_FANOUT_ENVIRON) is False:
+            executor = None
+        if executor is None:
+            return [load(conn) for load in loads]
+
+        def run(load: Callable[[sqlite3.Connection], Any], c: sqlite3.Connection) -> Any:
+            try:
+                return load(c)
+            finally:
+                c.close()
+
+        results: List[Any] = [None] * len(loads)
+        futures = []
+        inline = [0]
+        for i in range(1, len(loads)):
+            c = read_pool.acquire(wait=False) if read_pool is not None else get_db_connection(readonly=True)
+            if c is None:
+                inline.append(i)
+                continue
+            try:
+                # 요청 컨텍스트(g: request id, SQL 계측)를 작업 스레드에서도 보이게 한다
+                futures.append((i, executor.submit(contextvars.copy_context().run, run, loads[i], c)))
+            except BaseException:
+                c.close()
+                raise
+        for i in inline:
+            results[i] = loads[i](conn)
+        for i, f in futures:
+            results[i] = f.result()
+        return results
+
+    def quote_ident(name: str) -> str:
+        return '"' + str(name).replace('"', '""') + '"'
+
     def table_exists(conn: sqlite3.Connection, table_name: str) -> bool:
         cur = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
         return cur.fetchone() is not None
 
+    # Schema metadata cache: PRAGMA table_info 결과와 컬럼 매핑을 보관.
+    # DDL(ensure_db/migrate_schema) 이후 invalidate_schema_cache()로 비운다.
+    schema_cache: Dict[str, Any] = {'columns': {}, 'mapping': None}
+    schema_lock = threading.Lock()
+
     def get_table_columns(conn: sqlite3.Connection, table_name: str) -> List[str]:
+        cols = schema_cache['columns'].get(table_name)
+        if cols is not None:
+            return cols
         try:
             cur = conn.execute(f"PRAGMA table_info({table_name})")
             cols = [row['name'] for row in cur.fetchall()]
-            return cols
         except Exception:
             return []
+        if cols:
+            with schema_lock:
+                schema_cache['columns'][table_name] = cols
+        return cols
+
+    def invalidate_schema_cache() -> None:
+        with schema_lock:
+            schema_cache['columns'] = {}
+            schema_cache['mapping'] = None
+
+    def refresh_schema_cache() -> Dict[str, str]:
+        invalidate_schema_cache()
+        conn = get_db_connection()
+        try:
+            return get_schema_mapping(conn)
+        finally:
+            conn.close()
+
+    app.extensions['kdt_refresh_schema'] = refresh_schema_cache
 
     def ensure_db():
         conn = get_db_connection()
         try:
+            # journal_mode는 DB 파일에 유지되므로 시작 시 한 번만 설정
+            conn.execute(f"PRAGMA journal_mode = {SQLITE_JOURNAL_MODE}")
             if not table_exists(conn, 'kdt_programs'):
                 conn.execute(
                     """
@@ -73,8 +908,25 @@ def create_app() -> Flask:
                     """
                 )
                 conn.commit()
+            # 월별 시간/인원 테이블 (kdt_programs.id와 동일한 id)
+            for monthly_table in ('kdt_monthly_hours', 'kdt_monthly_enrollments'):
+                if not table_exists(conn, monthly_table):
+                    month_cols = ',\n'.join(
+                        f'{quote_ident(f"{m}M")} INTEGER DEFAULT 0 CHECK({quote_ident(f"{m}M")} >= 0)' for m in range(1, 13)
+                    )
+                    conn.execute(
+                        f"""
+                        CREATE TABLE {monthly_table} (
+                            id INTEGER PRIMARY KEY,
+                            {month_cols},
+                            FOREIGN KEY (id) REFERENCES kdt_programs(id) ON UPDATE CASCADE ON DELETE CASCADE
+                        )
+                        """
+                    )
+                    conn.commit()
         finally:
             conn.close()
+            invalidate_schema_cache()
 
     ensure_db()
 
@@ -146,9 +998,166 @@ def create_app() -> Flask:
                     conn.commit()
         finally:
             conn.close()
+            invalidate_schema_cache()
 
     migrate_schema()
 
+    # --------------------
+    # Backfill: 기존 'YYYY.MM.DD', 'YYYY/MM/DD', 'YYYY-M-D' 등의 날짜를 ISO로 한 번만 정규화한다.
+    # 끝나면 kdt_derived_state에 'iso_dates'를 남겨 이후 시작에서는 건너뛰고, 바꾼 값의 원래 문자열은
+    # kdt_date_backfill에 남긴다. 그 뒤 앱 밖에서 들어온 ISO가 아닌 날짜는 읽을 때 해석한다 (sql_iso_date).
+    # --------------------
+    def migrate_dates():
+        if not MIGRATE_DATES:
+            return
+        conn = get_db_connection()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kdt_derived_state (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            if conn.execute("SELECT 1 FROM kdt_derived_state WHERE name = 'iso_dates'").fetchone():
+                return
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kdt_date_backfill (
+                    program_id INTEGER NOT NULL,
+                    column_name TEXT NOT NULL,
+                    original TEXT,
+                    migrated_at TEXT NOT NULL,
+                    PRIMARY KEY (program_id, column_name)
+                )
+                """
+            )
+            cols = get_table_columns(conn, 'kdt_programs')
+            for c in DATE_COLUMNS:
+                if c not in cols:
+                    continue
+                qc = quote_ident(c)
+                stale = (f"{qc} IS NOT NULL AND NOT ({qc} GLOB '{ISO_DATE_GLOB}' AND date({qc}, '+0 days') = {qc}) "
+                         f"AND kdt_date({qc}) IS NOT NULL")
+                conn.execute(
+                    "INSERT OR IGNORE INTO kdt_date_backfill (program_id, column_name, original, migrated_at) "
+                    f"SELECT id, ?, {qc}, strftime('%Y-%m-%d %H:%M:%S', 'now') FROM kdt_programs WHERE {stale}",
+                    (c,)
+                )
+                conn.execute(f"UPDATE kdt_programs SET {qc} = kdt_date({qc}) WHERE {stale}")
+            conn.execute("INSERT OR REPLACE INTO kdt_derived_state (name, version) VALUES ('iso_dates', 1)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    migrate_dates()
+
+    # --------------------
+    # Data version: kdt_programs/월별 테이블에 쓰기가 일어날 때마다 트리거가 올린다.
+    # 워커/외부 도구의 쓰기도 반영되므로 ETag와 결과 캐시 키로 사용한다.
+    # --------------------
+    VERSIONED_TABLES = ('kdt_programs', 'kdt_monthly_hours', 'kdt_monthly_enrollments')
+
+    def ensure_version_triggers():
+        conn = get_db_connection()
+        try:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kdt_data_version (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    version INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO kdt_data_version (id, version, updated_at) "
+                "VALUES (1, 1, strftime('%Y-%m-%d %H:%M:%S', 'now'))"
+            )
+            for table in VERSIONED_TABLES:
+                for op in ('INSERT', 'UPDATE', 'DELETE'):
+                    conn.execute(
+                        f"""
+                        CREATE TRIGGER IF NOT EXISTS {table}_{op.lower()}_version
+                        AFTER {op} ON {table}
+                        BEGIN
+                            UPDATE kdt_data_version
+                            SET version = version + 1, updated_at = strftime('%Y-%m-%d %H:%M:%S', 'now')
+                            WHERE id = 1;
+                        END
+                        """
+                    )
+            conn.commit()
+        finally:
+            conn.close()
+
+    ensure_version_triggers()
+
+    # 프로그램 변경 로그: 트리거가 (데이터 버전, id)를 남긴다. 인메모리 스냅샷이 바뀐 행만 다시 읽는 데 쓴다.
+    # 스냅샷(KDT_PROGRAM_SNAPSHOT=1)을 쓸 때만 트리거를 두고, 끄면 트리거와 로그를 지워 쓰기 비용을 없앤다.
+    # kdt_derived_state의 'change_log' 버전부터 로그가 빠짐없이 남아 있다 (없으면 로그를 쓸 수 없음).
+    # 오래된 항목은 CHANGE_LOG_KEEP 버전만큼만 남긴다 (1000 버전마다 정리).
+    CHANGE_LOG_KEEP = 50000
+    CHANGE_LOG_TRIGGERS = ('kdt_programs_insert_changelog', 'kdt_programs_update_changelog',
+                           'kdt_programs_delete_changelog', 'kdt_change_log_prune')
+
+    def ensure_change_log():
+        conn = get_db_connection()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kdt_derived_state (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            if not PROGRAM_SNAPSHOT:
+                for name in CHANGE_LOG_TRIGGERS:
+                    conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+                conn.execute("DROP TABLE IF EXISTS kdt_change_log")
+                conn.execute("DELETE FROM kdt_derived_state WHERE name = 'change_log'")
+                conn.commit()
+                return
+            installed = conn.execute(
+                f"SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' "
+                f"AND name IN ({','.join('?' * len(CHANGE_LOG_TRIGGERS))})",
+                CHANGE_LOG_TRIGGERS
+            ).fetchone()[0]
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS kdt_change_log (
+                    version INTEGER NOT NULL,
+                    program_id INTEGER NOT NULL,
+                    PRIMARY KEY (version, program_id)
+                ) WITHOUT ROWID
+                """
+            )
+            current = "(SELECT version FROM kdt_data_version WHERE id = 1)"
+            for op, ids in (('INSERT', ('NEW.id',)), ('UPDATE', ('OLD.id', 'NEW.id')), ('DELETE', ('OLD.id',))):
+                selects = ' UNION '.join(f"SELECT {current}, {i}" for i in ids)
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS kdt_programs_{op.lower()}_changelog
+                    AFTER {op} ON kdt_programs
+                    BEGIN
+                        INSERT OR IGNORE INTO kdt_change_log (version, program_id) {selects};
+                    END
+                    """
+                )
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS kdt_change_log_prune
+                AFTER INSERT ON kdt_change_log
+                WHEN NEW.version % 1000 = 0
+                BEGIN
+                    DELETE FROM kdt_change_log WHERE version < NEW.version - {CHANGE_LOG_KEEP};
+                END
+                """
+            )
+            if installed < len(CHANGE_LOG_TRIGGERS):
+                # 트리거가 (다시) 생긴 시점부터만 로그를 믿는다
+                conn.execute(
+                    "INSERT OR REPLACE INTO kdt_derived_state (name, version) "
+                    "SELECT 'change_log', version FROM kdt_data_version WHERE id = 1"
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    ensure_change_log()
+
     # --------------------
     # Helpers for schema variance
     # --------------------
@@ -159,6 +1168,9 @@ def create_app() -> Flask:
         return ''
 
     def get_schema_mapping(conn: sqlite3.Connection) -> Dict[str, str]:
+        cached = schema_cache['mapping']
+        if cached is not None:
+            return cached
         cols = get_table_columns(conn, 'kdt_programs')
         mapping = {
             'team': pick_first_existing(cols, ['담당팀', '팀', '과정구분']),
@@ -178,87 +1190,257 @@ def create_app() -> Flask:
             'workers': pick_first_existing(cols, ['근로자']),
             'complete_excluded': pick_first_existing(cols, ['수료산정 제외인원', '산정제외'])
         }
+        if cols:
+            with schema_lock:
+                schema_cache['mapping'] = mapping
         return mapping
 
-    def parse_int(value: Any, default: int = 0) -> int:
-        try:
-            if value is None:
-                return default
-            return int(value)
-        except Exception:
-            return default
-
-    def parse_float(value: Any, default: float = 0.0) -> float:
-        try:
-            if value is None:
-                return default
-            return float(value)
-        except Exception:
-            return default
+    # 시작 시 스키마 캐시를 채워 요청 경로에서 PRAGMA 조회를 없앤다
+    refresh_schema_cache()
 
-    def calc_kpis(rows: List[sqlite3.Row], mapping: Dict[str, str]) -> Dict[str, float]:
-        total_capacity = 0
-        total_confirmed = 0
-        total_completed = 0
-        total_employed = 0
-        satisfaction_sum = 0.0
-        satisfaction_count = 0
-        total_emp_excl = 0
-        total_workers = 0
-        total_complete_excl = 0
-        
-        # 수료율 계산용 (impact hub 제외)
-        completion_confirmed = 0
-        completion_completed = 0
-        completion_complete_excl = 0
+    # --------------------
+    # Filter indexes: build_program_filters / education_timeline 조건 조합에 맞춘 복합 인덱스.
+    # 컬럼은 get_schema_mapping 결과를 따른다.
+    # --------------------
+    FILTER_INDEX_PREFIX = 'idx_kdt_programs_filter_'
+    FILTER_INDEX_ROLES = [
+        ('year', 'quarter', 'team', 'status'),  # 대시보드/프로그램 목록 필터 (년도·분기·팀 접두사)
+        ('year', 'status'),                     # 교육 타임라인 (년도 + 진행상태)
+        ('team', 'status'),                     # 년도 없이 팀/상태만 고른 경우
+        ('status',),
+    ]
 
-        for r in rows:
-            capacity = parse_int(r.get(mapping['capacity'])) if mapping['capacity'] else 0
-            confirmed = parse_int(r.get(mapping['confirmed'])) if mapping['confirmed'] else 0
-            completed = parse_int(r.get(mapping['completed'])) if mapping['completed'] else 0
-            employed = parse_int(r.get(mapping['employed'])) if mapping['employed'] else 0
-            satis = parse_float(r.get(mapping['satisfaction'])) if mapping['satisfaction'] else 0.0
-            emp_excl = parse_int(r.get(mapping.get('employment_excluded'))) if mapping.get('employment_excluded') else 0
-            workers = parse_int(r.get(mapping.get('workers'))) if mapping.get('workers') else 0
-            comp_excl = parse_int(r.get(mapping.get('complete_excluded'))) if mapping.get('complete_excluded') else 0
-            
-            # 담당팀 확인
-            team = str(r.get(mapping.get('team', '')) or '').strip().lower()
-
-            total_capacity += capacity
-            total_confirmed += confirmed
-            total_completed += completed
-            total_employed += employed
-            total_emp_excl += emp_excl
-            total_workers += workers
-            total_complete_excl += comp_excl
-            
-            # 만족도 계산: impact hub 제외
-            if mapping['satisfaction'] and r.get(mapping['satisfaction']) is not None:
-                if team != 'impact hub':  # impact hub 부서 제외
-                    satisfaction_sum += satis
-                    satisfaction_count += 1
-            
-            # 수료율 계산용: impact hub 제외
-            if team != 'impact hub':
-                completion_confirmed += confirmed
-                completion_completed += completed
-                completion_complete_excl += comp_excl
+    def ensure_filter_indexes() -> List[str]:
+        conn = get_db_connection()
+        try:
+            mapping = get_schema_mapping(conn)
+            wanted: Dict[str, List[str]] = {}
+            for roles in FILTER_INDEX_ROLES:
+                cols = [mapping[r] for r in roles if mapping.get(r)]
+                if cols:
+                    wanted[FILTER_INDEX_PREFIX + '_'.join(roles)] = cols
+            cur = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='kdt_programs' AND name LIKE ?",
+                (FILTER_INDEX_PREFIX + '%',)
+            )
+            existing = {r['name'] for r in cur.fetchall()}
+            changed = False
+            for name in existing:
+                current = [r['name'] for r in conn.execute(f"PRAGMA index_info({quote_ident(name)})").fetchall()]
+                if wanted.get(name) != current:
+                    conn.execute(f"DROP INDEX {quote_ident(name)}")
+                    changed = True
+            for name, cols in wanted.items():
+                cur = conn.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (name,))
+                if cur.fetchone() is None:
+                    conn.execute(
+                        f"CREATE INDEX {quote_ident(name)} ON kdt_programs ({', '.join(quote_ident(c) for c in cols)})"
+                    )
+                    changed = True
+            if changed:
+                conn.execute("ANALYZE kdt_programs")
+            conn.commit()
+            return list(wanted.keys())
+        finally:
+            conn.close()
 
-        모집률 = (total_confirmed / total_capacity * 100) if total_capacity > 0 else 0.0
+    ensure_filter_indexes()
+
+    # --------------------
+    # Program name search: 과정명/과정코드 trigram FTS5 색인 (rowid = kdt_programs.id).
+    # kdt_programs 트리거가 같은 트랜잭션에서 갱신하므로 앱 밖의 쓰기도 반영된다.
+    # trigram은 3글자 이상 검색어만 색인으로 찾으므로 짧은 검색어는 instr로 비교한다.
+    # --------------------
+    def program_name_columns(conn: sqlite3.Connection) -> List[str]:
+        mapping = get_schema_mapping(conn)
+        cols = get_table_columns(conn, 'kdt_programs')
+        return [c for c in dict.fromkeys(PROGRAM_NAME_COLUMNS + (mapping.get('name'),)) if c and c in cols]
+
+    def program_name_fts_ready(conn: sqlite3.Connection, cols: List[str]) -> bool:
+        """True when program_names_fts exists and indexes all of cols."""
+        if not PROGRAM_NAME_FTS or not cols:
+            return False
+        indexed = {r['name'] for r in conn.execute("SELECT name FROM pragma_table_info('program_names_fts')").fetchall()}
+        return set(cols) <= indexed
+
+    def fts_phrase(text: str) -> str:
+        # MATCH 구문의 연산자/따옴표를 그대로 글자로 찾도록 하나의 phrase로 감싼다
+        return '"' + text.replace('"', '""') + '"'
+
+    def ensure_program_name_fts():
+        if not PROGRAM_NAME_FTS:
+            return
+        conn = get_db_connection()
+        try:
+            cols = program_name_columns(conn)
+            current = [r['name'] for r in conn.execute("PRAGMA table_info(program_names_fts)").fetchall()]
+            if current and current == cols:
+                triggers = conn.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type='trigger' AND name LIKE 'kdt_programs_%_names_fts'"
+                ).fetchone()[0]
+                indexed = conn.execute("SELECT COUNT(*) FROM program_names_fts").fetchone()[0]
+                if triggers == 3 and indexed == conn.execute("SELECT COUNT(*) FROM kdt_programs").fetchone()[0]:
+                    return
+            # 이름 열(스키마 매핑)이 바뀌었거나, 트리거가 없거나, 행 수가 어긋나면 다시 만든다
+            for op in ('insert', 'update', 'delete'):
+                conn.execute(f"DROP TRIGGER IF EXISTS kdt_programs_{op}_names_fts")
+            conn.execute("DROP TABLE IF EXISTS program_names_fts")
+            if not cols:
+                conn.commit()
+                return
+            names = ', '.join(quote_ident(c) for c in cols)
+            values = ', '.join(f"new.{quote_ident(c)}" for c in cols)
+            changed = ' OR '.join(f"old.{c} IS NOT new.{c}" for c in ['id'] + [quote_ident(c) for c in cols])
+            try:
+                conn.execute(f"CREATE VIRTUAL TABLE program_names_fts USING fts5({names}, tokenize='trigram')")
+            except sqlite3.OperationalError as e:
+                # FTS5/trigram(SQLite 3.34+)이 없는 빌드: instr 비교로 동작한다
+                logger.warning("program name FTS index unavailable: %s", e)
+                conn.commit()
+                return
+            conn.execute(f"INSERT INTO program_names_fts (rowid, {names}) SELECT id, {names} FROM kdt_programs")
+            conn.execute(
+                f"""
+                CREATE TRIGGER kdt_programs_insert_names_fts AFTER INSERT ON kdt_programs
+                BEGIN
+                    INSERT INTO program_names_fts (rowid, {names}) VALUES (new.id, {values});
+                END
+                """
+            )
+            conn.execute(
+                f"""
+                CREATE TRIGGER kdt_programs_update_names_fts AFTER UPDATE ON kdt_programs
+                WHEN {changed}
+                BEGIN
+                    DELETE FROM program_names_fts WHERE rowid = old.id;
+                    INSERT INTO program_names_fts (rowid, {names}) VALUES (new.id, {values});
+                END
+                """
+            )
+            conn.execute(
+                """
+                CREATE TRIGGER kdt_programs_delete_names_fts AFTER DELETE ON kdt_programs
+                BEGIN
+                    DELETE FROM program_names_fts WHERE rowid = old.id;
+                END
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    ensure_program_name_fts()
+
+    def kpi_period_from_args(args) -> KpiPeriod:
+        """KPI reporting period from query args (period=YYYY, window_start/window_end=YYYY-MM-DD,
+        exclude_teams=a,b); missing values fall back to DEFAULT_KPI_PERIOD. Raises KpiPeriodError."""
+        if not any(args.get(k) is not None for k in KPI_PERIOD_ARGS):
+            return DEFAULT_KPI_PERIOD
+        year_arg = args.get('period')
+        try:
+            year = int(year_arg) if year_arg else DEFAULT_KPI_PERIOD.year
+        except ValueError:
+            raise KpiPeriodError(f"period는 연도(YYYY)여야 합니다: {year_arg}")
+        if not 1900 <= year <= 9999:
+            raise KpiPeriodError(f"period는 연도(YYYY)여야 합니다: {year_arg}")
+        window = []
+        for key in ('window_start', 'window_end'):
+            value = args.get(key)
+            try:
+                window.append(date.fromisoformat(value) if value else None)
+            except ValueError:
+                raise KpiPeriodError(f"{key}는 YYYY-MM-DD 형식이어야 합니다: {value}")
+        if year == DEFAULT_KPI_PERIOD.year:
+            # 같은 연도면 설정된 윈도우를 기본값으로 사용
+            window = [window[0] or DEFAULT_KPI_PERIOD.window_start, window[1] or DEFAULT_KPI_PERIOD.window_end]
+        teams = args.get('exclude_teams')
+        return make_kpi_period(year, window[0], window[1],
+                               DEFAULT_KPI_PERIOD.excluded_teams if teams is None else teams)
+
+    def new_kpi_totals() -> Dict[str, float]:
+        return {
+            'capacity': 0,
+            'confirmed': 0,
+            'completed': 0,
+            'employed': 0,
+            'employment_excluded': 0,
+            'workers': 0,
+            'complete_excluded': 0,
+            # 수료율 계산용 (제외 팀 제외)
+            'completion_confirmed': 0,
+            'completion_completed': 0,
+            'completion_complete_excluded': 0,
+            # 만족도 계산용 (제외 팀 제외)
+            'satisfaction_sum': 0,  # SATISFACTION_SCALE 단위 정수
+            'satisfaction_count': 0,
+        }
+
+    def satisfaction_units(value: Any) -> int:
+        # parse_float 값을 SATISFACTION_SCALE 단위 정수로 (SQL의 CAST(round(x * scale) AS INTEGER)와 같은 값)
+        x = parse_float(value) * SATISFACTION_SCALE
+        if not math.isfinite(x):
+            return 0
+        return int(x + 0.5) if x >= 0 else -int(-x + 0.5)
+
+    def kpi_row_values(r: Dict[str, Any], mapping: Dict[str, str],
+                       excluded_teams: Tuple[str, ...] = DEFAULT_KPI_PERIOD.excluded_teams) -> Tuple[Any, ...]:
+        capacity = parse_int(r.get(mapping['capacity'])) if mapping['capacity'] else 0
+        confirmed = parse_int(r.get(mapping['confirmed'])) if mapping['confirmed'] else 0
+        completed = parse_int(r.get(mapping['completed'])) if mapping['completed'] else 0
+        employed = parse_int(r.get(mapping['employed'])) if mapping['employed'] else 0
+        satis = satisfaction_units(r.get(mapping['satisfaction'])) if mapping['satisfaction'] else 0
+        has_satis = bool(mapping['satisfaction'] and r.get(mapping['satisfaction']) is not None)
+        emp_excl = parse_int(r.get(mapping.get('employment_excluded'))) if mapping.get('employment_excluded') else 0
+        workers = parse_int(r.get(mapping.get('workers'))) if mapping.get('workers') else 0
+        comp_excl = parse_int(r.get(mapping.get('complete_excluded'))) if mapping.get('complete_excluded') else 0
+
+        # 담당팀 확인
+        team = str(r.get(mapping.get('team', '')) or '').strip().lower()
+        return capacity, confirmed, completed, employed, emp_excl, workers, comp_excl, satis, has_satis, team in excluded_teams
+
+    def add_kpi_values(totals: Dict[str, float], values: Tuple[Any, ...]) -> None:
+        capacity, confirmed, completed, employed, emp_excl, workers, comp_excl, satis, has_satis, excluded = values
+        totals['capacity'] += capacity
+        totals['confirmed'] += confirmed
+        totals['completed'] += completed
+        totals['employed'] += employed
+        totals['employment_excluded'] += emp_excl
+        totals['workers'] += workers
+        totals['complete_excluded'] += comp_excl
+
+        # 만족도 계산: 제외 팀(기본 impact hub) 제외
+        if has_satis and not excluded:
+            totals['satisfaction_sum'] += satis
+            totals['satisfaction_count'] += 1
+
+        # 수료율 계산용: 제외 팀(기본 impact hub) 제외
+        if not excluded:
+            totals['completion_confirmed'] += confirmed
+            totals['completion_completed'] += completed
+            totals['completion_complete_excluded'] += comp_excl
+
+    def add_kpi_row(totals: Dict[str, float], r: Dict[str, Any], mapping: Dict[str, str],
+                    period: KpiPeriod = DEFAULT_KPI_PERIOD) -> None:
+        add_kpi_values(totals, kpi_row_values(r, mapping, period.excluded_teams))
+
+    def finalize_kpis(totals: Dict[str, float]) -> Dict[str, float]:
+        total_capacity = totals['capacity']
+        모집률 = (totals['confirmed'] / total_capacity * 100) if total_capacity > 0 else 0.0
 
         # 수료율 = (수료인원) / (HRD_확정 - 수료산정 제외인원) * 100 (impact hub 제외)
-        grad_den = completion_confirmed - completion_complete_excl
+        grad_den = totals['completion_confirmed'] - totals['completion_complete_excluded']
         if grad_den <= 0:
             수료율 = 0.0
         else:
-            수료율 = (completion_completed / grad_den * 100)
+            수료율 = (totals['completion_completed'] / grad_den * 100)
 
         # 취업률: 취업인원 / {수료인원 - (취업산정제외인원 + 근로자)}
-        emp_den = total_completed - (total_emp_excl + total_workers)
-        취업률 = (total_employed / emp_den * 100) if emp_den > 0 else 0.0
+        emp_den = totals['completed'] - (totals['employment_excluded'] + totals['workers'])
+        취업률 = (totals['employed'] / emp_den * 100) if emp_den > 0 else 0.0
 
-        만족도 = (satisfaction_sum / satisfaction_count) if satisfaction_count > 0 else 0.0
+        # 만족도: 정수 합으로 구한 평균 (어느 엔진/합산 순서에서도 같은 float)
+        satisfaction_count = totals['satisfaction_count']
+        만족도 = (totals['satisfaction_sum'] / (satisfaction_count * SATISFACTION_SCALE)) if satisfaction_count > 0 else 0.0
 
         return {
             '모집률': round(모집률, 2),
@@ -267,33 +1449,1081 @@ def create_app() -> Flask:
             '만족도': round(만족도, 2),
         }
 
-    def safe_date(s: Any) -> date | None:
-        if not s:
+    def calc_kpis(rows: List[sqlite3.Row], mapping: Dict[str, str],
+                  period: KpiPeriod = DEFAULT_KPI_PERIOD) -> Dict[str, float]:
+        totals = new_kpi_totals()
+        for r in rows:
+            add_kpi_row(totals, r, mapping, period)
+        return finalize_kpis(totals)
+
+    # --------------------
+    # SQL KPI engine: calc_kpis 합계를 SQL GROUP BY 한 번으로 계산
+    # --------------------
+    # Python str.strip()과 동일하게 다룰 공백 문자 (전각 공백 포함)
+    SQL_WS = "char(32, 9, 10, 11, 12, 13, 160, 12288)"
+
+    def sql_int(col: str | None) -> str:
+        # parse_int와 동일: 숫자 열은 SQL에서, TEXT 등 나머지는 kdt_int()로 ('12' -> 12, 'x' -> 0)
+        if not col:
+            return '0'
+        c = quote_ident(col)
+        return (f"(CASE typeof({c}) WHEN 'integer' THEN {c} WHEN 'real' THEN CAST({c} AS INTEGER) "
+                f"WHEN 'null' THEN 0 ELSE kdt_int({c}) END)")
+
+    def sql_float(col: str | None) -> str:
+        # parse_float와 동일 ('4.5' -> 4.5, 'x' -> 0.0)
+        if not col:
+            return '0.0'
+        c = quote_ident(col)
+        return (f"(CASE typeof({c}) WHEN 'integer' THEN {c} WHEN 'real' THEN {c} "
+                f"WHEN 'null' THEN 0.0 ELSE kdt_float({c}) END)")
+
+    def sql_iso_date(col: str) -> str:
+        # 날짜는 저장 시 ISO(YYYY-MM-DD)로 정규화되므로 SQL에서 그대로 비교/정렬한다.
+        # date()는 수식어가 없으면 29~31일을 그대로 돌려주므로 '+0 days'로 정규화해 비교한다.
+        # 그 밖의 값(앱 밖에서 쓴 '2025.3.2' 등)은 kdt_date(safe_date)로 해석하고, 유효하지 않은 날짜(예: 2025-02-30)는 NULL.
+        c = quote_ident(col)
+        return (f"(CASE WHEN {c} GLOB '{ISO_DATE_GLOB}' AND date({c}, '+0 days') = {c} THEN {c} "
+                f"WHEN {c} IS NOT NULL THEN kdt_date({c}) END)")
+
+    def sql_end_date(mapping: Dict[str, str], cols: List[str]) -> str:
+        end_col = mapping.get('end')
+        if not end_col:
+            return 'NULL'
+        expr = sql_iso_date(end_col)
+        if '종강' in end_col and end_col != '종강' and '종강' in cols:
+            expr = f"COALESCE({expr}, {sql_iso_date('종강')})"
+        return expr
+
+    def sql_start_date(mapping: Dict[str, str], cols: List[str]) -> str:
+        start_col = mapping.get('start')
+        if not start_col:
+            return 'NULL'
+        expr = sql_iso_date(start_col)
+        if '개강' in start_col and start_col != '개강' and '개강' in cols:
+            expr = f"COALESCE({expr}, {sql_iso_date('개강')})"
+        return expr
+
+    # Batch 공유 로드: /api/batch, /api/views/<tab>의 하위 조회들은 kdt_programs 전체 행과 revenue_by_month를
+    # 한 번씩만 읽어 나눠 쓴다 (g.kdt_batch_loads; 필터 WHERE/파라미터와 데이터 버전으로 구분).
+    def in_batch() -> bool:
+        return has_request_context() and g.get('kdt_batch_loads') is not None
+
+    def batch_shared(name: str, key: Any, load: Callable[[], Any]) -> Any:
+        """load(), made once per batch request for (name, key, data version) and shared by its sub-queries."""
+        memo = g.kdt_batch_loads
+        entry = (name, key, get_data_version()[0])
+        if entry not in memo:
+            memo[entry] = load()
+        return memo[entry]
+
+    def load_programs(conn: sqlite3.Connection, where: str = '', params: Any = ()) -> List[Dict[str, Any]]:
+        """kdt_programs rows (plus ISO _start/_end) matching ``where``, in id order.
+
+        Inside a batch request the full load is made once and a filtered call
+        picks its rows by an id set resolved in SQL. The rows are then shared,
+        so callers must not modify them.
+        """
+        mapping = get_schema_mapping(conn)
+        cols = get_table_columns(conn, 'kdt_programs')
+        select = f"SELECT *, {sql_start_date(mapping, cols)} AS _start, {sql_end_date(mapping, cols)} AS _end FROM kdt_programs"
+        if not in_batch():
+            return [dict(r) for r in conn.execute(f"{select} {where} ORDER BY id", params).fetchall()]
+
+        def all_rows() -> List[Dict[str, Any]]:
+            return batch_shared('programs', ('', ()), lambda: [dict(r) for r in conn.execute(f"{select} ORDER BY id")])
+
+        def filtered() -> List[Dict[str, Any]]:
+            ids = {r[0] for r in conn.execute(f"SELECT id FROM kdt_programs {where}", params)}
+            return [r for r in all_rows() if r['id'] in ids]
+
+        return batch_shared('programs', (where, tuple(params)), filtered) if where else all_rows()
+
+    def batch_revenue_facts(conn: sqlite3.Connection) -> List[sqlite3.Row]:
+        """All revenue_by_month rows in (program_id, month_index) order, read once per batch request."""
+        return batch_shared('revenue_by_month', None, lambda: conn.execute(
+            "SELECT * FROM revenue_by_month ORDER BY program_id, month_index").fetchall())
+
+    def program_like_condition(conn: sqlite3.Connection, mapping: Dict[str, str],
+                               program_like: str | None) -> Tuple[str, List[Any]]:
+        """SQL condition on kdt_programs.id / name for the program_like filter (('', []) when unset).
+
+        Same result as ``needle in str(row[name])`` in Python (str(None) == 'None').
+        The FTS index narrows the candidates (it matches case-insensitively);
+        instr() keeps the exact comparison.
+        """
+        name_col = mapping.get('name')
+        if not (program_like and name_col):
+            return '', []
+        needle = str(program_like).strip()
+        exact = f"instr(COALESCE({quote_ident(name_col)}, 'None'), ?) > 0"
+        # 'None'의 부분 문자열이면 이름이 NULL인 행도 맞아야 하므로 색인을 쓰지 않는다
+        if len(needle) >= 3 and needle not in 'None' and program_name_fts_ready(conn, [name_col]):
+            return (f"id IN (SELECT rowid FROM program_names_fts WHERE {quote_ident(name_col)} MATCH ?) AND {exact}",
+                    [fts_phrase(needle), needle])
+        return exact, [needle]
+
+    def kpi_groups_sql(conn: sqlite3.Connection, mapping: Dict[str, str], where: str = '', params: List[Any] | None = None,
+                       period: KpiPeriod = DEFAULT_KPI_PERIOD) -> List[Dict[str, Any]]:
+        """Sum KPI inputs grouped by (제외 팀, 대상 연도 종강, 상태 종강, 취업 윈도우) flags of the period.
+
+        Compose the groups with calc_kpis_from_groups(); results match calc_kpis on
+        the equivalent Python-filtered row lists.
+        """
+        cols = get_table_columns(conn, 'kdt_programs')
+        end_expr = sql_end_date(mapping, cols)
+        team_col = mapping.get('team')
+        status_col = mapping.get('status')
+        completed_col = mapping.get('completed')
+        satisfaction_col = mapping.get('satisfaction')
+
+        # 기간 값은 바인딩; SELECT 식의 파라미터가 WHERE 파라미터보다 앞에 온다
+        period_params: List[Any] = []
+        if team_col and period.excluded_teams:
+            excluded_expr = (f"lower(trim(COALESCE({quote_ident(team_col)}, ''), {SQL_WS})) "
+                        f"IN ({','.join('?' * len(period.excluded_teams))})")
+            period_params.extend(period.excluded_teams)
+        else:
+            excluded_expr = '0'
+        period_params.extend([str(period.year), period.window_start.isoformat(), period.window_end.isoformat()])
+        done_expr = f"trim({quote_ident(status_col)}, {SQL_WS}) = '종강'" if status_col else '0'
+        if completed_col:
+            c = quote_ident(completed_col)
+            has_completed = f"({c} IS NOT NULL AND NOT (typeof({c}) = 'text' AND trim({c}, {SQL_WS}) = ''))"
+        else:
+            has_completed = '0'
+        sat_count = f"COUNT({quote_ident(satisfaction_col)})" if satisfaction_col else '0'
+
+        sql = f"""
+            SELECT excluded, end_year, done, in_window,
+                   SUM(capacity) AS capacity, SUM(confirmed) AS confirmed,
+                   SUM(completed) AS completed, SUM(employed) AS employed,
+                   SUM(employment_excluded) AS employment_excluded, SUM(workers) AS workers,
+                   SUM(complete_excluded) AS complete_excluded,
+                   SUM(CASE WHEN has_satisfaction THEN satisfaction ELSE 0 END) AS satisfaction_sum,
+                   SUM(has_satisfaction) AS satisfaction_count
+            FROM (
+                SELECT
+                    COALESCE({excluded_expr}, 0) AS excluded,
+                    COALESCE(substr(end_date, 1, 4) = ?, 0) AS end_year,
+                    COALESCE({done_expr}, 0) AS done,
+                    COALESCE({done_expr} AND {has_completed}
+                             AND end_date BETWEEN ? AND ?, 0) AS in_window,
+                    {sql_int(mapping.get('capacity'))} AS capacity,
+                    {sql_int(mapping.get('confirmed'))} AS confirmed,
+                    {sql_int(completed_col)} AS completed,
+                    {sql_int(mapping.get('employed'))} AS employed,
+                    {sql_int(mapping.get('employment_excluded'))} AS employment_excluded,
+                    {sql_int(mapping.get('workers'))} AS workers,
+                    {sql_int(mapping.get('complete_excluded'))} AS complete_excluded,
+                    CAST(round({sql_float(satisfaction_col)} * {SATISFACTION_SCALE}) AS INTEGER) AS satisfaction,
+                    ({f"{quote_ident(satisfaction_col)} IS NOT NULL" if satisfaction_col else '0'}) AS has_satisfaction
+                FROM (SELECT *, {end_expr} AS end_date FROM kdt_programs {where})
+            )
+            GROUP BY excluded, end_year, done, in_window
+        """
+        cur = conn.execute(sql, period_params + list(params or []))
+        return [dict(r) for r in cur.fetchall()]
+
+    def add_kpi_group(totals: Dict[str, float], g: Dict[str, Any], excluded: bool) -> None:
+        """Add pre-summed KPI inputs (a kpi_groups_sql group or a kpi_buckets row)."""
+        for key in ('capacity', 'confirmed', 'completed', 'employed', 'employment_excluded', 'workers', 'complete_excluded'):
+            totals[key] += g[key] or 0
+        # 제외 팀(기본 impact hub) 제외 항목
+        if not excluded:
+            totals['completion_confirmed'] += g['confirmed'] or 0
+            totals['completion_completed'] += g['completed'] or 0
+            totals['completion_complete_excluded'] += g['complete_excluded'] or 0
+            totals['satisfaction_sum'] += g['satisfaction_sum'] or 0
+            totals['satisfaction_count'] += g['satisfaction_count'] or 0
+
+    def calc_kpis_from_groups(groups: List[Dict[str, Any]], predicate) -> Dict[str, float]:
+        totals = new_kpi_totals()
+        for g in groups:
+            if predicate(g):
+                add_kpi_group(totals, g, g['excluded'])
+        return finalize_kpis(totals)
+
+    def dashboard_kpi_set(kpi_year: Dict[str, float], kpi_done_year: Dict[str, float],
+                          kpi_window: Dict[str, float]) -> Dict[str, float]:
+        """대시보드 규칙: 모집률은 대상 연도 종강, 수료율/만족도는 대상 연도 종강 + 상태 종강, 취업률은 취업 윈도우."""
+        return {
+            '모집률': kpi_year['모집률'],
+            '수료율': kpi_done_year['수료율'],
+            '취업률': kpi_window['취업률'],
+            '만족도': kpi_done_year['만족도'],
+        }
+
+    def row_end_date(r: Dict[str, Any], end_col: str | None) -> date | None:
+        dt = safe_date(r.get(end_col)) if end_col else None
+        if not dt and end_col and '종강' in end_col:
+            dt = safe_date(r.get('종강'))
+        return dt
+
+    class KpiAccumulator:
+        """Single-pass KPI accumulator.
+
+        Each row is parsed once and added to every KPI variant it belongs to:
+        all rows, 대상 연도 종강 (end_year), 대상 연도 종강 + 상태 종강 (done)
+        and the employment window (window) of the reporting period. Sums are
+        kept in row order per variant, so results equal calc_kpis() on the
+        equivalent filtered lists.
+        """
+
+        VARIANTS = ('all', 'end_year', 'done', 'window')
+
+        def __init__(self, mapping: Dict[str, str], period: KpiPeriod = DEFAULT_KPI_PERIOD):
+            self.mapping = mapping
+            self.period = period
+            self.totals = {v: new_kpi_totals() for v in self.VARIANTS}
+            self.counts = dict.fromkeys(self.VARIANTS, 0)
+            self._status_col = mapping.get('status')
+            self._completed_col = mapping.get('completed')
+            self._end_col = mapping.get('end')
+
+        def add(self, r: Dict[str, Any], end_dt: Any = ...) -> None:
+            """Add one row; pass end_dt when the caller already parsed row_end_date()."""
+            if end_dt is ...:
+                end_dt = row_end_date(r, self._end_col)
+            period = self.period
+            values = kpi_row_values(r, self.mapping, period.excluded_teams)
+            done = bool(self._status_col and str(r.get(self._status_col, '')).strip() == '종강')
+            end_year = bool(end_dt and end_dt.year == period.year)
+            # 취업률 윈도우(기본 전년도 7/1 ~ 대상 연도 6/30), 상태는 '종강' 강제, 수료인원 비어있으면 제외
+            in_window = False
+            if done and end_dt and period.window_start <= end_dt <= period.window_end:
+                cv = r.get(self._completed_col) if self._completed_col is not None else 0
+                in_window = not (cv is None or (isinstance(cv, str) and cv.strip() == ''))
+
+            for variant, hit in (('all', True), ('end_year', end_year),
+                                 ('done', end_year and done), ('window', in_window)):
+                if hit:
+                    add_kpi_values(self.totals[variant], values)
+                    self.counts[variant] += 1
+
+        def add_bucket(self, b: Dict[str, Any]) -> None:
+            """Add one kpi_buckets row: the summed inputs of every program in the bucket."""
+            period = self.period
+            excluded = str(b.get(self.mapping.get('team', '')) or '').strip().lower() in period.excluded_teams
+            done = bool(self._status_col and str(b.get(self._status_col, '')).strip() == '종강')
+            end = b['end_month']
+            end_year = bool(end) and int(end[:4]) == period.year
+            # 윈도우가 월 경계일 때만 버킷을 쓰므로(load_kpi_buckets) 종강 월로 비교한다
+            in_window = bool(b['window_eligible']) and \
+                f"{period.window_start:%Y-%m}" <= end <= f"{period.window_end:%Y-%m}"
+            for variant, hit in (('all', True), ('end_year', end_year),
+                                 ('done', end_year and done), ('window', in_window)):
+                if hit:
+                    add_kpi_group(self.totals[variant], b, excluded)
+                    self.counts[variant] += b['programs']
+
+        def kpis(self, variant: str) -> Dict[str, float]:
+            return finalize_kpis(self.totals[variant])
+
+        def dashboard(self) -> Dict[str, float]:
+            return dashboard_kpi_set(self.kpis('end_year'), self.kpis('done'), self.kpis('window'))
+
+        def raw(self) -> Dict[str, float]:
+            return self.kpis('all')
+
+    # --------------------
+    # Revenue fact table: 과정별 N개월차 ↔ 달력 월 매핑과 예상 매출(시간 × 인원 × UNIT)을 미리 계산.
+    # 프로그램/월별 데이터 쓰기 시 해당 과정만 다시 계산한다.
+    # --------------------
+    REVENUE_UNIT = 18150
+
+    def ensure_revenue_facts():
+        conn = get_db_connection()
+        try:
+            created = not table_exists(conn, 'revenue_by_month')
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS revenue_by_month (
+                    program_id INTEGER NOT NULL,
+                    month_index INTEGER NOT NULL,          -- N개월차 (개강 월 = 1)
+                    ym TEXT,                               -- 달력 월 YYYY-MM (개강일 없으면 NULL)
+                    active INTEGER NOT NULL DEFAULT 0,     -- 개강 이후이고 종강 월을 넘지 않음 (종강일 없으면 계속 진행)
+                    in_period INTEGER NOT NULL DEFAULT 0,  -- 개강~종강 월 범위 안 (개강/종강일 모두 있음)
+                    hours INTEGER NOT NULL DEFAULT 0,
+                    enrollments INTEGER NOT NULL DEFAULT 0,
+                    expected INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (program_id, month_index)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_revenue_by_month_ym ON revenue_by_month (ym, program_id)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kdt_derived_state (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+            )
+            # 앱 밖에서 데이터가 바뀌었으면(버전 불일치) 전체 재계산
+            if created or not revenue_facts_current(conn):
+                refresh_revenue_facts(conn, None)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def current_db_version(conn: sqlite3.Connection) -> int:
+        row = conn.execute("SELECT version FROM kdt_data_version WHERE id = 1").fetchone()
+        return row['version'] if row else 0
+
+    def revenue_facts_current(conn: sqlite3.Connection) -> bool:
+        # 앱의 쓰기는 같은 트랜잭션에서 버전을 맞춘다; 다르면 앱 밖(다른 도구)에서 데이터가 바뀐 것
+        row = conn.execute(
+            "SELECT (SELECT version FROM kdt_derived_state WHERE name = 'revenue_by_month') "
+            "= (SELECT version FROM kdt_data_version WHERE id = 1)"
+        ).fetchone()
+        return bool(row[0])
+
+    def ensure_revenue_facts_current(conn: sqlite3.Connection) -> None:
+        """Rebuild revenue_by_month before a read when the data changed outside the app since it was computed.
+
+        Checked once per batch request.
+        """
+        def check() -> bool:
+            if revenue_facts_current(conn):
+                return True
+            write_conn = get_db_connection()
+            try:
+                write_conn.execute("BEGIN IMMEDIATE")
+                if not revenue_facts_current(write_conn):  # 다른 요청이 이미 다시 만들었을 수 있다
+                    refresh_revenue_facts(write_conn, None)
+                write_conn.commit()
+            finally:
+                write_conn.close()
+            return True
+
+        if in_batch():
+            batch_shared('revenue_by_month_current', None, check)
+        else:
+            check()
+
+    def load_monthly_values(conn: sqlite3.Connection, table: str, program_ids: List[int] | None) -> Dict[int, array]:
+        """id -> array of the 1M, 2M, ... values of a monthly table (index 0 = 1M), for the given ids (all when None).
+
+        Only the id and month columns are read, in chunks of 500 ids, so the
+        memory used scales with the programs asked for rather than the table.
+        """
+        result: Dict[int, array] = {}
+        if not table_exists(conn, table):
+            return result
+        months = sorted((int(m.group(1)), c) for c in get_table_columns(conn, table) if (m := MONTH_COLUMN.match(c)))
+        if not months:
+            return result
+        width = months[-1][0]
+        dense = width == len(months)  # 1M..NM이 빠짐없이 있으면 열 순서가 곧 배열 순서
+        select = f"SELECT id, {', '.join(quote_ident(c) for _, c in months)} FROM {table}"
+        if program_ids is None:
+            chunks: List[Any] = [None]
+        else:
+            chunks = [program_ids[i:i + 500] for i in range(0, len(program_ids), 500)]
+        for chunk in chunks:
+            if chunk is None:
+                cur = conn.execute(select)
+            else:
+                cur = conn.execute(f"{select} WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            for r in cur:
+                if dense:
+                    values = array('q', [v if v.__class__ is int else parse_int(v) for v in r[1:]])
+                else:
+                    values = array('q', bytes(8 * width))
+                    for (m, _), v in zip(months, r[1:]):
+                        values[m - 1] = parse_int(v)
+                result[parse_int(r[0])] = values
+        return result
+
+    def revenue_fact_rows(pid: int, start: date | None, end: date | None,
+                          hours: array, enrollments: array) -> List[Tuple[Any, ...]]:
+        span = 0
+        if start and end and start <= end:
+            span = (end.year - start.year) * 12 + (end.month - start.month) + 1
+        end_ym = f"{end.year:04d}-{end.month:02d}" if end else None
+        rows = []
+        for idx in range(1, max(12, span) + 1):
+            h = hours[idx - 1] if idx <= len(hours) else 0
+            e = enrollments[idx - 1] if idx <= len(enrollments) else 0
+            ym = None
+            active = in_period = 0
+            if start:
+                y, m = divmod(start.year * 12 + start.month - 1 + idx - 1, 12)
+                ym = f"{y:04d}-{m + 1:02d}"
+                active = 1 if end_ym is None or ym <= end_ym else 0
+                in_period = 1 if idx <= span else 0
+            rows.append((pid, idx, ym, active, in_period, h, e, h * e * REVENUE_UNIT))
+        return rows
+
+    def refresh_revenue_facts(conn: sqlite3.Connection, program_ids: List[int] | None) -> None:
+        """Recompute revenue_by_month for the given programs (all when None).
+
+        Runs inside the caller's transaction; the caller commits. Writers pass
+        None when revenue_facts_current() was false before their write, since
+        the other programs' rows are behind the data too.
+        """
+        mapping = get_schema_mapping(conn)
+        cols = get_table_columns(conn, 'kdt_programs')
+        select = f"SELECT id, {sql_start_date(mapping, cols)} AS s, {sql_end_date(mapping, cols)} AS e FROM kdt_programs"
+        if program_ids is None:
+            conn.execute("DELETE FROM revenue_by_month")
+            programs = conn.execute(select).fetchall()
+        else:
+            program_ids = [int(i) for i in program_ids]
+            programs = []
+            for i in range(0, len(program_ids), 500):
+                chunk = program_ids[i:i + 500]
+                marks = ','.join('?' * len(chunk))
+                conn.execute(f"DELETE FROM revenue_by_month WHERE program_id IN ({marks})", chunk)
+                programs.extend(conn.execute(f"{select} WHERE id IN ({marks})", chunk).fetchall())
+        hours_map = load_monthly_values(conn, 'kdt_monthly_hours', program_ids)
+        enroll_map = load_monthly_values(conn, 'kdt_monthly_enrollments', program_ids)
+        no_months = array('q')
+        fact_rows: List[Tuple[Any, ...]] = []
+        for p in programs:
+            pid = p['id']
+            fact_rows.extend(revenue_fact_rows(pid, safe_date(p['s']), safe_date(p['e']),
+                                               hours_map.get(pid, no_months), enroll_map.get(pid, no_months)))
+        conn.executemany(
+            "INSERT INTO revenue_by_month (program_id, month_index, ym, active, in_period, hours, enrollments, expected) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            fact_rows
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO kdt_derived_state (name, version) VALUES ('revenue_by_month', ?)",
+            (current_db_version(conn),)
+        )
+
+    ensure_revenue_facts()
+
+    # --------------------
+    # KPI buckets: KPI 입력 합계(정원, HRD_확정, 수료/취업 인원, 제외 인원, 만족도 합/건수)를
+    # (년도, 분기, 팀, 상태, 추이 분기, 종강 월, 취업 윈도우 대상 여부) 버킷별로 미리 더해 둔다.
+    # 키 열은 kdt_programs와 같은 이름이라 build_program_filters의 WHERE를 그대로 쓴다.
+    # 프로그램 쓰기 시 같은 트랜잭션에서 이전 행의 합계를 빼고 새 행의 합계를 더한다.
+    # 종강일은 월 단위로만 남기므로 취업 윈도우가 월 경계(1일 ~ 말일)일 때만 버킷으로 답한다.
+    # --------------------
+    KPI_BUCKET_SUMS = ('programs', 'capacity', 'confirmed', 'completed', 'employed', 'employment_excluded',
+                       'workers', 'complete_excluded', 'satisfaction_sum', 'satisfaction_count')
+
+    def kpi_bucket_keys(conn: sqlite3.Connection) -> List[str]:
+        """kdt_programs columns the buckets are keyed by (filter columns and the 년도/분기 fallbacks)."""
+        mapping = get_schema_mapping(conn)
+        cols = get_table_columns(conn, 'kdt_programs')
+        keys: List[str] = []
+        for c in (mapping.get('year'), mapping.get('quarter'), mapping.get('team'), mapping.get('status'), '년도', '분기'):
+            if c and c in cols and c not in keys:
+                keys.append(c)
+        return keys
+
+    def kpi_bucket_groups(conn: sqlite3.Connection, keys: List[str],
+                          program_ids: List[int] | None) -> Dict[Tuple[Any, ...], List[float]]:
+        """Bucket key -> KPI_BUCKET_SUMS for the given programs (all when None), parsed like KpiAccumulator."""
+        mapping = get_schema_mapping(conn)
+        end_col, status_col, completed_col = mapping.get('end'), mapping.get('status'), mapping.get('completed')
+        quarter_col = mapping.get('quarter') or '분기'
+        if program_ids is None:
+            chunks: List[Any] = [None]
+        else:
+            program_ids = [int(i) for i in program_ids]
+            chunks = [program_ids[i:i + 500] for i in range(0, len(program_ids), 500)]
+        groups: Dict[Tuple[Any, ...], List[float]] = {}
+        for chunk in chunks:
+            if chunk is None:
+                cur = conn.execute("SELECT * FROM kdt_programs")
+            else:
+                cur = conn.execute(f"SELECT * FROM kdt_programs WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            for r in map(dict, cur):
+                capacity, confirmed, completed, employed, emp_excl, workers, comp_excl, satis, has_satis, _ = \
+                    kpi_row_values(r, mapping)
+                end_dt = row_end_date(r, end_col)
+                end = f"{end_dt.year:04d}-{end_dt.month:02d}" if end_dt else ''
+                # 취업 윈도우 대상: 상태 '종강'이고 수료인원이 비어 있지 않음
+                done = bool(status_col and str(r.get(status_col, '')).strip() == '종강')
+                cv = r.get(completed_col) if completed_col is not None else 0
+                eligible = 1 if end_dt and done and not (cv is None or (isinstance(cv, str) and cv.strip() == '')) else 0
+                # dashboard_trends 분기: 분기 컬럼, 없으면 개강일 분기, 그래도 없으면 Q1
+                trend_q = str(r.get(quarter_col) or '').strip()
+                if not trend_q:
+                    start_dt = safe_date(r.get(mapping['start'])) if mapping['start'] else None
+                    trend_q = f"Q{((start_dt.month - 1)//3) + 1}" if start_dt else 'Q1'
+                key = tuple(r.get(k) for k in keys) + (trend_q, end, eligible)
+                sums = groups.get(key)
+                if sums is None:
+                    sums = groups[key] = [0] * len(KPI_BUCKET_SUMS)
+                for i, v in enumerate((1, capacity, confirmed, completed, employed, emp_excl, workers, comp_excl,
+                                       satis if has_satis else 0, 1 if has_satis else 0)):
+                    sums[i] += v
+        return groups
+
+    def mark_kpi_buckets(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO kdt_derived_state (name, version) VALUES ('kpi_buckets', ?)",
+            (current_db_version(conn),)
+        )
+
+    def rebuild_kpi_buckets(conn: sqlite3.Connection) -> None:
+        """Recreate kpi_buckets from all programs (key columns keep kdt_programs' declared types).
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        keys = kpi_bucket_keys(conn)
+        types = {r['name']: r['type'] for r in conn.execute("PRAGMA table_info(kdt_programs)").fetchall()}
+        conn.execute("DROP TABLE IF EXISTS kpi_buckets")
+        conn.execute(
+            "CREATE TABLE kpi_buckets ("
+            + ', '.join([f"{quote_ident(k)} {types.get(k) or ''}".rstrip() for k in keys]
+                        + ["trend_quarter TEXT NOT NULL", "end_month TEXT NOT NULL", "window_eligible INTEGER NOT NULL"]
+                        + [f"{s} INTEGER NOT NULL" for s in KPI_BUCKET_SUMS])
+            + ")"
+        )
+        conn.execute(
+            "CREATE INDEX kpi_buckets_key ON kpi_buckets ("
+            + ', '.join([quote_ident(k) for k in keys] + ['trend_quarter', 'end_month', 'window_eligible']) + ")"
+        )
+        groups = kpi_bucket_groups(conn, keys, None)
+        conn.executemany(
+            f"INSERT INTO kpi_buckets VALUES ({','.join('?' * (len(keys) + 3 + len(KPI_BUCKET_SUMS)))})",
+            [key + tuple(sums) for key, sums in groups.items()]
+        )
+        mark_kpi_buckets(conn)
+
+    def kpi_buckets_current(conn: sqlite3.Connection) -> bool:
+        # kdt_programs 쓰기마다 트리거가 version을 -1로 바꾸고, 앱의 쓰기는 같은 트랜잭션에서 되돌린다.
+        # 앱 밖(다른 도구)의 쓰기 뒤에는 -1로 남아 다시 만들 때까지 버킷을 쓰지 않는다.
+        row = conn.execute("SELECT version FROM kdt_derived_state WHERE name = 'kpi_buckets'").fetchone()
+        return row is not None and row['version'] >= 0
+
+    def kpi_buckets_before(conn: sqlite3.Connection, program_ids: List[int]) -> Dict[Tuple[Any, ...], List[float]] | None:
+        """Sums of the programs about to be written (call inside the write transaction, before the write).
+
+        Pass the result to update_kpi_buckets() after the write; None means the
+        table is behind the data and will be rebuilt instead.
+        """
+        if not KPI_BUCKETS or not kpi_buckets_current(conn):
             return None
-        # Accept 'YYYY-MM-DD' or 'YYYY.MM.DD' or 'YYYY/MM/DD'
-        ss = str(s).strip()
-        for fmt in ("%Y-%m-%d", "%Y.%m.%d", "%Y/%m/%d"):
+        return kpi_bucket_groups(conn, kpi_bucket_keys(conn), program_ids)
+
+    def update_kpi_buckets(conn: sqlite3.Connection, program_ids: List[int],
+                           before: Dict[Tuple[Any, ...], List[float]] | None) -> None:
+        """Apply (after - before) of the written programs to kpi_buckets.
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        if not KPI_BUCKETS:
+            return
+        if before is None:
+            rebuild_kpi_buckets(conn)
+            return
+        keys = kpi_bucket_keys(conn)
+        after = kpi_bucket_groups(conn, keys, program_ids)
+        match = ' AND '.join(f"{quote_ident(c)} IS ?" for c in keys + ['trend_quarter', 'end_month', 'window_eligible'])
+        sets = ', '.join(f"{s} = {s} + ?" for s in KPI_BUCKET_SUMS)
+        zero = [0] * len(KPI_BUCKET_SUMS)
+        for key in {**before, **after}:
+            new, old = after.get(key, zero), before.get(key, zero)
+            delta = [a - b for a, b in zip(new, old)]
+            if not any(delta):
+                continue
+            if conn.execute(f"UPDATE kpi_buckets SET {sets} WHERE {match}", delta + list(key)).rowcount == 0:
+                conn.execute(
+                    f"INSERT INTO kpi_buckets VALUES ({','.join('?' * (len(key) + len(delta)))})",
+                    list(key) + delta
+                )
+        conn.execute("DELETE FROM kpi_buckets WHERE programs <= 0")
+        mark_kpi_buckets(conn)
+
+    def load_kpi_buckets(conn: sqlite3.Connection, period: KpiPeriod, where: str = '', params: Any = (),
+                         by: Tuple[str, ...] = ()) -> List[Dict[str, Any]] | None:
+        """kpi_buckets sums matching a kdt_programs filter, grouped by team, status,
+        end month, window eligibility and the ``by`` columns (what KpiAccumulator.add_bucket reads).
+
+        None when disabled, behind the data, or the period's employment window
+        does not start on the 1st and end on the last day of a month.
+        """
+        if not KPI_BUCKETS or period.window_start.day != 1 or (period.window_end + timedelta(days=1)).day != 1:
+            return None
+        if not kpi_buckets_current(conn):
+            return None
+        mapping = get_schema_mapping(conn)
+        keys = kpi_bucket_keys(conn)
+        group = [quote_ident(c) for c in dict.fromkeys((mapping.get('team'), mapping.get('status')) + by)
+                 if c in keys or c == 'trend_quarter'] + ['end_month', 'window_eligible']
+        sums = ', '.join(f"SUM({s}) AS {s}" for s in KPI_BUCKET_SUMS)
+        cur = conn.execute(f"SELECT {', '.join(group)}, {sums} FROM kpi_buckets {where} GROUP BY {', '.join(group)}", params)
+        return [dict(r) for r in cur.fetchall()]
+
+    def check_kpi_buckets(conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Rebuild the bucket sums from scratch and compare them with the kpi_buckets table."""
+        keys = kpi_bucket_keys(conn)
+        expected = kpi_bucket_groups(conn, keys, None)
+        stored: Dict[Tuple[Any, ...], List[float]] = {}
+        if table_exists(conn, 'kpi_buckets'):
+            for r in conn.execute("SELECT * FROM kpi_buckets").fetchall():
+                r = dict(r)
+                stored[tuple(r.get(k) for k in keys) + (r['trend_quarter'], r['end_month'], r['window_eligible'])] = \
+                    [r[s] for s in KPI_BUCKET_SUMS]
+        mismatched = []
+        for key in {**expected, **stored}:
+            want, have = expected.get(key), stored.get(key)
+            if want is None or have is None or any(abs(a - b) > 1e-6 for a, b in zip(want, have)):
+                mismatched.append({'key': list(key), 'expected': want, 'stored': have})
+        return {
+            'ok': not mismatched,
+            'buckets': len(stored),
+            'expected_buckets': len(expected),
+            'programs': sum(v[0] for v in expected.values()),
+            'mismatched': mismatched[:20],
+        }
+
+    def ensure_kpi_buckets():
+        conn = get_db_connection()
+        try:
+            if not KPI_BUCKETS:
+                # 꺼져 있으면 트리거/테이블을 지운다: 매 쓰기마다 쓰이지 않는 상태를 갱신하지 않도록
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS kdt_derived_state (name TEXT PRIMARY KEY, version INTEGER NOT NULL)"
+                )
+                for op in ('insert', 'update', 'delete'):
+                    conn.execute(f"DROP TRIGGER IF EXISTS kdt_programs_{op}_kpi_buckets")
+                conn.execute("DROP TABLE IF EXISTS kpi_buckets")
+                conn.execute("DELETE FROM kdt_derived_state WHERE name = 'kpi_buckets'")
+                conn.commit()
+                return
+            for op in ('INSERT', 'UPDATE', 'DELETE'):
+                conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS kdt_programs_{op.lower()}_kpi_buckets
+                    AFTER {op} ON kdt_programs
+                    BEGIN
+                        UPDATE kdt_derived_state SET version = -1 WHERE name = 'kpi_buckets';
+                    END
+                    """
+                )
+            # 키 열(스키마 매핑)이 달라졌거나 앱 밖에서 데이터가 바뀌었으면 다시 만든다.
+            # 만족도 합이 예전 형식(REAL 원값 합)이어도 SATISFACTION_SCALE 단위 정수로 다시 만든다.
+            info = conn.execute("PRAGMA table_info(kpi_buckets)").fetchall()
+            cols = [r['name'] for r in info]
+            types = {r['name']: r['type'] for r in info}
+            keys = kpi_bucket_keys(conn)
+            if cols[:len(keys) + 3] != keys + ['trend_quarter', 'end_month', 'window_eligible'] \
+                    or types.get('satisfaction_sum') != 'INTEGER' or not kpi_buckets_current(conn):
+                rebuild_kpi_buckets(conn)
+            conn.commit()
+        finally:
+            conn.close()
+
+    ensure_kpi_buckets()
+
+    # --------------------
+    # Result cache: 데이터 버전이 바뀌면(프로그램 CRUD) 이전 결과는 더 이상 조회되지 않는다
+    # --------------------
+    result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL)
+    app.extensions['kdt_result_cache'] = result_cache
+
+    def get_data_version() -> Tuple[int, str]:
+        """(version, updated_at) of the data, read once per request."""
+        cached = g.get('kdt_data_version')
+        if cached is not None:
+            return cached
+        conn = get_db_connection(readonly=True)
+        try:
+            row = conn.execute("SELECT version, updated_at FROM kdt_data_version WHERE id = 1").fetchone()
+        finally:
+            conn.close()
+        version = (row['version'], row['updated_at']) if row else (0, '')
+        g.kdt_data_version = version
+        return version
+
+    def data_written() -> None:
+        # 버전은 트리거가 올린다; 이전 버전의 로컬 캐시 항목만 비운다
+        g.pop('kdt_data_version', None)
+        result_cache.clear()
+
+    def cached_result(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if result_cache.maxsize <= 0:
+                return view(*args, **kwargs)
+            query = tuple(sorted((k, v) for k, v in request.args.items(multi=True)
+                                 if v != '' and k not in KPI_PERIOD_ARGS))
             try:
-                return datetime.strptime(ss, fmt).date()
-            except Exception:
-                pass
-        return None
+                # 같은 KPI 기간을 가리키는 요청(기본값 명시 등)은 같은 항목을 쓴다
+                period = kpi_period_from_args(request.args)
+            except KpiPeriodError:
+                return view(*args, **kwargs)
+            key = (request.endpoint, tuple(sorted(kwargs.items())), query, period, get_data_version()[0])
+            hit = result_cache.get(key)
+            if hit is not None:
+                body, mimetype = hit
+                return Response(body, mimetype=mimetype)
+            resp = app.make_response(view(*args, **kwargs))
+            if resp.status_code == 200 and not resp.is_streamed:
+                result_cache.set(key, (resp.get_data(), resp.mimetype))
+            return resp
+        return wrapper
 
-    # 취업률 윈도우: 2024-07-01 ~ 2025-06-30, 상태는 '종강' 강제, 수료인원 비어있으면 제외
-    def ended_in_window_and_done(row: Dict[str, Any], end_col: str | None, status_col: str | None, completed_col: str | None) -> bool:
-        if not status_col or str(row.get(status_col, '')).strip() != '종강':
-            return False
-        # 수료인원 값 존재 검사(빈 문자열/None 제외, 0은 허용)
-        if completed_col is not None:
-            cv = row.get(completed_col)
-            if cv is None or (isinstance(cv, str) and cv.strip() == ''):
+    # --------------------
+    # Columnar snapshot: kdt_programs를 열 단위 배열로 메모리에 보관 (KDT_PROGRAM_SNAPSHOT=1).
+    # 값은 적재 시 한 번만 parse_int/parse_float로 변환하고, 문자열/날짜는 사전(dictionary) 인코딩한다.
+    # KPI는 위치 목록(positions)에 대한 map/compress/sum으로 계산해 행마다 dict를 만들지 않는다.
+    # 쓰기 후에는 kdt_change_log로 바뀐 id만 다시 읽는다.
+    # --------------------
+    class ProgramSnapshot:
+        INT_KEYS = ('capacity', 'confirmed', 'completed', 'employed',
+                    'employment_excluded', 'workers', 'complete_excluded')
+        CODE_KEYS = ('team', 'end', 'name', 'trend_quarter', 'year_key', 'quarter_key', 'month_key', 'program_key')
+
+        def __init__(self, mapping: Dict[str, str]):
+            self.mapping = mapping
+            self.version = -1
+            self.ids = array('q')
+            self.alive = bytearray()
+            self.position: Dict[int, int] = {}
+            self.ints = {k: array('q') for k in self.INT_KEYS}
+            self.satisfaction = array('q')  # SATISFACTION_SCALE 단위
+            self.has_satisfaction = bytearray()
+            self.done = bytearray()
+            self.has_completed = bytearray()
+            self.codes = {k: array('l') for k in self.CODE_KEYS}
+            self.values: Dict[str, List[Any]] = {k: [] for k in self.CODE_KEYS}
+            self._lookup: Dict[str, Dict[Any, int]] = {k: {} for k in self.CODE_KEYS}
+            self.dead = 0
+            self._tables: Dict[Tuple[str, Any], bytes] = {}
+
+        def copy(self) -> 'ProgramSnapshot':
+            # 읽는 스레드가 있을 수 있으므로 증분 갱신은 복사본에 적용한 뒤 교체한다
+            other = ProgramSnapshot(self.mapping)
+            other.version, other.dead = self.version, self.dead
+            other.ids, other.alive, other.position = array('q', self.ids), bytearray(self.alive), dict(self.position)
+            other.ints = {k: array('q', v) for k, v in self.ints.items()}
+            other.satisfaction = array('q', self.satisfaction)
+            other.has_satisfaction = bytearray(self.has_satisfaction)
+            other.done, other.has_completed = bytearray(self.done), bytearray(self.has_completed)
+            other.codes = {k: array('l', v) for k, v in self.codes.items()}
+            other.values = {k: list(v) for k, v in self.values.items()}
+            other._lookup = {k: dict(v) for k, v in self._lookup.items()}
+            return other
+
+        def _code(self, key: str, value: Any) -> int:
+            lookup = self._lookup[key]
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(self.values[key])
+                self.values[key].append(value)
+            return code
+
+        def _row(self, r: Dict[str, Any]) -> Tuple[Any, ...]:
+            m = self.mapping
+            end_col, status_col, completed_col = m.get('end'), m.get('status'), m.get('completed')
+            end_dt = row_end_date(r, end_col)
+            cv = r.get(completed_col) if completed_col is not None else 0
+            sat_col = m.get('satisfaction')
+            ints = [parse_int(r.get(m.get(k))) if m.get(k) else 0 for k in self.INT_KEYS]
+            # dashboard_trends 분기: 분기 컬럼, 없으면 개강일 분기, 그래도 없으면 Q1
+            quarter_col = m.get('quarter') or '분기'
+            q = str(r.get(quarter_col) or '').strip() if quarter_col else ''
+            trend_q = q
+            if not trend_q:
+                start_dt = safe_date(r.get(m['start'])) if m['start'] else None
+                trend_q = f"Q{((start_dt.month - 1)//3) + 1}" if start_dt else 'Q1'
+            # analytics_metrics 버킷 키 (종강일 기준)
+            ycol = m.get('year') or '년도'
+            codes = (
+                str(r.get(m.get('team', '')) or '').strip().lower(),
+                end_dt,
+                str(r.get(m.get('name'), '')),
+                trend_q,
+                str(end_dt.year) if end_dt else str(r.get(ycol) or ''),
+                q or (f"Q{((end_dt.month - 1)//3) + 1}" if end_dt else ''),
+                f"{end_dt.year}-{end_dt.month:02d}" if end_dt else '',
+                str(r.get(m.get('name')) or ''),
+            )
+            return (
+                ints,
+                satisfaction_units(r.get(sat_col)) if sat_col else 0,
+                1 if sat_col and r.get(sat_col) is not None else 0,
+                1 if status_col and str(r.get(status_col, '')).strip() == '종강' else 0,
+                0 if cv is None or (isinstance(cv, str) and cv.strip() == '') else 1,
+                codes,
+            )
+
+        def _set(self, i: int, row: Tuple[Any, ...]) -> None:
+            ints, sat, has_sat, done, has_completed, codes = row
+            for k, v in zip(self.INT_KEYS, ints):
+                self.ints[k][i] = v
+            self.satisfaction[i] = sat
+            self.has_satisfaction[i] = has_sat
+            self.done[i] = done
+            self.has_completed[i] = has_completed
+            for k, v in zip(self.CODE_KEYS, codes):
+                self.codes[k][i] = self._code(k, v)
+
+        def append(self, pid: int, r: Dict[str, Any]) -> None:
+            i = len(self.ids)
+            self.ids.append(pid)
+            self.alive.append(1)
+            self.position[pid] = i
+            for k in self.INT_KEYS:
+                self.ints[k].append(0)
+            self.satisfaction.append(0)
+            self.has_satisfaction.append(0)
+            self.done.append(0)
+            self.has_completed.append(0)
+            for k in self.CODE_KEYS:
+                self.codes[k].append(0)
+            self._set(i, self._row(r))
+
+        def apply(self, pid: int, r: Dict[str, Any] | None) -> bool:
+            """Apply one changed row (None = deleted). False when a full rebuild is needed."""
+            i = self.position.get(pid)
+            if r is None:
+                if i is not None and self.alive[i]:
+                    self.alive[i] = 0
+                    self.dead += 1
+            elif i is not None:
+                self._set(i, self._row(r))
+                if not self.alive[i]:
+                    self.alive[i] = 1
+                    self.dead -= 1
+            elif not self.ids or pid > self.ids[-1]:
+                self.append(pid, r)  # 행 순서(ORDER BY id)를 유지할 수 있을 때만 추가
+            else:
                 return False
-        dt = safe_date(row.get(end_col)) if end_col else None
-        if not dt and end_col and '종강' in end_col:
-            dt = safe_date(row.get('종강'))
-        if not dt:
-            return False
-        return date(2024, 7, 1) <= dt <= date(2025, 6, 30)
+            return True
+
+        def positions(self, ids: Any = None) -> List[int]:
+            """Live positions in id order, optionally restricted to a set of ids."""
+            if ids is None:
+                return list(compress(range(len(self.ids)), self.alive))
+            return sorted(self.position[i] for i in ids if i in self.position and self.alive[self.position[i]])
+
+        def groups(self, key: str, positions: List[int]) -> Dict[Any, List[int]]:
+            """positions split by the value of a dictionary-encoded column (order kept)."""
+            codes = self.codes[key]
+            out: Dict[int, List[int]] = {}
+            for i, c in zip(positions, map(codes.__getitem__, positions)):
+                bucket = out.get(c)
+                if bucket is None:
+                    out[c] = [i]
+                else:
+                    bucket.append(i)
+            values = self.values[key]
+            return {values[c]: p for c, p in out.items()}
+
+        def select(self, positions: List[int], key: str, predicate, cache_key: Any = None) -> List[int]:
+            """positions whose dictionary value satisfies predicate (evaluated once per distinct value).
+
+            With cache_key the value table is kept for later calls (e.g. per KPI period).
+            """
+            table = self._tables.get((key, cache_key)) if cache_key is not None else None
+            if table is None or len(table) != len(self.values[key]):
+                table = bytes(1 if predicate(v) else 0 for v in self.values[key])
+                if cache_key is not None:
+                    self._tables[(key, cache_key)] = table
+            codes = self.codes[key]
+            return list(compress(positions, map(table.__getitem__, map(codes.__getitem__, positions))))
+
+        def flag(self, positions: List[int], flags: bytearray) -> List[int]:
+            return list(compress(positions, map(flags.__getitem__, positions)))
+
+        def kpis(self, positions: List[int], period: KpiPeriod) -> Dict[str, float]:
+            """calc_kpis() over the rows at positions (same row-order sums)."""
+            totals = new_kpi_totals()
+            for k in self.INT_KEYS:
+                totals[k] = sum(map(self.ints[k].__getitem__, positions))
+            excluded = set(period.excluded_teams)
+            kept = self.select(positions, 'team', lambda t: t not in excluded, ('kept', period.excluded_teams))
+            totals['completion_confirmed'] = sum(map(self.ints['confirmed'].__getitem__, kept))
+            totals['completion_completed'] = sum(map(self.ints['completed'].__getitem__, kept))
+            totals['completion_complete_excluded'] = sum(map(self.ints['complete_excluded'].__getitem__, kept))
+            rated = self.flag(kept, self.has_satisfaction)
+            totals['satisfaction_sum'] = sum(map(self.satisfaction.__getitem__, rated))
+            totals['satisfaction_count'] = len(rated)
+            return finalize_kpis(totals)
+
+        def variants(self, positions: List[int], period: KpiPeriod) -> Dict[str, List[int]]:
+            """positions of each KpiAccumulator variant."""
+            end_year = self.select(positions, 'end', lambda d: bool(d and d.year == period.year),
+                                   ('end_year', period.year))
+            window = self.select(self.flag(self.flag(positions, self.done), self.has_completed), 'end',
+                                 lambda d: bool(d and period.window_start <= d <= period.window_end),
+                                 ('window', period.window_start, period.window_end))
+            return {'all': positions, 'end_year': end_year, 'done': self.flag(end_year, self.done), 'window': window}
+
+        def buckets(self, key: str, positions: List[int], period: KpiPeriod) -> Dict[Any, 'SnapshotKpis']:
+            return {k: SnapshotKpis(self, p, period) for k, p in self.groups(key, positions).items()}
+
+    class SnapshotKpis:
+        """KpiAccumulator interface (dashboard(), raw(), counts) over snapshot positions."""
+
+        def __init__(self, snap: ProgramSnapshot, positions: List[int], period: KpiPeriod):
+            self.snap = snap
+            self.positions = positions
+            self.period = period
+            self._variants: Dict[str, List[int]] | None = None
+
+        @property
+        def variants(self) -> Dict[str, List[int]]:
+            if self._variants is None:
+                self._variants = self.snap.variants(self.positions, self.period)
+            return self._variants
+
+        @property
+        def counts(self) -> Dict[str, int]:
+            return {k: len(p) for k, p in self.variants.items()}
+
+        def dashboard(self) -> Dict[str, float]:
+            v = self.variants
+            return dashboard_kpi_set(*(self.snap.kpis(v[k], self.period) for k in ('end_year', 'done', 'window')))
+
+        def raw(self) -> Dict[str, float]:
+            return self.snap.kpis(self.positions, self.period)
+
+    program_snapshot: Dict[str, Any] = {'value': None}
+    snapshot_lock = threading.Lock()
+
+    def load_snapshot_rows(conn: sqlite3.Connection, snap: 'ProgramSnapshot', ids: List[int] | None) -> bool:
+        if ids is None:
+            for r in map(dict, conn.execute("SELECT * FROM kdt_programs ORDER BY id")):
+                snap.append(r['id'], r)
+            return True
+        rows: Dict[int, Dict[str, Any]] = {}
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            cur = conn.execute(f"SELECT * FROM kdt_programs WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            rows.update((r['id'], r) for r in map(dict, cur))
+        return all(snap.apply(pid, rows.get(pid)) for pid in sorted(ids))
+
+    def get_program_snapshot(conn: sqlite3.Connection, mapping: Dict[str, str]) -> 'ProgramSnapshot | None':
+        """Snapshot in sync with the current data version, or None when disabled."""
+        if not PROGRAM_SNAPSHOT:
+            return None
+        snap = program_snapshot['value']
+        if snap is not None and snap.mapping is mapping and snap.version == get_data_version()[0]:
+            return snap
+        with snapshot_lock:
+            snap = program_snapshot['value']
+            conn.execute("BEGIN")  # 버전, 변경 로그, 행을 같은 시점에서 읽는다
+            try:
+                version = current_db_version(conn)
+                if snap is not None and snap.mapping is mapping and snap.version == version:
+                    return snap
+                rebuilt = False
+                # 변경 로그가 snap.version부터 빠짐없이 있을 때만 바뀐 행만 다시 읽는다
+                log_start = conn.execute("SELECT version FROM kdt_derived_state WHERE name = 'change_log'").fetchone()
+                if (snap is not None and snap.mapping is mapping and log_start is not None
+                        and log_start[0] <= snap.version <= version < snap.version + CHANGE_LOG_KEEP // 2):
+                    ids = [r[0] for r in conn.execute(
+                        "SELECT DISTINCT program_id FROM kdt_change_log WHERE version >= ?", (snap.version,)
+                    ).fetchall()]
+                    snap = snap.copy()
+                    # 지워진 행이 많으면 다시 만든다
+                    rebuilt = load_snapshot_rows(conn, snap, ids) and snap.dead * 4 <= len(snap.ids)
+                if not rebuilt:
+                    snap = ProgramSnapshot(mapping)
+                    load_snapshot_rows(conn, snap, None)
+                snap.version = version
+                program_snapshot['value'] = snap
+                return snap
+            finally:
+                conn.execute("COMMIT")
+
+    def filtered_program_ids(conn: sqlite3.Connection, where: str, params: List[Any]) -> set | None:
+        # 필터는 SQL(인덱스)로 id만 구한다 (타입 변환 규칙을 SQLite와 동일하게 유지)
+        if not where:
+            return None
+        return {r[0] for r in conn.execute(f"SELECT id FROM kdt_programs {where}", params).fetchall()}
+
+    # --------------------
+    # Request id: 클라이언트가 보낸 X-Request-ID를 이어 쓰고, 없으면 새로 발급해 로그와 응답에 싣는다
+    # --------------------
+    @app.before_request
+    def assign_request_id():
+        rid = request.headers.get(REQUEST_ID_HEADER, '')
+        g.request_id = rid if REQUEST_ID_PATTERN.fullmatch(rid) else uuid.uuid4().hex[:16]
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def add_request_id(resp: Response) -> Response:
+        resp.headers[REQUEST_ID_HEADER] = g.get('request_id', '')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("%s %s -> %s (%.1f ms)", request.method, request.full_path.rstrip('?'), resp.status_code,
+                         (time.perf_counter() - g.request_started) * 1000)
+        return resp
+
+    # --------------------
+    # Metrics: 라우트별 응답 시간(SQL / Python 분리)과 SQL 문장별 누계. /metrics(Prometheus), /api/metrics(JSON)
+    # --------------------
+    if request_metrics is not None:
+        @app.before_request
+        def start_request_metrics():
+            g.sql_metrics = [0.0, 0, 0]  # SQL 초, 문장 수, 행 수
+
+        @app.after_request
+        def record_request_metrics(resp: Response) -> Response:
+            sql_seconds, statements, rows = g.get('sql_metrics') or (0.0, 0, 0)
+            route = request.url_rule.rule if request.url_rule is not None else '<unmatched>'
+            request_metrics.observe_request(request.method, route, resp.status_code,
+                                            time.perf_counter() - g.request_started, sql_seconds, statements, rows)
+            return resp
+
+    @app.get('/metrics')
+    def metrics_prometheus():
+        if request_metrics is None:
+            return Response('metrics disabled\n', status=404, mimetype='text/plain')
+        return Response(request_metrics.prometheus(), mimetype='text/plain; version=0.0.4')
+
+    @app.get('/api/metrics')
+    def metrics_summary():
+        if request_metrics is None:
+            return jsonify({'enabled': False})
+        top = parse_int(request.args.get('top')) or 50
+        return jsonify({'enabled': True, **request_metrics.summary(top)})
+
+    # --------------------
+    # Conditional GET: 데이터 버전 기반 ETag / Last-Modified (일치하면 쿼리 없이 304)
+    # --------------------
+    ETAG_SALT = os.environ.get('KDT_ETAG_SALT') or str(int(os.path.getmtime(__file__)))
+    etag_exempt = {'cache_stats', 'metrics_summary', 'admin_check_kpi_buckets'}
+
+    def conditional_get_applies() -> bool:
+        return (request.method == 'GET' and request.path.startswith('/api/')
+                and request.endpoint is not None and request.endpoint not in etag_exempt)
+
+    def current_validators() -> Tuple[str, datetime | None]:
+        version, updated_at = get_data_version()
+        # 오늘 날짜에 의존하는 응답(타임라인, 최근 12개월)이 있어 날짜를 포함
+        etag = f"{ETAG_SALT}-{version}-{date.today().strftime('%Y%m%d')}"
+        try:
+            last_modified = datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            last_modified = None
+        return etag, last_modified
+
+    def set_validators(resp: Response, etag: str, last_modified: datetime | None) -> None:
+        resp.set_etag(etag, weak=True)
+        if last_modified is not None:
+            resp.last_modified = last_modified
+        resp.cache_control.no_cache = True
+
+    @app.before_request
+    def answer_conditional_get():
+        if not conditional_get_applies():
+            return None
+        etag, last_modified = current_validators()
+        if request.if_none_match:
+            not_modified = request.if_none_match.contains_weak(etag)
+        else:
+            not_modified = bool(request.if_modified_since and last_modified and last_modified <= request.if_modified_since)
+        if not not_modified:
+            return None
+        resp = Response(status=304)
+        set_validators(resp, etag, last_modified)
+        return resp
+
+    @app.after_request
+    def add_conditional_get_validators(resp: Response) -> Response:
+        if resp.status_code == 200 and conditional_get_applies():
+            etag, last_modified = current_validators()
+            set_validators(resp, etag, last_modified)
+        return resp
 
     # --------------------
     # Routes
@@ -302,11 +2532,75 @@ def create_app() -> Flask:
     def index():
         return render_template('index.html')
 
+    @app.get('/api/cache/stats')
+    def cache_stats():
+        stats = result_cache.stats()
+        stats['data_version'] = get_data_version()[0]
+        snap = program_snapshot['value']
+        stats['program_snapshot'] = None if snap is None else {
+            'version': snap.version,
+            'rows': len(snap.ids) - snap.dead,
+            'dead': snap.dead,
+        }
+        return jsonify(stats)
+
+    # 외부에서 스키마를 변경한 경우 캐시 갱신
+    @app.post('/api/admin/schema/refresh')
+    def admin_refresh_schema():
+        try:
+            mapping = refresh_schema_cache()
+            ensure_filter_indexes()
+            ensure_program_name_fts()
+            ensure_kpi_buckets()
+            return jsonify({"success": True, "mapping": mapping})
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "message": str(e)})
+
+    # KPI 버킷을 처음부터 다시 계산해 저장된 합계와 비교
+    @app.get('/api/admin/kpi-buckets/check')
+    def admin_check_kpi_buckets():
+        try:
+            conn = get_db_connection(readonly=True)
+            report = check_kpi_buckets(conn)
+            report['enabled'] = KPI_BUCKETS
+            report['current'] = kpi_buckets_current(conn)
+            return jsonify(report)
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"ok": False, "message": str(e)})
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    @app.post('/api/admin/kpi-buckets/rebuild')
+    def admin_rebuild_kpi_buckets():
+        if not KPI_BUCKETS:
+            # 트리거 없이 만든 테이블은 다음 쓰기부터 어긋난다
+            return jsonify({"success": False, "message": "KPI 버킷이 꺼져 있습니다 (KDT_KPI_BUCKETS=0)."}), 400
+        try:
+            conn = get_db_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            rebuild_kpi_buckets(conn)
+            conn.commit()
+            data_written()
+            return jsonify({"success": True, **check_kpi_buckets(conn)})
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "message": str(e)})
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
     # 월별 데이터 조회 API
     @app.get('/api/programs/<int:pid>/monthly-hours')
     def get_monthly_hours(pid: int):
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             cur = conn.execute("SELECT * FROM kdt_monthly_hours WHERE id = ?", (pid,))
             row = cur.fetchone()
             if row:
@@ -314,7 +2608,7 @@ def create_app() -> Flask:
             else:
                 return jsonify({})
         except Exception as e:
-            print(f"Error getting monthly hours: {e}")
+            logger.exception("Error getting monthly hours: %s", e)
             return jsonify({})
         finally:
             try:
@@ -325,7 +2619,7 @@ def create_app() -> Flask:
     @app.get('/api/programs/<int:pid>/monthly-enrollments')
     def get_monthly_enrollments(pid: int):
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             cur = conn.execute("SELECT * FROM kdt_monthly_enrollments WHERE id = ?", (pid,))
             row = cur.fetchone()
             if row:
@@ -333,7 +2627,7 @@ def create_app() -> Flask:
             else:
                 return jsonify({})
         except Exception as e:
-            print(f"Error getting monthly enrollments: {e}")
+            logger.exception("Error getting monthly enrollments: %s", e)
             return jsonify({})
         finally:
             try:
@@ -345,7 +2639,7 @@ def create_app() -> Flask:
     @app.get('/api/filters/years')
     def get_years():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             year_col = mapping['year'] or '년도'
             years: List[int] = []
@@ -354,7 +2648,7 @@ def create_app() -> Flask:
                 years = [parse_int(r['y']) for r in cur.fetchall() if r['y'] is not None]
             return jsonify(years)
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -365,12 +2659,12 @@ def create_app() -> Flask:
     @app.get('/api/filters/quarters')
     def get_quarters():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             quarter_col = mapping['quarter'] or '분기'
             quarters: List[str] = []
             if quarter_col:
-                cur = conn.execute(f"SELECT DISTINCT {quarter_col} as q FROM kdt_programs WHERE {quarter_col} IS NOT NULL")
+                cur = conn.execute(f"SELECT {quarter_col} as q FROM kdt_programs WHERE {quarter_col} IS NOT NULL GROUP BY {quarter_col} ORDER BY MIN(id)")
                 quarters = [str(r['q']) for r in cur.fetchall() if r['q'] is not None]
                 if not quarters:
                     quarters = ['Q1', 'Q2', 'Q3', 'Q4']
@@ -378,7 +2672,7 @@ def create_app() -> Flask:
                 quarters = ['Q1', 'Q2', 'Q3', 'Q4']
             return jsonify(quarters)
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify(['Q1', 'Q2', 'Q3', 'Q4'])
         finally:
             try:
@@ -389,16 +2683,16 @@ def create_app() -> Flask:
     @app.get('/api/filters/team')
     def get_team_filter():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             team_col = mapping['team']
             if not team_col:
                 return jsonify([])
-            cur = conn.execute(f"SELECT DISTINCT {team_col} as t FROM kdt_programs WHERE {team_col} IS NOT NULL")
+            cur = conn.execute(f"SELECT {team_col} as t FROM kdt_programs WHERE {team_col} IS NOT NULL GROUP BY {team_col} ORDER BY MIN(id)")
             teams = [str(r['t']) for r in cur.fetchall() if r['t']]
             return jsonify(teams)
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -406,6 +2700,40 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    @app.get('/api/filters/kpi-periods')
+    @cached_result
+    def get_kpi_periods():
+        """KPI reporting periods: the configured default, the one selected by the query args,
+        and the 종강 years present in the data (candidates for period=)."""
+        def period_json(p: KpiPeriod) -> Dict[str, Any]:
+            return {
+                'period': p.year,
+                'window_start': p.window_start.isoformat(),
+                'window_end': p.window_end.isoformat(),
+                'exclude_teams': list(p.excluded_teams),
+            }
+        try:
+            conn = get_db_connection(readonly=True)
+            selected = kpi_period_from_args(request.args)
+            mapping = get_schema_mapping(conn)
+            end_expr = sql_end_date(mapping, get_table_columns(conn, 'kdt_programs'))
+            cur = conn.execute(
+                f"SELECT DISTINCT substr(e, 1, 4) AS y FROM (SELECT {end_expr} AS e FROM kdt_programs) "
+                f"WHERE e IS NOT NULL ORDER BY y DESC"
+            )
+            years = [int(r['y']) for r in cur.fetchall()]
+            return jsonify({'default': period_json(DEFAULT_KPI_PERIOD), 'selected': period_json(selected), 'years': years})
+        except KpiPeriodError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({'default': None, 'selected': None, 'years': []})
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
     # Programs CRUD
     def build_program_filters(args: Dict[str, Any], mapping: Dict[str, str]) -> Tuple[str, List[Any]]:
         clauses: List[str] = []
@@ -426,17 +2754,171 @@ def create_app() -> Flask:
         where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
         return where, params
 
+    # KPI 엔진들을 밖(테스트)에서 같은 입력으로 비교할 수 있게 노출
+    app.extensions['kdt_kpi'] = {
+        'build_program_filters': build_program_filters,
+        'calc_kpis': calc_kpis,
+        'kpi_groups_sql': kpi_groups_sql,
+        'calc_kpis_from_groups': calc_kpis_from_groups,
+        'dashboard_kpi_set': dashboard_kpi_set,
+        'row_end_date': row_end_date,
+        'get_schema_mapping': get_schema_mapping,
+    }
+
+    PROGRAMS_PAGE_MAX = 1000
+    STREAM_BATCH_SIZE = 500
+    PROGRAM_SEARCH_LIMIT = 20
+    PROGRAM_SEARCH_LIMIT_MAX = 100
+
+    def stream_program_rows(conn: sqlite3.Connection, cur: sqlite3.Cursor, ndjson: bool):
+        # 커서에서 배치 단위로 읽어 바로 내보낸다 (전체 목록을 메모리에 만들지 않음)
+        try:
+            if not ndjson:
+                yield '['
+            first = True
+            while True:
+                batch = cur.fetchmany(STREAM_BATCH_SIZE)
+                if not batch:
+                    break
+                for r in batch:
+                    item = app.json.dumps(dict(r))
+                    if ndjson:
+                        yield item + '\n'
+                    else:
+                        yield item if first else ',' + item
+                        first = False
+            if not ndjson:
+                yield ']'
+        finally:
+            conn.close()
+
+    def export_response(conn: sqlite3.Connection, fmt: str, filename: str, header: List[str], rows: Any) -> Response:
+        """rows(iterator)를 CSV/XLSX로 스트리밍; 스트림이 끝나면 conn을 닫는다."""
+        def generate():
+            try:
+                if fmt == 'xlsx':
+                    yield from iter_xlsx(filename, header, rows)
+                else:
+                    yield from iter_csv(header, rows)
+            finally:
+                conn.close()
+        if fmt == 'xlsx':
+            mimetype = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        else:
+            mimetype = 'text/csv'  # werkzeug가 charset=utf-8을 붙인다
+        resp = Response(generate(), mimetype=mimetype)
+        resp.headers['Content-Disposition'] = f'attachment; filename="{filename}.{fmt}"'
+        return resp
+
+    def export_format() -> str:
+        fmt = (request.args.get('format') or 'csv').lower()
+        if fmt not in ('csv', 'xlsx'):
+            raise ExportFormatError(f"지원하지 않는 형식: {fmt} (csv, xlsx)")
+        return fmt
+
+    def export_year(year: str) -> str:
+        """year= as it goes into an export filename: 'all' or the parsed int, never the raw query string."""
+        if year.lower() == 'all':
+            return 'all'
+        try:
+            return str(int(year))
+        except ValueError:
+            raise ExportFormatError(f"연도는 숫자 또는 all이어야 합니다: {year}") from None
+
     @app.get('/api/programs')
     def list_programs():
+        """Programs list.
+
+        Optional query args on top of the year/quarter/category/status filters:
+        fields (comma-separated column projection), limit + after_id (keyset
+        pagination; the next cursor is returned in X-Next-After-Id), and
+        format=ndjson or stream=1 for a streamed NDJSON / chunked JSON array body.
+        """
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             where, params = build_program_filters(request.args, mapping)
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
+
+            # fields=: 존재하는 컬럼만 허용
+            cols = get_table_columns(conn, 'kdt_programs')
+            fields = [f.strip() for f in (request.args.get('fields') or '').split(',') if f.strip() in cols]
+            limit = request.args.get('limit', type=int)
+            after_id = request.args.get('after_id', type=int)
+            if fields and limit and 'id' not in fields:
+                fields.insert(0, 'id')  # 다음 페이지 커서용
+            select = ', '.join(quote_ident(f) for f in dict.fromkeys(fields)) if fields else '*'
+
+            if after_id is not None:
+                where = f"{where} AND id > ?" if where else "WHERE id > ?"
+                params.append(after_id)
+            sql = f"SELECT {select} FROM kdt_programs {where} ORDER BY id"
+            if limit:
+                limit = max(1, min(limit, PROGRAMS_PAGE_MAX))
+                sql += " LIMIT ?"
+                params.append(limit)
+
+            ndjson = request.args.get('format') == 'ndjson'
+            if ndjson or request.args.get('stream') == '1':
+                cur = conn.execute(sql, params)
+                stream_conn, conn = conn, None  # 스트림이 끝나면 generator가 닫는다
+                return Response(
+                    stream_program_rows(stream_conn, cur, ndjson),
+                    mimetype='application/x-ndjson' if ndjson else 'application/json'
+                )
+
+            cur = conn.execute(sql, params)
             rows = [dict(r) for r in cur.fetchall()]
-            return jsonify(rows)
+            resp = jsonify(rows)
+            if limit and len(rows) == limit:
+                resp.headers['X-Next-After-Id'] = str(rows[-1]['id'])
+            return resp
+        except Exception as e:
+            logger.exception(e)
+            return jsonify([])
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    # 과정 선택 드롭다운용 검색 (전체 목록을 내려받지 않는다)
+    @app.get('/api/programs/search')
+    def search_programs():
+        """Typeahead: programs whose HRD_Net_과정명/과정명/과정코드 contains q (case-insensitive).
+
+        Same year/quarter/category/status filters as /api/programs; returns at most
+        limit rows (default 20) with id, the name/code columns and 회차, in id order.
+        """
+        try:
+            conn = get_db_connection(readonly=True)
+            mapping = get_schema_mapping(conn)
+            where, params = build_program_filters(request.args, mapping)
+            name_cols = program_name_columns(conn)
+            q = (request.args.get('q') or '').strip()
+            limit = max(1, min(request.args.get('limit', PROGRAM_SEARCH_LIMIT, type=int), PROGRAM_SEARCH_LIMIT_MAX))
+
+            if q and name_cols:
+                if len(q) >= 3 and program_name_fts_ready(conn, name_cols):
+                    cond = "id IN (SELECT rowid FROM program_names_fts WHERE program_names_fts MATCH ?)"
+                    params.append(fts_phrase(q))
+                else:
+                    cond = '(' + ' OR '.join(
+                        f"instr(lower(COALESCE({quote_ident(c)}, '')), lower(?)) > 0" for c in name_cols
+                    ) + ')'
+                    params.extend([q] * len(name_cols))
+                where = f"{where} AND {cond}" if where else f"WHERE {cond}"
+
+            # 드롭다운은 회차를 표시한다 (매핑된 회차 열이 다르면 둘 다)
+            cols = get_table_columns(conn, 'kdt_programs')
+            rounds = [c for c in (mapping.get('batch'), '회차') if c and c in cols]
+            fields = list(dict.fromkeys(['id'] + name_cols + rounds))
+            cur = conn.execute(
+                f"SELECT {', '.join(quote_ident(f) for f in fields)} FROM kdt_programs {where} ORDER BY id LIMIT ?",
+                params + [limit]
+            )
+            return jsonify([dict(r) for r in cur.fetchall()])
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -444,49 +2926,83 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    @app.get('/api/programs/export')
+    def export_programs():
+        """Programs as CSV (default) or XLSX; same filters and fields= projection as /api/programs."""
+        conn = None
+        try:
+            fmt = export_format()
+            conn = get_db_connection(readonly=True)
+            mapping = get_schema_mapping(conn)
+            where, params = build_program_filters(request.args, mapping)
+            cols = get_table_columns(conn, 'kdt_programs')
+            fields = [f.strip() for f in (request.args.get('fields') or '').split(',') if f.strip() in cols]
+            select = ', '.join(quote_ident(f) for f in dict.fromkeys(fields)) if fields else '*'
+            cur = conn.execute(f"SELECT {select} FROM kdt_programs {where} ORDER BY id", params)
+            header = [d[0] for d in cur.description]
+            export_conn, conn = conn, None  # 스트림이 끝나면 export_response가 닫는다
+            return export_response(export_conn, fmt, 'programs', header, (tuple(r) for r in cur))
+        except ExportFormatError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "message": str(e)}), 500
+        finally:
+            if conn is not None:
+                conn.close()
+
+    # Accept Korean keys and some English alternatives
+    PAYLOAD_KEY_MAP = {
+        '과정코드': ['과정코드', 'program_code', 'code'],
+        'HRD_Net_과정명': ['HRD_Net_과정명', '과정명', 'name', 'program_name'],
+        '회차': ['회차', 'round'],
+        '기수': ['기수', '배치', 'batch'],
+        '진행상태': ['진행상태', 'status'],
+        '개강일': ['개강일', '개강', 'start_date'],
+        '종강일': ['종강일', '종강', 'end_date'],
+        '년도': ['년도', 'year'],
+        '분기': ['분기', 'quarter'],
+        '담당팀': ['담당팀', '팀', '과정구분', 'category', 'team'],
+        '교육시간': ['교육시간', 'hours'],
+        '정원': ['정원', 'capacity'],
+        'HRD_확정': ['HRD_확정', 'confirmed'],
+        '중도이탈': ['중도이탈', 'dropouts'],
+        '수료인원': ['수료인원', 'completed'],
+        '취업인원': ['취업인원', 'employed'],
+        '근로자': ['근로자', 'workers'],
+        '취업산정제외인원': ['취업산정제외인원', 'employment_excluded'],
+        '수료산정 제외인원': ['수료산정 제외인원', '산정제외', 'excluded'],
+        'HRD_만족도': ['HRD_만족도', 'satisfaction']
+    }
+
     def normalize_payload(payload: Dict[str, Any], conn: sqlite3.Connection) -> Dict[str, Any]:
-        # Accept Korean keys and some English alternatives
         cols = get_table_columns(conn, 'kdt_programs')
-        key_map = {
-            '과정코드': ['과정코드', 'program_code', 'code'],
-            'HRD_Net_과정명': ['HRD_Net_과정명', '과정명', 'name', 'program_name'],
-            '회차': ['회차', 'round'],
-            '기수': ['기수', '배치', 'batch'],
-            '진행상태': ['진행상태', 'status'],
-            '개강일': ['개강일', '개강', 'start_date'],
-            '종강일': ['종강일', '종강', 'end_date'],
-            '년도': ['년도', 'year'],
-            '분기': ['분기', 'quarter'],
-            '담당팀': ['담당팀', '팀', '과정구분', 'category', 'team'],
-            '교육시간': ['교육시간', 'hours'],
-            '정원': ['정원', 'capacity'],
-            'HRD_확정': ['HRD_확정', 'confirmed'],
-            '중도이탈': ['중도이탈', 'dropouts'],
-            '수료인원': ['수료인원', 'completed'],
-            '취업인원': ['취업인원', 'employed'],
-            '근로자': ['근로자', 'workers'],
-            '취업산정제외인원': ['취업산정제외인원', 'employment_excluded'],
-            '수료산정 제외인원': ['수료산정 제외인원', '산정제외', 'excluded'],
-            'HRD_만족도': ['HRD_만족도', 'satisfaction']
-        }
         normalized: Dict[str, Any] = {}
-        for target_key, aliases in key_map.items():
+        for target_key, aliases in PAYLOAD_KEY_MAP.items():
             for a in aliases:
                 if a in payload and target_key in cols:
                     normalized[target_key] = payload[a]
                     break
+        # 날짜는 ISO(YYYY-MM-DD)로 저장 (해석할 수 없는 값은 그대로 둔다)
+        for c in DATE_COLUMNS:
+            v = normalized.get(c)
+            if isinstance(v, str) and not v.strip():
+                normalized[c] = None
+            elif v is not None:
+                dt = safe_date(v)
+                if dt:
+                    normalized[c] = dt.isoformat()
         # Ensure any nullable missing keys exist as None
         for c in cols:
             if c not in normalized and c != 'id':
                 normalized[c] = None
         return normalized
 
-    def quote_ident(name: str) -> str:
-        return '"' + str(name).replace('"', '""') + '"'
-
     # 월별 데이터 저장 함수
     def save_monthly_data(conn: sqlite3.Connection, program_id: int, hours_data: dict, enrollments_data: dict):
         try:
+            conn.execute("BEGIN IMMEDIATE")
+            revenue_current = revenue_facts_current(conn)
             # 기존 데이터 삭제
             conn.execute("DELETE FROM kdt_monthly_hours WHERE id = ?", (program_id,))
             conn.execute("DELETE FROM kdt_monthly_enrollments WHERE id = ?", (program_id,))
@@ -506,9 +3022,11 @@ def create_app() -> Flask:
                 enroll_sql = f"INSERT OR REPLACE INTO kdt_monthly_enrollments ({','.join([quote_ident(c) for c in enroll_cols])}) VALUES ({enroll_placeholders})"
                 conn.execute(enroll_sql, enroll_vals)
             
+            refresh_revenue_facts(conn, [program_id] if revenue_current else None)
             conn.commit()
+            data_written()
         except Exception as e:
-            print(f"Error saving monthly data: {e}")
+            logger.exception("Error saving monthly data: %s", e)
             conn.rollback()
 
     @app.post('/api/programs')
@@ -525,16 +3043,22 @@ def create_app() -> Flask:
             cols = [k for k in data.keys() if k != 'id']
             placeholders = ','.join(['?'] * len(cols))
             sql = f"INSERT INTO kdt_programs ({','.join([quote_ident(c) for c in cols])}) VALUES ({placeholders})"
+            conn.execute("BEGIN IMMEDIATE")
+            kpi_before = kpi_buckets_before(conn, [])
+            revenue_current = revenue_facts_current(conn)
             cur = conn.execute(sql, [data[c] for c in cols])
             program_id = cur.lastrowid
+            refresh_revenue_facts(conn, [program_id] if revenue_current else None)
+            update_kpi_buckets(conn, [program_id], kpi_before)
             conn.commit()
+            data_written()
             
             # 월별 데이터 저장
             save_monthly_data(conn, program_id, monthly_hours, monthly_enrollments)
             
             return jsonify({"id": program_id, "success": True, "message": "생성되었습니다."})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({"id": None, "success": False, "message": str(e)})
         finally:
             try:
@@ -558,15 +3082,21 @@ def create_app() -> Flask:
             sets = [f"{quote_ident(k)} = ?" for k in data.keys() if k != 'id']
             sql = f"UPDATE kdt_programs SET {', '.join(sets)} WHERE id = ?"
             params = [data[k] for k in data.keys() if k != 'id'] + [pid]
+            conn.execute("BEGIN IMMEDIATE")
+            kpi_before = kpi_buckets_before(conn, [pid])
+            revenue_current = revenue_facts_current(conn)
             conn.execute(sql, params)
+            refresh_revenue_facts(conn, [pid] if revenue_current else None)
+            update_kpi_buckets(conn, [pid], kpi_before)
             conn.commit()
+            data_written()
             
             # 월별 데이터 저장 (기존 데이터 대체)
             save_monthly_data(conn, pid, monthly_hours, monthly_enrollments)
             
             return jsonify({"id": pid, "success": True, "message": "수정되었습니다."})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({"id": pid, "success": False, "message": str(e)})
         finally:
             try:
@@ -578,11 +3108,17 @@ def create_app() -> Flask:
     def delete_program(pid: int):
         try:
             conn = get_db_connection()
+            conn.execute("BEGIN IMMEDIATE")
+            kpi_before = kpi_buckets_before(conn, [pid])
+            revenue_current = revenue_facts_current(conn)
             conn.execute("DELETE FROM kdt_programs WHERE id = ?", (pid,))
+            refresh_revenue_facts(conn, [pid] if revenue_current else None)
+            update_kpi_buckets(conn, [pid], kpi_before)
             conn.commit()
+            data_written()
             return jsonify({"id": pid, "success": True, "message": "삭제되었습니다."})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({"id": pid, "success": False, "message": str(e)})
         finally:
             try:
@@ -594,11 +3130,15 @@ def create_app() -> Flask:
     def reset_programs():
         try:
             conn = get_db_connection()
+            conn.execute("BEGIN IMMEDIATE")
             conn.execute("DELETE FROM kdt_programs")
+            refresh_revenue_facts(conn, None)
+            update_kpi_buckets(conn, [], None)  # 전체 삭제는 빈 테이블로 다시 만든다
             conn.commit()
+            data_written()
             return jsonify({"success": True, "message": "전체 삭제되었습니다."})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({"success": False, "message": str(e)})
         finally:
             try:
@@ -606,41 +3146,185 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    # --------------------
+    # Bulk import: JSON 배열 / CSV / NDJSON 본문을 한 트랜잭션으로 적재
+    # --------------------
+    MONTH_KEYS = [f"{m}M" for m in range(1, 13)]
+    BULK_MONTHLY_FIELDS = (('monthly_hours', 'hours_'), ('monthly_enrollments', 'enrollments_'))
+
+    def parse_bulk_body() -> List[Any]:
+        """요청 본문을 행 목록으로 변환 (Content-Type: application/json, text/csv, application/x-ndjson)."""
+        content_type = (request.mimetype or '').lower()
+        text = request.get_data(as_text=True)
+        if content_type in ('text/csv', 'application/csv'):
+            rows: List[Any] = []
+            for r in csv.DictReader(io.StringIO(text.lstrip('\ufeff'))):
+                row: Dict[str, Any] = {}
+                for k, v in r.items():
+                    if k is None:
+                        continue
+                    v = v.strip() if isinstance(v, str) else v
+                    row[k.strip()] = v if v != '' else None
+                # hours_1M.. / enrollments_1M.. 컬럼은 월별 데이터로 묶는다
+                for field, prefix in BULK_MONTHLY_FIELDS:
+                    monthly = {k[len(prefix):]: row.pop(k) for k in list(row) if k.startswith(prefix)}
+                    monthly = {k: v for k, v in monthly.items() if v is not None}
+                    if monthly:
+                        row[field] = monthly
+                rows.append(row)
+            return rows
+        if content_type in ('application/x-ndjson', 'application/ndjson', 'application/jsonl'):
+            rows = []
+            for line in text.splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except ValueError as e:
+                    rows.append(ValueError(f"JSON 파싱 실패: {e}"))
+            return rows
+        payload = json.loads(text) if text.strip() else []
+        if isinstance(payload, dict):
+            payload = payload.get('programs', [])
+        if not isinstance(payload, list):
+            raise ValueError("JSON 배열 또는 {\"programs\": [...]} 형식이어야 합니다.")
+        return payload
+
+    def bulk_monthly_values(monthly: Any) -> List[int]:
+        if not isinstance(monthly, dict):
+            raise ValueError("월별 데이터는 {\"1M\": 값, ...} 형식이어야 합니다.")
+        values = dict.fromkeys(MONTH_KEYS, 0)
+        for k, v in monthly.items():
+            if k not in values:
+                raise ValueError(f"알 수 없는 월 키: {k}")
+            if v is None or v == '':
+                continue
+            try:
+                n = int(v)
+            except (TypeError, ValueError):
+                raise ValueError(f"{k} 값이 정수가 아닙니다: {v}")
+            if n < 0:
+                raise ValueError(f"{k} 값은 0 이상이어야 합니다: {v}")
+            values[k] = n
+        return [values[k] for k in MONTH_KEYS]
+
+    @app.post('/api/programs/bulk')
+    def bulk_import_programs():
+        started = time.perf_counter()
+        try:
+            rows = parse_bulk_body()
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "inserted": 0, "failed": 0, "errors": [], "message": str(e)}), 400
+
+        try:
+            conn = get_db_connection()
+            cols = [c for c in get_table_columns(conn, 'kdt_programs') if c != 'id']
+            known = {a for aliases in PAYLOAD_KEY_MAP.values() for a in aliases}
+            errors: List[Dict[str, Any]] = []
+            programs: List[Tuple[Dict[str, Any], Dict[str, List[int]]]] = []
+            for i, raw in enumerate(rows):
+                try:
+                    if isinstance(raw, Exception):
+                        raise raw
+                    if not isinstance(raw, dict):
+                        raise ValueError("각 행은 객체여야 합니다.")
+                    if not known.intersection(raw):
+                        raise ValueError("인식할 수 있는 필드가 없습니다.")
+                    monthly = {
+                        field: bulk_monthly_values(raw[field])
+                        for field, _ in BULK_MONTHLY_FIELDS if raw.get(field)
+                    }
+                    programs.append((normalize_payload(raw, conn), monthly))
+                except Exception as e:
+                    errors.append({"row": i, "message": str(e)})
+
+            ids: List[int] = []
+            if programs:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    kpi_before = kpi_buckets_before(conn, [])
+                    revenue_current = revenue_facts_current(conn)
+                    # id를 미리 배정해 월별 테이블도 executemany로 한 번에 넣는다
+                    # (AUTOINCREMENT와 같게, 삭제된 id는 재사용하지 않음)
+                    next_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM kdt_programs").fetchone()[0]
+                    if table_exists(conn, 'sqlite_sequence'):
+                        seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'kdt_programs'").fetchone()
+                        if seq and seq[0] is not None:
+                            next_id = max(next_id, seq[0] + 1)
+                    ids = list(range(next_id, next_id + len(programs)))
+                    conn.executemany(
+                        f"INSERT INTO kdt_programs (id, {','.join(quote_ident(c) for c in cols)}) "
+                        f"VALUES (?, {','.join('?' * len(cols))})",
+                        [[pid] + [data.get(c) for c in cols] for pid, (data, _) in zip(ids, programs)]
+                    )
+                    month_cols = ','.join(quote_ident(k) for k in MONTH_KEYS)
+                    for field, table in (('monthly_hours', 'kdt_monthly_hours'),
+                                         ('monthly_enrollments', 'kdt_monthly_enrollments')):
+                        monthly_rows = [[pid] + monthly[field] for pid, (_, monthly) in zip(ids, programs) if field in monthly]
+                        if monthly_rows:
+                            conn.executemany(
+                                f"INSERT OR REPLACE INTO {table} (id, {month_cols}) VALUES (?, {','.join('?' * 12)})",
+                                monthly_rows
+                            )
+                    refresh_revenue_facts(conn, ids if revenue_current else None)
+                    update_kpi_buckets(conn, ids, kpi_before)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                data_written()
+
+            elapsed = time.perf_counter() - started
+            return jsonify({
+                "success": not errors,
+                "inserted": len(ids),
+                "failed": len(errors),
+                "errors": errors,
+                "ids": ids,
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "rows_per_sec": round(len(ids) / elapsed, 1) if elapsed > 0 else None,
+            })
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "inserted": 0, "failed": len(rows), "errors": [], "message": str(e)})
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
     # Dashboard
     @app.get('/api/dashboard/kpi')
+    @cached_result
     def dashboard_kpi():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             where, params = build_program_filters(request.args, mapping)
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
-            rows = [dict(r) for r in cur.fetchall()]
-            # 전체 KPI (초기값)
-            kpi_all = calc_kpis(rows, mapping)
-            # 종강 연도 2025 필터
-            end_col = mapping.get('end')
-            def end_year_is_2025(r: Dict[str, Any]) -> bool:
-                dt = safe_date(r.get(end_col)) if end_col else None
-                if not dt and end_col and '종강' in end_col:
-                    dt = safe_date(r.get('종강'))
-                return bool(dt and dt.year == 2025)
-
-            rows_end2025 = [r for r in rows if end_year_is_2025(r)]
-            kpi_2025 = calc_kpis(rows_end2025, mapping)
-            status_col = mapping.get('status')
-            done_rows_2025 = [r for r in rows_end2025 if status_col and str(r.get(status_col, '')).strip() == '종강']
-            kpi_done_2025 = calc_kpis(done_rows_2025, mapping)
-
-            kpi_all['모집률'] = kpi_2025['모집률']
-            kpi_all['수료율'] = kpi_done_2025['수료율']
-            kpi_all['만족도'] = kpi_done_2025['만족도']
-            # 취업률: 2024-07-01 ~ 2025-06-30 사이에 종강했고 상태 '종강'인 행만 대상
-            rows_window_done = [r for r in rows if ended_in_window_and_done(r, end_col, status_col, mapping.get('completed'))]
-            kpi_window = calc_kpis(rows_window_done, mapping)
-            kpi_all['취업률'] = kpi_window['취업률']
-            return jsonify(kpi_all)
+            period = kpi_period_from_args(request.args)
+            snap = get_program_snapshot(conn, mapping)
+            if snap is not None:
+                return jsonify(SnapshotKpis(snap, snap.positions(filtered_program_ids(conn, where, params)), period).dashboard())
+            buckets = load_kpi_buckets(conn, period, where, params)
+            if buckets is not None:
+                acc = KpiAccumulator(mapping, period)
+                for b in buckets:
+                    acc.add_bucket(b)
+                return jsonify(acc.dashboard())
+            groups = kpi_groups_sql(conn, mapping, where, params, period)
+            return jsonify(dashboard_kpi_set(
+                # 모집률: 대상 연도 종강
+                calc_kpis_from_groups(groups, lambda g: g['end_year']),
+                # 수료율/만족도: 대상 연도 종강 + 상태 종강
+                calc_kpis_from_groups(groups, lambda g: g['end_year'] and g['done']),
+                # 취업률: 취업 윈도우 안에 종강했고 상태 '종강'인 행만 대상
+                calc_kpis_from_groups(groups, lambda g: g['in_window']),
+            ))
+        except KpiPeriodError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'모집률': 0, '수료율': 0, '취업률': 0, '만족도': 0})
         finally:
             try:
@@ -649,10 +3333,12 @@ def create_app() -> Flask:
                 pass
 
     @app.get('/api/dashboard/trends')
+    @cached_result
     def dashboard_trends():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
+            period = kpi_period_from_args(request.args)
             # Aggregate by quarter of the given year, or across available if not provided
             year = request.args.get('year')
             quarter_col = mapping['quarter'] or '분기'
@@ -663,61 +3349,68 @@ def create_app() -> Flask:
                 where_clauses.append(f"{year_col} = ?")
                 params.append(year)
             where = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ''
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
-            rows = [dict(r) for r in cur.fetchall()]
 
-            # group by quarter
-            buckets: Dict[str, List[Dict[str, Any]]] = {}
+            # group by quarter: 행마다 한 번씩 분기 누산기에 더한다 (스냅샷이 있으면 미리 계산된 분기 키 사용)
+            snap = get_program_snapshot(conn, mapping)
+            bucket_rows = load_kpi_buckets(conn, period, where, params, ('trend_quarter',)) if snap is None else None
+            if snap is not None:
+                positions = snap.positions(filtered_program_ids(conn, where, params))
+                buckets: Dict[str, Any] = snap.buckets('trend_quarter', positions, period)
+                rows = ()
+            elif bucket_rows is not None:
+                # KPI 버킷: 분기별 합계를 버킷 수만큼만 더한다
+                buckets = {}
+                for b in bucket_rows:
+                    acc = buckets.get(b['trend_quarter'])
+                    if acc is None:
+                        acc = buckets[b['trend_quarter']] = KpiAccumulator(mapping, period)
+                    acc.add_bucket(b)
+                rows = ()
+            else:
+                buckets = {}
+                rows = map(dict, conn.execute(f"SELECT * FROM kdt_programs {where} ORDER BY id", params))
+            s_col = mapping['start']
             for r in rows:
                 q = str(r.get(quarter_col) or '').strip() if quarter_col else ''
                 if not q:
                     # derive quarter from start date if possible
-                    s_col = mapping['start']
                     dt = safe_date(r.get(s_col)) if s_col else None
                     if dt:
                         month = dt.month
                         q = f"Q{((month - 1)//3) + 1}"
                 if not q:
                     q = 'Q1'
-                buckets.setdefault(q, []).append(r)
+                acc = buckets.get(q)
+                if acc is None:
+                    acc = buckets[q] = KpiAccumulator(mapping, period)
+                acc.add(r)
 
             result = []
             for q in ['Q1', 'Q2', 'Q3', 'Q4']:
-                brs = buckets.get(q, [])
-                end_col = mapping.get('end')
-                def end_year_is_2025(r: Dict[str, Any]) -> bool:
-                    dt = safe_date(r.get(end_col)) if end_col else None
-                    if not dt and end_col and '종강' in end_col:
-                        dt = safe_date(r.get('종강'))
-                    return bool(dt and dt.year == 2025)
-
-                brs_end2025 = [r for r in brs if end_year_is_2025(r)]
-                # 모집률: 2025 종강 연도 대상
-                kpi_2025 = calc_kpis(brs_end2025, mapping)
-                # 수료율/만족도: 2025 종강 연도 + 상태 종강 대상
-                status_col = mapping.get('status')
-                brs_done_2025 = [r for r in brs_end2025 if status_col and str(r.get(status_col, '')).strip() == '종강']
-                kpi_done_2025 = calc_kpis(brs_done_2025, mapping)
-                # 취업률: 윈도우(2024-07-01~2025-06-30) + 상태 종강 대상
-                brs_window_done = [r for r in brs if ended_in_window_and_done(r, end_col, status_col, mapping.get('completed'))]
-                kpi_window = calc_kpis(brs_window_done, mapping)
-                # 만족도는 0~5 → 100점 환산 (종강+2025 기준)
+                acc = buckets.get(q) or KpiAccumulator(mapping, period)
+                kpi = acc.dashboard()
+                # 만족도는 0~5 → 100점 환산 (종강+대상 연도 기준)
                 kpi_100 = {
                     'quarter': q,
-                    '모집률': kpi_2025['모집률'],
-                    '수료율': kpi_done_2025['수료율'],
-                    '취업률': kpi_window['취업률'],
-                    '만족도': round((kpi_done_2025['만족도'] or 0) / 5 * 100, 2)
+                    '모집률': kpi['모집률'],
+                    '수료율': kpi['수료율'],
+                    '취업률': kpi['취업률'],
+                    '만족도': round((kpi['만족도'] or 0) / 5 * 100, 2)
                 }
                 
-                # 디버깅 로그
-                print(f"[TRENDS DEBUG] {q}: 데이터 {len(brs)}건, 2025종강 {len(brs_end2025)}건, 종강+2025 {len(brs_done_2025)}건, 취업윈도우 {len(brs_window_done)}건")
-                print(f"[TRENDS DEBUG] {q} KPI: 모집률={kpi_100['모집률']}, 수료율={kpi_100['수료율']}, 취업률={kpi_100['취업률']}, 만족도={kpi_100['만족도']}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("trends %s: 데이터 %d건, %s종강 %d건, 종강+%s %d건, 취업윈도우 %d건",
+                                 q, acc.counts['all'], period.year, acc.counts['end_year'],
+                                 period.year, acc.counts['done'], acc.counts['window'])
+                    logger.debug("trends %s KPI: 모집률=%s, 수료율=%s, 취업률=%s, 만족도=%s",
+                                 q, kpi_100['모집률'], kpi_100['수료율'], kpi_100['취업률'], kpi_100['만족도'])
                 
                 result.append(kpi_100)
             return jsonify(result)
+        except KpiPeriodError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -729,21 +3422,33 @@ def create_app() -> Flask:
     @app.get('/api/education/stats')
     def education_stats():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
-            cur = conn.execute("SELECT * FROM kdt_programs")
-            rows = [dict(r) for r in cur.fetchall()]
-            kpi = calc_kpis(rows, mapping)
-            total_courses = len(rows)
-            total_students = sum(parse_int(r.get(mapping['confirmed'])) for r in rows) if mapping['confirmed'] else 0
+            period = kpi_period_from_args(request.args)
+            buckets = load_kpi_buckets(conn, period)
+            if buckets is not None:
+                acc = KpiAccumulator(mapping, period)
+                for b in buckets:
+                    acc.add_bucket(b)
+                kpi = acc.raw()
+                total_courses = acc.counts['all']
+                total_students = int(acc.totals['all']['confirmed'])
+            else:
+                cur = conn.execute("SELECT * FROM kdt_programs")
+                rows = [dict(r) for r in cur.fetchall()]
+                kpi = calc_kpis(rows, mapping, period)
+                total_courses = len(rows)
+                total_students = sum(parse_int(r.get(mapping['confirmed'])) for r in rows) if mapping['confirmed'] else 0
             return jsonify({
                 '전체과정수': total_courses,
                 '총수강생': total_students,
                 '평균수료율': kpi['수료율'],
                 '평균취업률': kpi['취업률']
             })
+        except KpiPeriodError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'전체과정수': 0, '총수강생': 0, '평균수료율': 0, '평균취업률': 0})
         finally:
             try:
@@ -755,7 +3460,7 @@ def create_app() -> Flask:
     @app.get('/api/education/counts')
     def education_counts():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             year = request.args.get('year') or '2025'
             year_col = mapping.get('year') or '년도'
@@ -765,7 +3470,7 @@ def create_app() -> Flask:
             if year_col and year:
                 where = f"WHERE {year_col} = ?"
                 params.append(year)
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
+            cur = conn.execute(f"SELECT * FROM kdt_programs {where} ORDER BY id", params)
             rows = [dict(r) for r in cur.fetchall()]
             total_courses = len(rows)
             total_students = 0
@@ -774,7 +3479,7 @@ def create_app() -> Flask:
                     total_students += parse_int(r.get(confirmed_col))
             return jsonify({'전체과정수': total_courses, '총수강생': total_students, 'year': year})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'전체과정수': 0, '총수강생': 0, 'year': None})
         finally:
             try:
@@ -785,7 +3490,7 @@ def create_app() -> Flask:
     @app.get('/api/education/timeline/<int:year>')
     def education_timeline(year: int):
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             start_col = mapping['start']
             end_col = mapping['end']
@@ -799,26 +3504,24 @@ def create_app() -> Flask:
             if status_filter == '전체':
                 where_clause = f"WHERE {year_col} = ?"
                 query_params = (year,)
-                print(f"[TIMELINE DEBUG] {year}년 전체 과정 조회")
+                logger.debug("timeline %s년 전체 과정 조회", year)
             else:
                 where_clause = f"WHERE {year_col} = ? AND {status_col} = ?"
                 query_params = (year, status_filter)
-                print(f"[TIMELINE DEBUG] {year}년 '{status_filter}' 상태 과정 조회")
+                logger.debug("timeline %s년 '%s' 상태 과정 조회", year, status_filter)
             
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where_clause}", query_params)
+            # 개강일(ISO) 기준 정렬은 SQL에서, 개강일이 없으면 해당 연도 1월 1일로 취급
+            start_expr = sql_start_date(mapping, get_table_columns(conn, 'kdt_programs'))
+            cur = conn.execute(
+                f"SELECT * FROM kdt_programs {where_clause} ORDER BY COALESCE({start_expr}, ?), id",
+                (*query_params, date(year, 1, 1).isoformat())
+            )
             rows = [dict(r) for r in cur.fetchall()]
             
-            print(f"[TIMELINE DEBUG] 조회 결과: {len(rows)}건")
-            # Python-side sort by start date with fallback
-            def start_key(r: Dict[str, Any]):
-                dt = safe_date(r.get(start_col)) if start_col else None
-                if not dt and '개강' in (start_col or ''):
-                    dt = safe_date(r.get('개강'))
-                return dt or date(year, 1, 1)
-
-            rows.sort(key=start_key)
+            logger.debug("timeline 조회 결과: %d건", len(rows))
             events = []
             today = date.today()
+            trace = logger.isEnabledFor(logging.DEBUG)
             
             for r in rows:
                 sdt = safe_date(r.get(start_col)) if start_col else None
@@ -866,11 +3569,12 @@ def create_app() -> Flask:
                         'start': sdt.isoformat() if sdt else None,
                         'end': edt.isoformat() if edt else None,
                     })
-                    print(f"[TIMELINE DEBUG] 추가된 과정: {r.get(mapping['name'])} - 상태: {status}")
-                else:
-                    print(f"[TIMELINE DEBUG] 제외된 과정: {r.get(mapping['name'])} - 상태: {status}")
+                    if trace:
+                        logger.debug("timeline 추가된 과정: %s - 상태: %s", r.get(mapping['name']), status)
+                elif trace:
+                    logger.debug("timeline 제외된 과정: %s - 상태: %s", r.get(mapping['name']), status)
             
-            print(f"[TIMELINE DEBUG] 최종 표시 과정: {len(events)}건 ('{status_filter}' 필터 적용)")
+            logger.debug("timeline 최종 표시 과정: %d건 ('%s' 필터 적용)", len(events), status_filter)
             
             return jsonify({
                 'events': events,
@@ -878,7 +3582,7 @@ def create_app() -> Flask:
                 'total_count': len(events)
             })
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -890,7 +3594,7 @@ def create_app() -> Flask:
     @app.get('/api/business/kpi')
     def business_kpi():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             # Example KPI: total courses, total confirmed (students). Placeholder for revenue, progress.
             cur = conn.execute("SELECT * FROM kdt_programs")
@@ -908,7 +3612,7 @@ def create_app() -> Flask:
                 '참여인원': total_students
             })
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'총과정수': 0, '총학생수': 0, '예산집행률': 0, '진행률': 0, '목표달성률': 0, '총매출': 0, '참여인원': 0})
         finally:
             try:
@@ -920,11 +3624,17 @@ def create_app() -> Flask:
     def business_revenue_trend():
         try:
             # Placeholder revenue trend from program counts per month; in real case, join to revenue table
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
             start_col = mapping['start']
-            cur = conn.execute("SELECT * FROM kdt_programs")
-            rows = [dict(r) for r in cur.fetchall()]
+            # 개강 월별 과정 수를 SQL에서 집계 (ISO 날짜의 YYYY-MM)
+            starts_by_month: Dict[str, int] = {}
+            if start_col:
+                cur = conn.execute(
+                    f"SELECT substr(s, 1, 7) AS ym, COUNT(*) AS n "
+                    f"FROM (SELECT {sql_iso_date(start_col)} AS s FROM kdt_programs) WHERE s IS NOT NULL GROUP BY ym"
+                )
+                starts_by_month = {r['ym']: r['n'] for r in cur.fetchall()}
             today = date.today()
             labels: List[str] = []
             current: List[int] = []
@@ -936,14 +3646,8 @@ def create_app() -> Flask:
                 m = ((today.month - i - 1) % 12) + 1
                 labels.append(f"{y}-{m:02d}")
                 # revenue proxy: number of courses starting in this month * fixed amount
-                cur_month = 0
-                prev_month = 0
-                for r in rows:
-                    sdt = safe_date(r.get(start_col)) if start_col else None
-                    if sdt and sdt.year == y and sdt.month == m:
-                        cur_month += 1
-                    if sdt and sdt.year == y - 1 and sdt.month == m:
-                        prev_month += 1
+                cur_month = starts_by_month.get(f"{y}-{m:02d}", 0)
+                prev_month = starts_by_month.get(f"{y - 1}-{m:02d}", 0)
                 current.append(cur_month * 100)
                 previous.append(prev_month * 100)
                 goal.append(150)
@@ -954,7 +3658,7 @@ def create_app() -> Flask:
                 'goal': goal
             })
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'labels': [], 'current': [], 'previous': [], 'goal': []})
         finally:
             try:
@@ -963,148 +3667,158 @@ def create_app() -> Flask:
                 pass
 
     # New: Business revenue metrics per program+round with yearly filter (year=all supported)
-    @app.get('/api/business/revenue-metrics')
-    def business_revenue_metrics():
-        try:
-            conn = get_db_connection()
-            mapping = get_schema_mapping(conn)
-            year = request.args.get('year') or '2025'
-            year_col = mapping.get('year') or '년도'
-            start_col = mapping.get('start')
-            name_col = mapping.get('name')
-            round_col = mapping.get('batch') or '회차'
-            quarter_col = mapping.get('quarter') or '분기'
-            confirmed_col = mapping.get('confirmed')
-            completed_col = mapping.get('completed')
-            complete_excl_col = mapping.get('complete_excluded')
-            hours_col = '교육시간'
+    REVENUE_METRICS_COLUMNS = ['program', 'course_code', 'round', 'quarter', 'expected', 'actual', 'gap', 'max', 'start']
 
-            # Build where
-            where = ''
-            params: List[Any] = []
-            if (year and year.lower() != 'all') and year_col:
-                where = f"WHERE {year_col} = ?"
-                params.append(year)
+    def revenue_metrics_items(conn: sqlite3.Connection, year: str) -> Iterator[Dict[str, Any]]:
+        """Items of the 과정/회차 revenue table in display order (start desc); shared by the JSON and export endpoints.
 
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
-            rows = [dict(r) for r in cur.fetchall()]
+        The single pass over kdt_programs runs before this returns; the items
+        are then made one at a time from the per-(과정, 회차) summaries.
+        """
+        mapping = get_schema_mapping(conn)
+        year_col = mapping.get('year') or '년도'
+        start_col = mapping.get('start')
+        name_col = mapping.get('name')
+        round_col = mapping.get('batch') or '회차'
+        quarter_col = mapping.get('quarter') or '분기'
+        confirmed_col = mapping.get('confirmed')
+        completed_col = mapping.get('completed')
+        complete_excl_col = mapping.get('complete_excluded')
+        hours_col = '교육시간'
 
-            # Group by program+round
-            groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
-            for r in rows:
-                program = str(r.get(name_col) or r.get('과정명') or '').strip()
-                rnd = str(r.get(round_col) or '').strip()
-                key = (program, rnd)
-                groups.setdefault(key, []).append(r)
-
-            UNIT = 18150
-            def to_int(v: Any) -> int:
-                return parse_int(v, 0)
-            
-            # 1. 전체 평균 수료율 계산 (종강 과정만 대상)
-            def calc_avg_graduation_rate():
-                total_confirmed = 0
-                total_completed = 0
-                total_excl = 0
-                
-                for grs in groups.values():
-                    for g in grs:
-                        status = str(g.get(mapping.get('status', '')) or '').strip()
-                        if status == '종강':  # 종강된 과정만 평균 계산에 포함
-                            total_confirmed += to_int(g.get(confirmed_col))
-                            total_completed += to_int(g.get(completed_col))
-                            total_excl += to_int(g.get(complete_excl_col))
-                
-                avg_denom = total_confirmed - total_excl
-                return (total_completed / avg_denom) if avg_denom > 0 else 0
-            
-            avg_graduation_rate = calc_avg_graduation_rate()
-            
-            # 2. 과정별 직전 회차 수료율 찾기 함수
-            def find_prev_round_graduation_rate(program: str, current_round: str):
-                try:
-                    current_round_num = int(current_round) if current_round.isdigit() else 0
-                    if current_round_num <= 1:
-                        return None  # 1회차이거나 숫자가 아니면 직전 회차 없음
-                    
-                    prev_round = str(current_round_num - 1)
-                    prev_key = (program, prev_round)
-                    
-                    if prev_key in groups:
-                        prev_grs = groups[prev_key]
-                        prev_confirmed = sum(to_int(g.get(confirmed_col)) for g in prev_grs)
-                        prev_completed = sum(to_int(g.get(completed_col)) for g in prev_grs)
-                        prev_excl = sum(to_int(g.get(complete_excl_col)) for g in prev_grs)
-                        
-                        prev_denom = prev_confirmed - prev_excl
-                        if prev_denom > 0:
-                            return prev_completed / prev_denom
-                    return None
-                except:
-                    return None
+        # Build where
+        where = ''
+        params: List[Any] = []
+        if (year and year.lower() != 'all') and year_col:
+            where = f"WHERE {year_col} = ?"
+            params.append(year)
 
-            items = []
-            for (program, rnd), grs in groups.items():
-                # Aggregate inputs over group (confirmed, completed, complete_excluded, hours)
-                confirmed_sum = sum(to_int(g.get(confirmed_col)) for g in grs) if confirmed_col else 0
-                completed_sum = sum(to_int(g.get(completed_col)) for g in grs) if completed_col else 0
-                excl_sum = sum(to_int(g.get(complete_excl_col)) for g in grs) if complete_excl_col else 0
-                hours_sum = sum(to_int(g.get(hours_col)) for g in grs)
-
-                # 새로운 예상 매출 계산 로직
-                prev_rate = find_prev_round_graduation_rate(program, rnd)
-                if prev_rate is not None:
-                    # 직전 회차 수료율 사용
-                    graduation_rate = prev_rate
-                else:
-                    # 전체 평균 수료율 사용
-                    graduation_rate = avg_graduation_rate
-                
-                expected = int(round(graduation_rate * confirmed_sum * hours_sum * UNIT))
-                actual = int(round(completed_sum * hours_sum * UNIT))
-                maxrev = int(round(confirmed_sum * hours_sum * UNIT))
-                gap = expected - actual
-
-                # pick latest start date for sorting
-                best_dt: date | None = None
-                if start_col:
-                    for g in grs:
-                        dt = safe_date(g.get(start_col))
-                        if not dt and '개강' in (start_col or ''):
-                            dt = safe_date(g.get('개강'))
-                        if dt and (best_dt is None or dt > best_dt):
-                            best_dt = dt
-
-                # 과정코드 추가
-                course_code = str(grs[0].get('과정코드') or '').strip() if grs else ''
-                
-                items.append({
-                    'program': program,
-                    'course_code': course_code,
-                    'round': rnd,
-                    'quarter': grs[0].get(quarter_col) if grs else None,
-                    'expected': expected,
-                    'actual': actual,
-                    'gap': gap,
-                    'max': maxrev,
-                    'start': best_dt.isoformat() if best_dt else None
-                })
+        cols = get_table_columns(conn, 'kdt_programs')
 
-            # Sort by start desc (None last)
-            def sort_key(it):
-                s = it.get('start')
-                return (s is None, s)
-            items.sort(key=sort_key, reverse=True)
+        def col(name: str | None) -> str:
+            return quote_ident(name) if name and name in cols else 'NULL'
+
+        fallback_start = '개강' if start_col and '개강' in start_col else None
+        fields = (name_col, '과정명', round_col, quarter_col, '과정코드', mapping.get('status'),
+                  confirmed_col, completed_col, complete_excl_col, hours_col, start_col, fallback_start)
+        if in_batch():
+            # batch 안에서는 하위 조회들이 같이 쓰는 kdt_programs 행에서 필요한 열만 고른다
+            cur: Any = ([p.get(f) if f and f in cols else None for f in fields] for p in load_programs(conn, where, params))
+        else:
+            cur = conn.execute(f"SELECT {', '.join(col(f) for f in fields)} FROM kdt_programs {where} ORDER BY id", params)
+
+        UNIT = 18150
+        def to_int(v: Any) -> int:
+            return parse_int(v, 0)
+
+        # 한 번의 순회로 과정+회차별 요약 레코드와 종강 과정 합계(평균 수료율용)를 만든다
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        done_confirmed = done_completed = done_excl = 0
+        for (name, alt_name, round_value, quarter, course_code, status,
+             confirmed, completed, excl, hours, start, start_alt) in cur:
+            program = str(name or alt_name or '').strip()
+            rnd = str(round_value or '').strip()
+            confirmed, completed, excl = to_int(confirmed), to_int(completed), to_int(excl)
+            if str(status or '').strip() == '종강':  # 종강된 과정만 평균 계산에 포함
+                done_confirmed += confirmed
+                done_completed += completed
+                done_excl += excl
+
+            summary = groups.get((program, rnd))
+            if summary is None:
+                summary = groups[(program, rnd)] = {
+                    'confirmed': 0, 'completed': 0, 'excl': 0, 'hours': 0, 'start': None,
+                    'course_code': str(course_code or '').strip(), 'quarter': quarter,
+                }
+            summary['confirmed'] += confirmed
+            summary['completed'] += completed
+            summary['excl'] += excl
+            summary['hours'] += to_int(hours)
+            # pick latest start date for sorting
+            if start_col:
+                dt = safe_date(start) or (safe_date(start_alt) if fallback_start else None)
+                if dt and (summary['start'] is None or dt > summary['start']):
+                    summary['start'] = dt
+
+        # 1. 전체 평균 수료율 (종강 과정만 대상)
+        avg_denom = done_confirmed - done_excl
+        avg_graduation_rate = (done_completed / avg_denom) if avg_denom > 0 else 0
+
+        # 2. 과정+회차별 수료율: 직전 회차 조회는 요약 레코드에서 O(1)
+        for summary in groups.values():
+            denom = summary['confirmed'] - summary['excl']
+            summary['rate'] = (summary['completed'] / denom) if denom > 0 else None
+
+        def find_prev_round_graduation_rate(program: str, current_round: str):
+            try:
+                current_round_num = int(current_round) if current_round.isdigit() else 0
+            except ValueError:
+                return None
+            if current_round_num <= 1:
+                return None  # 1회차이거나 숫자가 아니면 직전 회차 없음
+            prev = groups.get((program, str(current_round_num - 1)))
+            return prev['rate'] if prev else None
 
-            totals = {
-                'expected': int(sum(it['expected'] for it in items)),
-                'actual': int(sum(it['actual'] for it in items)),
-                'gap': int(sum(it['gap'] for it in items)),
-                'max': int(sum(it['max'] for it in items)),
+        def item(program: str, rnd: str, summary: Dict[str, Any]) -> Dict[str, Any]:
+            confirmed_sum = summary['confirmed']
+            completed_sum = summary['completed']
+            hours_sum = summary['hours']
+
+            # 새로운 예상 매출 계산 로직
+            prev_rate = find_prev_round_graduation_rate(program, rnd)
+            if prev_rate is not None:
+                # 직전 회차 수료율 사용
+                graduation_rate = prev_rate
+            else:
+                # 전체 평균 수료율 사용
+                graduation_rate = avg_graduation_rate
+
+            expected = int(round(graduation_rate * confirmed_sum * hours_sum * UNIT))
+            actual = int(round(completed_sum * hours_sum * UNIT))
+            maxrev = int(round(confirmed_sum * hours_sum * UNIT))
+            gap = expected - actual
+            best_dt = summary['start']
+
+            return {
+                'program': program,
+                'course_code': summary['course_code'],
+                'round': rnd,
+                'quarter': summary['quarter'],
+                'expected': expected,
+                'actual': actual,
+                'gap': gap,
+                'max': maxrev,
+                'start': best_dt.isoformat() if best_dt else None
             }
+
+        # Sort by start desc (None last); 정렬은 요약 레코드로 하고 항목은 내보낼 때 만든다
+        def sort_key(key):
+            s = groups[key]['start']
+            return (s is None, s.isoformat() if s else None)
+        order = sorted(groups, key=sort_key, reverse=True)
+        return (item(program, rnd, groups[(program, rnd)]) for program, rnd in order)
+
+    def revenue_metrics_report(conn: sqlite3.Connection, year: str) -> Tuple[Dict[str, int], List[Dict[str, Any]]]:
+        """(totals, items) for the revenue-metrics JSON endpoint."""
+        items = list(revenue_metrics_items(conn, year))
+        totals = {
+            'expected': int(sum(it['expected'] for it in items)),
+            'actual': int(sum(it['actual'] for it in items)),
+            'gap': int(sum(it['gap'] for it in items)),
+            'max': int(sum(it['max'] for it in items)),
+        }
+        return totals, items
+
+    @app.get('/api/business/revenue-metrics')
+    @cached_result
+    def business_revenue_metrics():
+        try:
+            conn = get_db_connection(readonly=True)
+            year = request.args.get('year') or '2025'
+            totals, items = revenue_metrics_report(conn, year)
             return jsonify({'year': (None if (year and year.lower()=='all') else year), 'totals': totals, 'items': items})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'year': None, 'totals': {'expected':0,'actual':0,'gap':0,'max':0}, 'items': []})
         finally:
             try:
@@ -1112,72 +3826,90 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    @app.get('/api/business/revenue-metrics/export')
+    def export_business_revenue_metrics():
+        conn = None
+        try:
+            fmt = export_format()
+            conn = get_db_connection(readonly=True)
+            year = request.args.get('year') or '2025'
+            label = export_year(year)
+            rows = ([it[c] for c in REVENUE_METRICS_COLUMNS] for it in revenue_metrics_items(conn, year))
+            export_conn, conn = conn, None
+            return export_response(export_conn, fmt, f'revenue-metrics-{label}', REVENUE_METRICS_COLUMNS, rows)
+        except ExportFormatError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "message": str(e)}), 500
+        finally:
+            if conn is not None:
+                conn.close()
+
     @app.get('/api/business/monthly-revenue')
     def business_monthly_revenue():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
+            ensure_revenue_facts_current(conn)
             mapping = get_schema_mapping(conn)
             year = request.args.get('year') or '2025'
             program_like = request.args.get('program_like')
 
-            # Load base programs with optional year filter
-            where = ''
+            # Load base programs with optional year / name filter (이름 필터도 SQL에서 걸러 필요한 과정만 읽는다)
+            clauses: List[str] = []
             params: List[Any] = []
             year_col = mapping.get('year') or '년도'
             if (year and year.lower() != 'all') and year_col:
-                where = f"WHERE {year_col} = ?"
+                clauses.append(f"{year_col} = ?")
                 params.append(year)
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
-            programs = [dict(r) for r in cur.fetchall()]
+            like_sql, like_params = program_like_condition(conn, mapping, program_like)
+            if like_sql:
+                clauses.append(like_sql)
+                params.extend(like_params)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
 
-            name_col = mapping.get('name')
-            round_col = mapping.get('batch') or '회차'
-            start_col = mapping.get('start')
+            # 1M~12M 예상 매출은 revenue_by_month에서 읽는다
+            def load_revenue(c: sqlite3.Connection) -> Dict[int, Dict[int, int]]:
+                revenue_map: Dict[int, Dict[int, int]] = {}
+                cur = c.execute(
+                    f"SELECT program_id, month_index, expected FROM revenue_by_month "
+                    f"WHERE month_index <= 12 AND program_id IN (SELECT id FROM kdt_programs {where})",
+                    params
+                )
+                for r in cur.fetchall():
+                    revenue_map.setdefault(r['program_id'], {})[r['month_index']] = r['expected']
+                return revenue_map
 
-            # Optional substring filter by program name
-            if program_like and name_col:
-                needle = str(program_like).strip()
-                programs = [p for p in programs if needle in str(p.get(name_col, ''))]
+            if in_batch():
+                # batch 안에서는 하위 조회들이 같이 쓰는 kdt_programs/revenue_by_month 행에서 고른다
+                programs = load_programs(conn, where, params)
+                ids = {p['id'] for p in programs}
+                revenue_map = {}
+                for r in batch_revenue_facts(conn):
+                    if r['month_index'] <= 12 and r['program_id'] in ids:
+                        revenue_map.setdefault(r['program_id'], {})[r['month_index']] = r['expected']
+            else:
+                programs, revenue_map = concurrent_reads(conn, lambda c: load_programs(c, where, params), load_revenue)
 
-            # Load monthly tables as maps by id (fail-safe if tables missing)
-            hours_map: Dict[int, Dict[str, Any]] = {}
-            enroll_map: Dict[int, Dict[str, Any]] = {}
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_hours")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    hours_map[int(d.get('id'))] = d
-            except Exception:
-                pass
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_enrollments")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    enroll_map[int(d.get('id'))] = d
-            except Exception:
-                pass
+            name_col = mapping.get('name')
+            round_col = mapping.get('batch') or '회차'
 
             months = [f"{m}M" for m in range(1, 13)]
-            UNIT = 18150
-
-            def to_int(v: Any) -> int:
-                return parse_int(v, 0)
 
             items = []
             month_totals = {m: 0 for m in months}
             grand_total = 0
 
             for p in programs:
-                pid = to_int(p.get('id'))
-                h = hours_map.get(pid, {})
-                e = enroll_map.get(pid, {})
+                pid = parse_int(p.get('id'))
+                revenue = revenue_map.get(pid, {})
                 row = {
                     'program': p.get(name_col) or p.get('과정명'),
                     'round': p.get(round_col)
                 }
                 total = 0
-                for m in months:
-                    v = to_int(h.get(m)) * to_int(e.get(m)) * UNIT
+                for idx, m in enumerate(months, start=1):
+                    v = revenue.get(idx, 0)
                     row[m] = v
                     month_totals[m] += v
                     total += v
@@ -1185,12 +3917,7 @@ def create_app() -> Flask:
                 grand_total += total
 
                 # attach start date string for sorting (desc)
-                sdt = None
-                if start_col:
-                    sdt = safe_date(p.get(start_col))
-                    if not sdt and '개강' in (start_col or ''):
-                        sdt = safe_date(p.get('개강'))
-                row['_start'] = sdt.isoformat() if sdt else ''
+                row['_start'] = p.get('_start') or ''
                 items.append(row)
 
             # Sort by start desc (empty last)
@@ -1205,7 +3932,7 @@ def create_app() -> Flask:
             totals.update(month_totals)
             return jsonify({'year': (None if (year and year.lower()=='all') else year), 'months': months, 'totals': totals, 'items': items})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'year': None, 'months': [], 'totals': {}, 'items': []})
         finally:
             try:
@@ -1213,10 +3940,75 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    @app.get('/api/business/monthly-revenue/export')
+    def export_business_monthly_revenue():
+        """monthly-revenue items as CSV/XLSX, pivoted in SQL and streamed from the cursor.
+
+        Rows come out in the JSON endpoint's order (its reverse sort puts rows without a start date first).
+        """
+        conn = None
+        try:
+            fmt = export_format()
+            conn = get_db_connection(readonly=True)
+            ensure_revenue_facts_current(conn)
+            mapping = get_schema_mapping(conn)
+            cols = get_table_columns(conn, 'kdt_programs')
+            year = request.args.get('year') or '2025'
+            label = export_year(year)
+            program_like = request.args.get('program_like')
+
+            clauses: List[str] = []
+            params: List[Any] = []
+            year_col = mapping.get('year') or '년도'
+            if (year and year.lower() != 'all') and year_col:
+                clauses.append(f"{year_col} = ?")
+                params.append(year)
+            name_col = mapping.get('name')
+            name_expr = quote_ident(name_col) if name_col else 'NULL'
+            if name_col and name_col != '과정명' and '과정명' in cols:
+                name_expr = f"COALESCE(NULLIF({name_expr}, ''), \"과정명\")"
+            like_sql, like_params = program_like_condition(conn, mapping, program_like)
+            if like_sql:
+                clauses.append(like_sql)
+                params.extend(like_params)
+            round_col = mapping.get('batch') or '회차'
+            round_expr = quote_ident(round_col) if round_col in cols else 'NULL'
+            start_expr = sql_start_date(mapping, cols)
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+            months = [f"{m}M" for m in range(1, 13)]
+            month_sums = ', '.join(
+                f"COALESCE(SUM(CASE WHEN r.month_index = {m} THEN r.expected END), 0)" for m in range(1, 13)
+            )
+            cur = conn.execute(
+                f"""
+                SELECT {name_expr}, {round_expr}, {month_sums},
+                       COALESCE(SUM(r.expected), 0), COALESCE({start_expr}, '') AS _start
+                FROM kdt_programs p
+                LEFT JOIN revenue_by_month r ON r.program_id = p.id AND r.month_index <= 12
+                {where}
+                GROUP BY p.id
+                ORDER BY _start = '' DESC, _start DESC, p.id
+                """,
+                params
+            )
+            header = ['program', 'round'] + months + ['total']
+            export_conn, conn = conn, None
+            return export_response(export_conn, fmt, f'monthly-revenue-{label}', header, (tuple(r)[:-1] for r in cur))
+        except ExportFormatError as e:
+            return jsonify({"success": False, "message": str(e)}), 400
+        except Exception as e:
+            logger.exception(e)
+            return jsonify({"success": False, "message": str(e)}), 500
+        finally:
+            if conn is not None:
+                conn.close()
+
     @app.get('/api/business/monthly-expected')
     def business_monthly_expected():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
+            ensure_revenue_facts_current(conn)
             mapping = get_schema_mapping(conn)
             year = int(request.args.get('year') or 2025)
             month = int(request.args.get('month') or 7)
@@ -1224,83 +4016,38 @@ def create_app() -> Flask:
 
             name_col = mapping.get('name')
             round_col = mapping.get('batch') or '회차'
-            start_col = mapping.get('start')
-            end_col = mapping.get('end')
-
-            # load programs for (year) - use overlap with the target month window based on start/end
-            cur = conn.execute("SELECT * FROM kdt_programs")
-            programs = [dict(r) for r in cur.fetchall()]
-            if program_like and name_col:
-                needle = str(program_like).strip()
-                programs = [p for p in programs if needle in str(p.get(name_col, ''))]
-
-            # hours/enroll maps by id
-            hours_map: Dict[int, Dict[str, Any]] = {}
-            enroll_map: Dict[int, Dict[str, Any]] = {}
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_hours")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    hours_map[int(d.get('id'))] = d
-            except Exception:
-                pass
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_enrollments")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    enroll_map[int(d.get('id'))] = d
-            except Exception:
-                pass
-
-            # helpers
-            def month_start(y: int, m: int) -> date:
-                return date(y, m, 1)
-
-            def month_end(y: int, m: int) -> date:
-                if m == 12:
-                    return date(y, 12, 31)
-                return date(y, m+1, 1) - timedelta(days=1)
-
-            from datetime import timedelta
-            window_start = month_start(year, month)
-            window_end = month_end(year, month)
 
-            def months_since_start(s: date, target: date) -> int:
-                # count start month as 1M
-                return (target.year - s.year) * 12 + (target.month - s.month) + 1
+            # 대상 월에 진행 중인 과정의 N개월차(1~12) 예상 매출 (revenue_by_month)
+            window_start = date(year, month, 1)
+            ym = window_start.strftime('%Y-%m')
+            like_sql, like_params = program_like_condition(conn, mapping, program_like)
+            if in_batch():
+                # batch 안에서는 하위 조회들이 같이 쓰는 kdt_programs/revenue_by_month 행에서 고른다
+                by_id = {p['id']: p for p in load_programs(conn, f"WHERE {like_sql}" if like_sql else '', like_params)}
+                programs = [
+                    dict(by_id[r['program_id']], _month_index=r['month_index'], _expected=r['expected'])
+                    for r in batch_revenue_facts(conn)
+                    if r['ym'] == ym and r['active'] == 1 and 1 <= r['month_index'] <= 12 and r['program_id'] in by_id
+                ]
+            else:
+                cur = conn.execute(
+                    "SELECT p.*, f.month_index AS _month_index, f.expected AS _expected "
+                    "FROM revenue_by_month f JOIN kdt_programs p ON p.id = f.program_id "
+                    "WHERE f.ym = ? AND f.active = 1 AND f.month_index BETWEEN 1 AND 12 "
+                    f"{'AND ' + like_sql if like_sql else ''} ORDER BY p.id",
+                    [ym] + like_params
+                )
+                programs = [dict(r) for r in cur.fetchall()]
 
-            UNIT = 18150
             items = []
             total = 0
-
             for p in programs:
-                pid = parse_int(p.get('id'))
-                sdt = safe_date(p.get(start_col)) if start_col else None
-                if not sdt and start_col and '개강' in start_col:
-                    sdt = safe_date(p.get('개강'))
-                edt = safe_date(p.get(end_col)) if end_col else None
-                if not edt and end_col and '종강' in end_col:
-                    edt = safe_date(p.get('종강'))
-                if not sdt:
-                    continue
-                # overlap check: course active in the target month
-                if sdt > window_end:
-                    continue
-                if edt and edt < window_start:
-                    continue
-
-                m_index = months_since_start(sdt, window_start)
-                if m_index < 1 or m_index > 12:
-                    continue
-                col = f"{m_index}M"
-                h = hours_map.get(pid, {}).get(col)
-                e = enroll_map.get(pid, {}).get(col)
-                expected = parse_int(h) * parse_int(e) * UNIT
+                expected = p['_expected']
                 total += expected
                 items.append({
                     'program': p.get(name_col) or p.get('과정명'),
                     'round': p.get(round_col),
-                    'monthIndex': m_index,
+                    'monthIndex': p['_month_index'],
                     'expected': expected
                 })
 
@@ -1308,7 +4055,7 @@ def create_app() -> Flask:
             items.sort(key=lambda x: x['expected'], reverse=True)
             return jsonify({'year': year, 'month': month, 'total': total, 'items': items})
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify({'year': None, 'month': None, 'total': 0, 'items': []})
         finally:
             try:
@@ -1320,40 +4067,32 @@ def create_app() -> Flask:
     # Analytics: metrics by year/quarter/month/program
     # --------------------
     @app.get('/api/analytics/metrics')
+    @cached_result
     def analytics_metrics():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
             mapping = get_schema_mapping(conn)
+            period = kpi_period_from_args(request.args)
 
             # Base filtering from query (year/quarter/category/status)
             where, params = build_program_filters(request.args, mapping)
-            cur = conn.execute(f"SELECT * FROM kdt_programs {where}", params)
-            rows = [dict(r) for r in cur.fetchall()]
 
             # Optional program_like substring filter
             program_like = request.args.get('program_like')
-            if program_like:
-                name_col = mapping.get('name')
-                if name_col:
-                    needle = str(program_like).strip()
-                    rows = [r for r in rows if needle in str(r.get(name_col, ''))]
+            name_col = mapping.get('name')
+            needle = str(program_like).strip() if program_like and name_col else None
 
             granularity = (request.args.get('granularity') or 'quarter').lower()
             ruleset = (request.args.get('ruleset') or 'dashboard').lower()
 
             quarter_col = mapping.get('quarter') or '분기'
             end_col = mapping.get('end')
-            name_col = mapping.get('name')
-            status_col = mapping.get('status')
 
-            def get_bucket_key(r: Dict[str, any]) -> str:
+            def get_bucket_key(r: Dict[str, any], end_dt: date | None) -> str:
                 if granularity == 'year':
                     # year by end date when available else by year column
-                    dt = safe_date(r.get(end_col)) if end_col else None
-                    if not dt and end_col and '종강' in end_col:
-                        dt = safe_date(r.get('종강'))
-                    if dt:
-                        return str(dt.year)
+                    if end_dt:
+                        return str(end_dt.year)
                     ycol = mapping.get('year') or '년도'
                     return str(r.get(ycol) or '')
                 if granularity == 'quarter':
@@ -1361,74 +4100,78 @@ def create_app() -> Flask:
                     if q:
                         return q
                     # fallback via end date
-                    dt = safe_date(r.get(end_col)) if end_col else None
-                    if not dt and end_col and '종강' in end_col:
-                        dt = safe_date(r.get('종강'))
-                    if dt:
-                        return f"Q{((dt.month - 1)//3) + 1}"
+                    if end_dt:
+                        return f"Q{((end_dt.month - 1)//3) + 1}"
                     return ''
                 if granularity == 'month':
-                    dt = safe_date(r.get(end_col)) if end_col else None
-                    if not dt and end_col and '종강' in end_col:
-                        dt = safe_date(r.get('종강'))
-                    return f"{dt.year}-{dt.month:02d}" if dt else ''
+                    return f"{end_dt.year}-{end_dt.month:02d}" if end_dt else ''
                 if granularity == 'program':
                     return str(r.get(name_col) or '')
                 return ''
 
-            # Bucket rows
-            buckets: Dict[str, List[Dict[str, any]]] = {}
+            # Bucket rows: 종강일은 행마다 한 번만 해석해 버킷 키와 KPI 누산에 같이 쓴다
+            buckets: Dict[str, Any] = {}
+            snap = get_program_snapshot(conn, mapping)
+            bucket_rows = None
+            if snap is None and needle is None and granularity in ('year', 'quarter', 'month'):
+                bucket_rows = load_kpi_buckets(conn, period, where, params, (mapping.get('year') or '년도', quarter_col))
+            if snap is not None:
+                # 스냅샷: 필터는 SQL로 id만, 이름 검색은 사전 값마다 한 번, 버킷 키는 미리 계산된 열
+                rows = ()
+                positions = snap.positions(filtered_program_ids(conn, where, params))
+                if needle is not None:
+                    positions = snap.select(positions, 'name', lambda n: needle in n)
+                key_column = {'year': 'year_key', 'quarter': 'quarter_key',
+                              'month': 'month_key', 'program': 'program_key'}.get(granularity)
+                if key_column:
+                    buckets = snap.buckets(key_column, positions, period)
+                    buckets.pop('', None)
+            elif bucket_rows is not None:
+                # KPI 버킷: 종강 월(또는 종강일)로 연/분기/월 키를 만든다
+                rows = ()
+                for b in bucket_rows:
+                    end = b['end_month']
+                    end_dt = date(int(end[:4]), int(end[5:7]), 1) if end else None
+                    key = get_bucket_key(b, end_dt)
+                    if not key:
+                        continue
+                    acc = buckets.get(key)
+                    if acc is None:
+                        acc = buckets[key] = KpiAccumulator(mapping, period)
+                    acc.add_bucket(b)
+            else:
+                # 이름 필터도 SQL에서 건다
+                like_sql, like_params = program_like_condition(conn, mapping, program_like)
+                if like_sql:
+                    where = f"{where} AND {like_sql}" if where else f"WHERE {like_sql}"
+                rows = map(dict, conn.execute(f"SELECT * FROM kdt_programs {where} ORDER BY id", params + like_params))
             for r in rows:
-                key = get_bucket_key(r)
+                end_dt = row_end_date(r, end_col)
+                key = get_bucket_key(r, end_dt)
                 if not key:
                     continue
-                buckets.setdefault(key, []).append(r)
-
-            def compute_dashboard_set(brs: List[Dict[str, Any]]):
-                # 모집률: 2025 종강 연도 대상
-                def end_year_is_2025(x: Dict[str, Any]) -> bool:
-                    dt = safe_date(x.get(end_col)) if end_col else None
-                    if not dt and end_col and '종강' in end_col:
-                        dt = safe_date(x.get('종강'))
-                    return bool(dt and dt.year == 2025)
-
-                rows_end2025 = [x for x in brs if end_year_is_2025(x)]
-                kpi_recruit = calc_kpis(rows_end2025, mapping)
-
-                # 수료율/만족도: 2025 종강 연도 + 상태 종강
-                rows_done_2025 = [x for x in rows_end2025 if status_col and str(x.get(status_col, '')).strip() == '종강']
-                kpi_done_2025 = calc_kpis(rows_done_2025, mapping)
-
-                # 취업률: 2024-07-01~2025-06-30 & 상태 종강 & 수료인원 존재
-                rows_window_done = [x for x in brs if ended_in_window_and_done(x, end_col, status_col, mapping.get('completed'))]
-                kpi_window = calc_kpis(rows_window_done, mapping)
-
-                return {
-                    '모집률': kpi_recruit['모집률'],
-                    '수료율': kpi_done_2025['수료율'],
-                    '취업률': kpi_window['취업률'],
-                    '만족도': kpi_done_2025['만족도']
-                }
-
-            def compute_raw_set(brs: List[Dict[str, Any]]):
-                k = calc_kpis(brs, mapping)
-                return {'모집률': k['모집률'], '수료율': k['수료율'], '취업률': k['취업률'], '만족도': k['만족도']}
+                acc = buckets.get(key)
+                if acc is None:
+                    acc = buckets[key] = KpiAccumulator(mapping, period)
+                acc.add(r, end_dt)
 
             result = []
             for key in (['Q1','Q2','Q3','Q4'] if granularity=='quarter' else sorted(buckets.keys())):
-                brs = buckets.get(key, [])
-                if not brs:
+                acc = buckets.get(key)
+                if acc is None:
                     # keep empty buckets for quarter to show zeroes
                     if granularity == 'quarter':
                         result.append({'key': key, '모집률': 0, '수료율': 0, '취업률': 0, '만족도': 0})
                     continue
-                metrics = compute_dashboard_set(brs) if ruleset=='dashboard' else compute_raw_set(brs)
+                metrics = acc.dashboard() if ruleset=='dashboard' else acc.raw()
                 # 트렌드 그래프가 만족도 100점 환산을 원할 수 있어도 원본(0~5) 유지; 프론트에서 환산
                 result.append({'key': key, **metrics})
 
             return jsonify(result)
+        except KpiPeriodError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         except Exception as e:
-            print(e)
+            logger.exception(e)
             return jsonify([])
         finally:
             try:
@@ -1438,117 +4181,66 @@ def create_app() -> Flask:
 
     # 새로운 API: 연도별 12개월 전체 예상 매출 데이터
     @app.get('/api/business/yearly-monthly-revenue')
+    @cached_result
     def business_yearly_monthly_revenue():
         try:
-            conn = get_db_connection()
+            conn = get_db_connection(readonly=True)
+            ensure_revenue_facts_current(conn)
             mapping = get_schema_mapping(conn)
             year = int(request.args.get('year') or 2025)
             program_like = request.args.get('program_like')
 
             name_col = mapping.get('name')
             round_col = mapping.get('batch') or '회차'
-            start_col = mapping.get('start')
-            end_col = mapping.get('end')
 
-            # load programs for the year
-            cur = conn.execute("SELECT * FROM kdt_programs")
-            programs = [dict(r) for r in cur.fetchall()]
-            if program_like and name_col:
-                needle = str(program_like).strip()
-                programs = [p for p in programs if needle in str(p.get(name_col, ''))]
-
-            # hours/enroll maps by id
-            hours_map: Dict[int, Dict[str, Any]] = {}
-            enroll_map: Dict[int, Dict[str, Any]] = {}
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_hours")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    hours_map[int(d.get('id'))] = d
-            except Exception:
-                pass
-            try:
-                cur = conn.execute("SELECT * FROM kdt_monthly_enrollments")
-                for r in cur.fetchall():
-                    d = dict(r)
-                    enroll_map[int(d.get('id'))] = d
-            except Exception:
-                pass
+            # 이름 필터가 있으면 해당 과정의 월별 행만 읽는다
+            like_sql, like_params = program_like_condition(conn, mapping, program_like)
+            where = f"WHERE {like_sql}" if like_sql else ''
+            only = f"AND program_id IN (SELECT id FROM kdt_programs {where})" if like_sql else ''
 
-            # helpers
-            def month_start(y: int, m: int) -> date:
-                return date(y, m, 1)
+            # 12개월 전체 데이터: 과정 기간 안이고 시간/인원이 모두 있는 달만 합산
+            first_ym, last_ym = f"{year:04d}-01", f"{year:04d}-12"
 
-            def month_end(y: int, m: int) -> date:
-                if m == 12:
-                    return date(y, 12, 31)
-                return date(y, m+1, 1) - timedelta(days=1)
+            def load_year_revenue(c: sqlite3.Connection) -> List[sqlite3.Row]:
+                return c.execute(
+                    "SELECT program_id, ym, expected FROM revenue_by_month "
+                    f"WHERE ym BETWEEN ? AND ? AND in_period = 1 AND hours > 0 AND enrollments > 0 {only}",
+                    [first_ym, last_ym] + like_params
+                ).fetchall()
+
+            # 과정별 데이터도 함께 반환 (실제 운영 기간 기준, YYYY-MM 형식)
+            def period_map_of(rows: Any) -> Dict[int, Dict[str, int]]:
+                period_map: Dict[int, Dict[str, int]] = {}
+                for r in rows:
+                    period_map.setdefault(r['program_id'], {})[r['ym']] = r['expected']
+                return period_map
+
+            def load_period_map(c: sqlite3.Connection) -> Dict[int, Dict[str, int]]:
+                return period_map_of(c.execute(
+                    f"SELECT program_id, ym, expected FROM revenue_by_month WHERE in_period = 1 {only} "
+                    "ORDER BY program_id, month_index",
+                    like_params
+                ))
+
+            # load programs (개강/종강일은 ISO로 SQL에서 계산)
+            if in_batch():
+                # batch 안에서는 하위 조회들이 같이 쓰는 revenue_by_month 전체 행에서 고른다
+                programs = load_programs(conn, where, like_params)
+                ids = {p['id'] for p in programs}
+                facts = [r for r in batch_revenue_facts(conn)
+                         if r['in_period'] == 1 and (not like_sql or r['program_id'] in ids)]
+                year_rows = [r for r in facts
+                             if r['ym'] and first_ym <= r['ym'] <= last_ym and r['hours'] > 0 and r['enrollments'] > 0]
+                period_map = period_map_of(facts)
+            else:
+                programs, year_rows, period_map = concurrent_reads(
+                    conn, lambda c: load_programs(c, where, like_params), load_year_revenue, load_period_map
+                )
+
+            monthly_revenue = {month: 0 for month in range(1, 13)}
+            for r in year_rows:
+                monthly_revenue[int(r['ym'][5:7])] += r['expected']
 
-            from datetime import timedelta
-            
-            # 12개월 전체 데이터 계산
-            monthly_revenue = {}
-            for month in range(1, 13):  # 1월~12월
-                monthly_revenue[month] = 0
-                
-                window_start = month_start(year, month)
-                window_end = month_end(year, month)
-
-                items = []
-                for p in programs:
-                    pid = int(p.get('id', 0))
-                    program_name = str(p.get(name_col) or p.get('과정명') or '').strip()
-                    round_name = str(p.get(round_col) or '').strip()
-                    
-                    start_dt = safe_date(p.get(start_col)) if start_col else None
-                    end_dt = safe_date(p.get(end_col)) if end_col else None
-                    
-                    if not (start_dt and end_dt):
-                        continue
-                    
-                    # 해당 월과 과정 기간이 겹치는지 확인
-                    if end_dt < window_start or start_dt > window_end:
-                        continue
-                    
-                    # N개월차 계산
-                    month_index = None
-                    cursor_date = start_dt
-                    idx = 1
-                    while cursor_date <= end_dt:
-                        next_month = cursor_date.replace(day=28) + timedelta(days=4)
-                        next_month = next_month.replace(day=1)
-                        month_end_cursor = min(next_month - timedelta(days=1), end_dt)
-                        
-                        if window_start <= month_end_cursor and cursor_date <= window_end:
-                            month_index = idx
-                            break
-                        
-                        cursor_date = next_month
-                        idx += 1
-                    
-                    if month_index is None:
-                        continue
-                    
-                    # 해당 개월차의 시간/인원 데이터 가져오기
-                    month_key = f"{month_index}M"
-                    hours_data = hours_map.get(pid, {})
-                    enroll_data = enroll_map.get(pid, {})
-                    
-                    hours = parse_int(hours_data.get(month_key, 0))
-                    enrollments = parse_int(enroll_data.get(month_key, 0))
-                    
-                    if hours > 0 and enrollments > 0:
-                        expected_revenue = hours * enrollments * 18150
-                        monthly_revenue[month] += expected_revenue
-                        
-                        items.append({
-                            'program': program_name,
-                            'round': round_name,
-                            'monthIndex': month_index,
-                            'expected': expected_revenue
-                        })
-
-            # 과정별 데이터도 함께 반환 (실제 운영 기간 기준)
             programs_data = {}
             for p in programs:
                 pid = int(p.get('id', 0))
@@ -1558,60 +4250,13 @@ def create_app() -> Flask:
                 
                 if not program_key or program_key in programs_data:
                     continue
-                    
-                start_dt = safe_date(p.get(start_col)) if start_col else None
-                end_dt = safe_date(p.get(end_col)) if end_col else None
-                
-                if not (start_dt and end_dt):
+                if not (p['_start'] and p['_end']):
                     continue
                 
-                # 실제 운영 월만 계산 (YYYY-MM 형식)
-                program_monthly_data = {}
-                
-                # 과정 운영 기간의 모든 월을 순회
-                cursor_date = start_dt
-                month_idx = 1
-                
-                while cursor_date <= end_dt:
-                    # 현재 월의 시작/끝 날짜
-                    current_month_start = cursor_date.replace(day=1)
-                    if cursor_date.month == 12:
-                        next_month_start = cursor_date.replace(year=cursor_date.year + 1, month=1, day=1)
-                    else:
-                        next_month_start = cursor_date.replace(month=cursor_date.month + 1, day=1)
-                    current_month_end = next_month_start - timedelta(days=1)
-                    
-                    # 실제 과정 기간과 겹치는 부분만 계산
-                    actual_start = max(cursor_date, start_dt)
-                    actual_end = min(current_month_end, end_dt)
-                    
-                    if actual_start <= actual_end:
-                        # YYYY-MM 형식의 키 생성
-                        month_key_str = cursor_date.strftime('%Y-%m')
-                        
-                        # N개월차 데이터 가져오기
-                        month_data_key = f"{month_idx}M"
-                        hours_data = hours_map.get(pid, {})
-                        enroll_data = enroll_map.get(pid, {})
-                        
-                        hours = parse_int(hours_data.get(month_data_key, 0))
-                        enrollments = parse_int(enroll_data.get(month_data_key, 0))
-                        
-                        if hours > 0 and enrollments > 0:
-                            expected_revenue = hours * enrollments * 18150
-                            program_monthly_data[month_key_str] = expected_revenue
-                        else:
-                            # 데이터가 없는 경우 0으로 설정 (나중에 프론트엔드에서 필터링)
-                            program_monthly_data[month_key_str] = 0
-                    
-                    # 다음 월로 이동
-                    cursor_date = next_month_start
-                    month_idx += 1
-                
                 programs_data[program_key] = {
-                    'start_date': start_dt.isoformat(),
-                    'end_date': end_dt.isoformat(),
-                    'monthly_data': program_monthly_data
+                    'start_date': p['_start'],
+                    'end_date': p['_end'],
+                    'monthly_data': period_map.get(pid, {})
                 }
 
             return jsonify({
@@ -1623,7 +4268,7 @@ def create_app() -> Flask:
             })
             
         except Exception as e:
-            print(f"Error in yearly monthly revenue: {e}")
+            logger.exception("Error in yearly monthly revenue: %s", e)
             return jsonify({'year': year, 'monthly_totals': {}, 'items': []})
         finally:
             try:
@@ -1631,12 +4276,100 @@ def create_app() -> Flask:
             except Exception:
                 pass
 
+    # --------------------
+    # Batch: 여러 GET 조회를 한 요청으로 실행하고 결과를 함께 돌려준다.
+    # 하위 조회들은 g.kdt_batch_loads로 kdt_programs/revenue_by_month 읽기를 나눠 쓴다
+    # (필터 WHERE와 데이터 버전이 같으면 한 번만 읽는다).
+    # --------------------
+    def dispatch_batch_item(path: str, query: str) -> Tuple[int, bytes]:
+        """Run one GET sub-query in its own request context; returns (status, JSON body)."""
+        if not path.startswith('/api/') or path.startswith(('/api/batch', '/api/views/')):
+            return 400, json.dumps({'success': False, 'message': f'batch에서 지원하지 않는 경로입니다: {path}'},
+                                   ensure_ascii=False).encode()
+        # 클라이언트가 인코딩하지 않은 한글 값도 받도록 쿼리를 다시 인코딩한다 (WSGI 문자열은 latin-1)
+        query = urlencode(parse_qsl(query, keep_blank_values=True))
+        environ = {**request.environ, 'REQUEST_METHOD': 'GET', 'QUERY_STRING': query,
+                   'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+                   'CONTENT_LENGTH': '0', 'wsgi.input': io.BytesIO()}
+        environ.pop('CONTENT_TYPE', None)
+        # before/after_request 훅(ETag, 계측, request id)은 batch 요청 하나에만 적용된다
+        with app.request_context(environ):
+            try:
+                resp = app.make_response(app.dispatch_request())
+            except HTTPException as e:
+                return e.code or 500, json.dumps({'success': False, 'message': e.description},
+                                                 ensure_ascii=False).encode()
+            if resp.mimetype != 'application/json':
+                resp.close()
+                return 400, json.dumps({'success': False, 'message': f'JSON 응답이 아닌 경로입니다: {path}'},
+                                       ensure_ascii=False).encode()
+            return resp.status_code, resp.get_data()
+
+    def run_batch(items: List[Tuple[str, str]]) -> List[Tuple[int, bytes]]:
+        # 데이터 버전을 먼저 읽어 둔다: 하위 조회가 연결을 쥔 채 따로 읽지 않도록
+        get_data_version()
+        g.kdt_batch_loads = {}
+        try:
+            return [dispatch_batch_item(path, query) for path, query in items]
+        finally:
+            g.pop('kdt_batch_loads', None)
+
+    @app.post('/api/batch')
+    def batch():
+        """Body: {"requests": ["/api/dashboard/kpi?year=2025", {"id": "t", "path": "/api/dashboard/trends", "params": {"year": "2025"}}]}"""
+        payload = request.get_json(silent=True)
+        entries = payload.get('requests') if isinstance(payload, dict) else payload
+        if not isinstance(entries, list) or not entries:
+            return jsonify({'success': False, 'message': 'requests 목록이 필요합니다.'}), 400
+        if len(entries) > BATCH_MAX_REQUESTS:
+            return jsonify({'success': False, 'message': f'한 번에 최대 {BATCH_MAX_REQUESTS}개까지 요청할 수 있습니다.'}), 400
+        ids, items = [], []
+        for n, entry in enumerate(entries):
+            if isinstance(entry, str):
+                path, _, query = entry.partition('?')
+                ids.append(str(n))
+            elif isinstance(entry, dict) and isinstance(entry.get('path'), str):
+                path, _, query = entry['path'].partition('?')
+                params = entry.get('params') or {}
+                if isinstance(params, dict) and params:
+                    query = '&'.join(filter(None, [query, urlencode({k: v for k, v in params.items() if v is not None})]))
+                ids.append(str(entry.get('id', n)))
+            else:
+                return jsonify({'success': False, 'message': f'{n}번째 요청 형식이 올바르지 않습니다.'}), 400
+            items.append((path, query))
+
+        results = run_batch(items)
+        # 하위 응답은 이미 JSON이므로 다시 파싱하지 않고 이어 붙인다
+        parts = [
+            b'{"id":' + json.dumps(rid, ensure_ascii=False).encode() + b',"path":'
+            + json.dumps(path, ensure_ascii=False).encode() + b',"status":' + str(status).encode()
+            + b',"data":' + (body.strip() or b'null') + b'}'
+            for rid, (path, _), (status, body) in zip(ids, items, results)
+        ]
+        return Response(b'{"results":[' + b','.join(parts) + b']}', mimetype='application/json')
+
+    @app.get('/api/views/<tab>')
+    def batch_view(tab: str):
+        """One tab's data: {part key: part response} for BATCH_VIEWS[tab], query args passed through."""
+        parts = BATCH_VIEWS.get(tab)
+        if parts is None:
+            return jsonify({'success': False, 'message': f'알 수 없는 탭입니다: {tab}'}), 404
+        results = run_batch([
+            (path, urlencode([(k, v) for k in keys for v in request.args.getlist(k) if v]))
+            for _, path, keys in parts
+        ])
+        body = b'{' + b','.join(
+            b'"' + key.encode() + b'":' + (data.strip() or b'null') for (key, _, _), (_, data) in zip(parts, results)
+        ) + b'}'
+        return Response(body, status=max(status for status, _ in results), mimetype='application/json')
+
     return app
 
 
 if __name__ == '__main__':
+    # 개발 서버 (단일 프로세스). 운영은 wsgi.py / gunicorn.conf.py 를 사용한다.
     app = create_app()
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=True)
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('KDT_DEBUG', '0') == '1')
 
 
@@ -0,0 +1,168 @@
+"""ASGI entry point for the KDT dashboard.
+
+Usage:
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+Requires an ASGI server (uvicorn, hypercorn, ...). The Flask app is built and
+warmed by wsgi.py (one per worker process); every route is run on a thread
+of this module's executor, so a slow query never blocks the event loop.
+
+GET /api/pages/business is answered here: the business tab's three reads
+(revenue-metrics, yearly-monthly-revenue, monthly-expected) are dispatched
+concurrently and returned as one JSON object keyed by part, so the page costs
+about its slowest part instead of the sum. Query args are passed through to
+the parts that take them (year, month, program_like). The parts are
+app.BATCH_VIEWS['business'], so the response matches /api/views/business,
+which runs the same reads one after another under any WSGI server. The parts
+are run with app.py's per-request read fan-out turned off, so one page never
+holds more than one read connection per part.
+
+    KDT_ASGI_THREADS   request threads per worker process (default 16)
+"""
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from app import BATCH_VIEWS, READ_FANOUT_ENVIRON, REQUEST_ID_HEADER
+from wsgi import app as flask_app
+
+ASGI_THREADS = int(os.environ.get('KDT_ASGI_THREADS', 16))
+
+BUSINESS_PAGE_PATH = '/api/pages/business'
+BUSINESS_PAGE_PARTS = BATCH_VIEWS['business']
+
+executor = ThreadPoolExecutor(ASGI_THREADS, thread_name_prefix='kdt-asgi')
+
+
+def wsgi_environ(scope: Dict[str, Any], body: IO[bytes], path: str | None = None,
+                 query_string: bytes | None = None, headers: List[Tuple[bytes, bytes]] | None = None) -> Dict[str, Any]:
+    """WSGI environ for an ASGI http scope; path/query_string/headers override the scope's."""
+    server = scope.get('server') or ('localhost', 80)
+    environ: Dict[str, Any] = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf8').decode('latin-1'),
+        'PATH_INFO': (path or scope['path']).encode('utf8').decode('latin-1'),
+        'QUERY_STRING': (scope.get('query_string', b'') if query_string is None else query_string).decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    if scope.get('client'):
+        environ['REMOTE_ADDR'] = scope['client'][0]
+    for name, value in scope.get('headers', []) if headers is None else headers:
+        key = name.decode('latin-1').upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = 'HTTP_' + key
+        value = value.decode('latin-1')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def run_wsgi(environ: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]) -> None:
+    """Run one request through the Flask app on a worker thread, emitting ASGI messages."""
+    start: Dict[str, Any] = {}
+
+    def start_response(status: str, response_headers: List[Tuple[str, str]], exc_info: Any = None) -> None:
+        start['message'] = {
+            'type': 'http.response.start',
+            'status': int(status.split(' ', 1)[0]),
+            'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in response_headers],
+        }
+
+    result = flask_app(environ, start_response)
+    try:
+        started = False
+        for chunk in result:
+            if not started:
+                emit(start['message'])
+                started = True
+            if chunk:
+                emit({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        if not started:
+            emit(start['message'])
+        emit({'type': 'http.response.body', 'body': b''})
+    finally:
+        close = getattr(result, 'close', None)
+        if close is not None:
+            close()
+
+
+def call_wsgi(environ: Dict[str, Any]) -> Tuple[int, bytes]:
+    messages: List[Dict[str, Any]] = []
+    run_wsgi(environ, messages.append)
+    return messages[0]['status'], b''.join(m.get('body', b'') for m in messages[1:])
+
+
+async def business_page(scope: Dict[str, Any], send: Any) -> None:
+    args = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+    # 부분 요청에는 상관관계 id만 넘긴다 (If-None-Match 등이 넘어가면 304 빈 본문이 섞인다)
+    headers = [(k, v) for k, v in scope.get('headers', []) if k.decode('latin-1').lower() == REQUEST_ID_HEADER.lower()]
+    empty = SpooledTemporaryFile(max_size=0)
+
+    def part_environ(path: str, keys: Tuple[str, ...]) -> Dict[str, Any]:
+        environ = wsgi_environ(scope, empty, path, urlencode({k: args[k] for k in keys if args.get(k)}).encode(), headers)
+        # 부분끼리 이미 동시에 돌므로 부분 안에서 다시 fan-out하지 않는다
+        environ[READ_FANOUT_ENVIRON] = False
+        return environ
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(executor, call_wsgi, part_environ(path, keys))
+        for _, path, keys in BUSINESS_PAGE_PARTS
+    ))
+
+    # 각 부분 응답은 이미 JSON이므로 다시 파싱하지 않고 이어 붙인다
+    chunks = [b'"' + key.encode() + b'":' + (body.strip() or b'null')
+              for (key, _, _), (_, body) in zip(BUSINESS_PAGE_PARTS, results)]
+    body = b'{' + b','.join(chunks) + b'}'
+    await send({
+        'type': 'http.response.start',
+        'status': max(status for status, _ in results),
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def app(scope: Dict[str, Any], receive: Any, send: Any) -> None:
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+    if scope['method'] == 'GET' and scope['path'] == BUSINESS_PAGE_PATH:
+        await business_page(scope, send)
+        return
+
+    # 요청 본문은 64KiB까지 메모리, 그 이상은 임시 파일 (bulk import)
+    with SpooledTemporaryFile(max_size=65536) as body:
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+        loop = asyncio.get_running_loop()
+
+        def emit(message: Dict[str, Any]) -> None:
+            asyncio.run_coroutine_threadsafe(send(message), loop).result()
+
+        await loop.run_in_executor(executor, run_wsgi, wsgi_environ(scope, body), emit)
@@ -0,0 +1,436 @@
+"""Synthetic data generator and benchmarks for the KDT dashboard.
+
+Usage:
+    python bench.py generate --db /tmp/kdt_bench.db --rows 100000
+    python bench.py indexes --db /tmp/kdt_bench.db --rows 100000
+    python bench.py run --db /tmp/kdt_bench.db --rows 100000 --out bench-100k.json
+    python bench.py run --rows 100000 --baseline bench-100k.json   # compare after running
+    python bench.py compare bench-100k.json bench-new.json
+
+``run`` regenerates the database (unless --reuse), drives every route of
+create_app() through Flask's test client with the result cache off, and
+reports per-route latency (median/p95/min), rows/sec (kdt_programs rows per
+median request; processed rows for bulk/write routes) and peak RSS. Results
+are written as a JSON baseline; ``compare`` (or run --baseline) flags routes
+whose median got slower than --threshold and exits with status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import app as dashboard
+
+
+TEAMS = ['교육기획 1팀', '교육기획 2팀', '교육기획 3팀', '교육기획 4팀', '교육기획 5팀', '교육기획 6팀', '교육운영팀', 'impact hub']
+STATUSES = ['종강', '종강', '종강', '진행중', '모집중']
+COURSES = [
+    ('KDT_B_AIW', 'AI 서비스 기획 개발 과정'),
+    ('KDT_B_FE', '웹 서비스 프로젝트 기반 프론트엔드 엔지니어 부트캠프'),
+    ('KDT_B_DA', '멋쟁이사자처럼 데이터분석 스쿨'),
+    ('KDT_B_BE', '백엔드 스쿨'),
+    ('KDT_B_CL', '클라우드 엔지니어링 스쿨'),
+    ('KDT_B_UX', 'UX/UI 디자인 스쿨'),
+]
+
+
+def create_schema(db_path: str) -> None:
+    """Create an empty database with the app's schema (ensure_db/migrate_schema)."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    dashboard.DB_PATH = db_path
+    dashboard.create_app()
+
+
+# safe_date()가 받아들이는 날짜 표기 (저장 시 ISO로 정규화되기 전의 레거시 데이터 형태)
+DATE_FORMATS = ['{y}-{m:02d}-{d:02d}', '{y}-{m:02d}-{d:02d}', '{y}.{m:02d}.{d:02d}', '{y}/{m:02d}/{d:02d}', '{y}-{m}-{d}']
+
+
+def format_date(rng: random.Random, year: int, month: int, day: int) -> str:
+    return rng.choice(DATE_FORMATS).format(y=year, m=month, d=day)
+
+
+def program_rows(n: int, seed: int) -> List[Tuple[Any, ...]]:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        code, name = rng.choice(COURSES)
+        year = rng.randint(2015, 2026)
+        month = rng.randint(1, 12)
+        start = format_date(rng, year - 1 if month > 6 else year, month, rng.randint(1, 28))
+        end_month = (month + 5) % 12 + 1
+        # 진행중/모집중 과정 일부는 종강일이 비어 있다
+        end = format_date(rng, year, end_month, rng.randint(1, 28)) if rng.random() > 0.02 else ''
+        confirmed = rng.randint(10, 60)
+        completed = rng.randint(0, confirmed)
+        rows.append((
+            f"{code}_{i % 50:04d}", name, str(i % 20 + 1), str(i % 20 + 1), rng.choice(STATUSES),
+            start, end, year, f"Q{(end_month - 1) // 3 + 1}", rng.choice(TEAMS),
+            rng.choice([760, 920, 1040]), 60, confirmed, confirmed - completed, completed,
+            rng.randint(0, completed), rng.randint(0, 3), rng.randint(0, 3), rng.randint(0, 2),
+            round(rng.uniform(3.5, 5.0), 1),
+        ))
+    return rows
+
+
+def monthly_rows(programs: List[Tuple[Any, ...]], seed: int) -> Tuple[List[Tuple[int, ...]], List[Tuple[int, ...]]]:
+    """(hours, enrollments) rows for kdt_monthly_*; program ids are 1..n in insert order."""
+    rng = random.Random(seed + 1)
+    hours, enrollments = [], []
+    for pid, p in enumerate(programs, start=1):
+        months = rng.randint(5, 8)
+        confirmed = p[12]
+        h = [rng.choice([120, 140, 160, 176]) if m < months else 0 for m in range(12)]
+        e, left = [], confirmed
+        for m in range(12):
+            if m < months:
+                left = max(left - rng.randint(0, 2), 0)
+                e.append(left)
+            else:
+                e.append(0)
+        hours.append((pid, *h))
+        enrollments.append((pid, *e))
+    return hours, enrollments
+
+
+def generate(db_path: str, rows: int, seed: int = 42) -> None:
+    create_schema(db_path)
+    programs = program_rows(rows, seed)
+    hours, enrollments = monthly_rows(programs, seed)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            'INSERT INTO kdt_programs (과정코드, HRD_Net_과정명, 회차, 기수, 진행상태, 개강일, 종강일, 년도, 분기, 담당팀, '
+            '교육시간, 정원, HRD_확정, 중도이탈, 수료인원, 취업인원, 근로자, 취업산정제외인원, "수료산정 제외인원", HRD_만족도) '
+            'VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+            programs
+        )
+        for table, data in (('kdt_monthly_hours', hours), ('kdt_monthly_enrollments', enrollments)):
+            cols = ', '.join(f'"{m}M"' for m in range(1, 13))
+            conn.executemany(f'INSERT INTO {table} (id, {cols}) VALUES ({", ".join("?" * 13)})', data)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# --------------------
+# Index benchmark
+# --------------------
+FILTER_QUERIES = [
+    ('year', '년도 = ?', (2025,)),
+    ('year+quarter', '년도 = ? AND 분기 = ?', (2025, 'Q2')),
+    ('year+quarter+team', '년도 = ? AND 분기 = ? AND 담당팀 = ?', (2025, 'Q2', '교육기획 1팀')),
+    ('year+status (timeline)', '년도 = ? AND 진행상태 = ?', (2025, '진행중')),
+    ('team', '담당팀 = ?', ('교육기획 2팀',)),
+    ('team+status', '담당팀 = ? AND 진행상태 = ?', ('교육기획 2팀', '종강')),
+]
+
+
+def measure_filters(db_path: str, repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    conn = sqlite3.connect(db_path)
+    results = {}
+    try:
+        for label, where, params in FILTER_QUERIES:
+            sql = f"SELECT * FROM kdt_programs WHERE {where} ORDER BY id"
+            plan = [r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()]
+            timings = []
+            count = 0
+            for _ in range(repeat):
+                t = time.perf_counter()
+                count = len(conn.execute(sql, params).fetchall())
+                timings.append((time.perf_counter() - t) * 1000)
+            results[label] = {'plan': plan, 'ms': statistics.median(timings), 'rows': count}
+    finally:
+        conn.close()
+    return results
+
+
+def drop_filter_indexes(db_path: str) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        names = [r[0] for r in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_kdt_programs_filter_%'"
+        ).fetchall()]
+        for name in names:
+            conn.execute(f'DROP INDEX "{name}"')
+        conn.execute("DROP TABLE IF EXISTS sqlite_stat1")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def bench_indexes(db_path: str, rows: int) -> None:
+    generate(db_path, rows)
+    drop_filter_indexes(db_path)
+    before = measure_filters(db_path)
+    dashboard.DB_PATH = db_path
+    dashboard.create_app()  # ensure_filter_indexes()
+    after = measure_filters(db_path)
+    print(f"kdt_programs rows: {rows}")
+    for label, _, _ in FILTER_QUERIES:
+        b, a = before[label], after[label]
+        print(f"\n[{label}] {b['rows']} rows  {b['ms']:.2f} ms -> {a['ms']:.2f} ms")
+        print(f"  before: {' / '.join(b['plan'])}")
+        print(f"  after:  {' / '.join(a['plan'])}")
+
+
+# --------------------
+# Route benchmark
+# --------------------
+# (method, url); 쿼리 조합은 대시보드 화면이 실제로 보내는 형태
+READ_ROUTES = [
+    ('GET', '/'),
+    ('GET', '/static/js/app.js'),
+    ('GET', '/api/filters/years'),
+    ('GET', '/api/filters/quarters?year=2025'),
+    ('GET', '/api/filters/team'),
+    ('GET', '/api/filters/kpi-periods'),
+    ('GET', '/api/programs'),
+    ('GET', '/api/programs?year=2025&limit=50'),
+    ('GET', '/api/programs?fields=id,과정코드,종강일&stream=1'),
+    ('GET', '/api/programs/search?q=데이터분석'),
+    ('GET', '/api/programs/export?format=csv'),
+    ('GET', '/api/programs/export?format=xlsx&year=2025'),
+    ('GET', '/api/dashboard/kpi'),
+    ('GET', '/api/dashboard/kpi?year=2025&team=교육기획 1팀'),
+    ('GET', '/api/dashboard/trends?year=2025'),
+    ('GET', '/api/education/stats?year=2025'),
+    ('GET', '/api/education/counts?year=2025'),
+    ('GET', '/api/education/timeline/2025?status=전체'),
+    ('GET', '/api/education/timeline/2025?status=종강'),
+    ('GET', '/api/business/kpi?year=2025'),
+    ('GET', '/api/business/revenue-trend?year=2025'),
+    ('GET', '/api/business/revenue-metrics?year=2025'),
+    ('GET', '/api/business/revenue-metrics?year=all'),
+    ('GET', '/api/business/revenue-metrics/export?year=2025&format=csv'),
+    ('GET', '/api/business/monthly-revenue?year=2025'),
+    ('GET', '/api/business/monthly-revenue?year=all&program_like=스쿨'),
+    ('GET', '/api/business/monthly-revenue/export?year=2025&format=csv'),
+    ('GET', '/api/business/monthly-expected?year=2025&month=7'),
+    ('GET', '/api/business/yearly-monthly-revenue?year=2025'),
+    ('GET', '/api/analytics/metrics?granularity=quarter'),
+    ('GET', '/api/analytics/metrics?year=2025&granularity=month&ruleset=raw'),
+    ('GET', '/api/analytics/metrics?granularity=program&program_like=스쿨'),
+    ('GET', '/api/cache/stats'),
+    ('GET', '/api/metrics'),
+    ('GET', '/metrics'),
+]
+BULK_ROWS = 1000
+
+
+def peak_rss_kb() -> int | None:
+    # ru_maxrss: Linux는 KiB, macOS는 바이트
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def timed(client: Any, method: str, url: str, **kwargs: Any) -> Tuple[float, Any]:
+    t = time.perf_counter()
+    resp = client.open(url, method=method, **kwargs)
+    resp.get_data()  # 스트리밍 응답은 본문을 다 읽어야 끝난다
+    return (time.perf_counter() - t) * 1000, resp
+
+
+def summarize(timings: List[float], rows: int, statuses: List[int], rss_before: int | None) -> Dict[str, Any]:
+    timings = sorted(timings)
+    median = statistics.median(timings)
+    rss = peak_rss_kb()
+    return {
+        'ms_median': round(median, 3),
+        'ms_p95': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'ms_min': round(timings[0], 3),
+        'rows_per_sec': round(rows / (median / 1000), 1) if median > 0 else None,
+        'rss_peak_kb': rss,
+        'rss_growth_kb': rss - rss_before if rss is not None and rss_before is not None else None,
+        'statuses': sorted(set(statuses)),
+    }
+
+
+def bench_routes(db_path: str, rows: int, seed: int, repeat: int, reuse: bool, snapshot: bool) -> Dict[str, Any]:
+    if not reuse:
+        generate(db_path, rows, seed)
+    dashboard.DB_PATH = db_path
+    dashboard.RESULT_CACHE_SIZE = 0  # 캐시 적중이 아닌 실제 처리 시간을 잰다
+    dashboard.PROGRAM_SNAPSHOT = snapshot
+    t = time.perf_counter()
+    app = dashboard.create_app()  # 레거시 날짜 정규화, 인덱스, revenue_by_month 재계산 포함
+    startup_ms = (time.perf_counter() - t) * 1000
+    client = app.test_client()
+
+    conn = sqlite3.connect(db_path)
+    program_count = conn.execute('SELECT COUNT(*) FROM kdt_programs').fetchone()[0]
+    conn.close()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    exercised = set()
+    adapter = app.url_map.bind('localhost')
+
+    def record(method: str, url: str, timings: List[float], statuses: List[int], n: int, rss_before: int | None) -> None:
+        label = f"{method} {url}"
+        results[label] = summarize(timings, n, statuses, rss_before)
+        exercised.add(adapter.match(url.split('?')[0], method=method)[0])
+        r = results[label]
+        print(f"{label:<75} {r['ms_median']:>10.2f} ms  p95 {r['ms_p95']:>10.2f}  "
+              f"{r['rows_per_sec'] or 0:>12.0f} rows/s  rss {r['rss_peak_kb']} KiB", flush=True)
+
+    for method, url in READ_ROUTES:
+        rss_before = peak_rss_kb()
+        timed(client, method, url)  # 첫 호출(스냅샷 빌드 등)은 제외
+        timings, statuses = [], []
+        for _ in range(repeat):
+            ms, resp = timed(client, method, url)
+            timings.append(ms)
+            statuses.append(resp.status_code)
+        record(method, url, timings, statuses, program_count, rss_before)
+
+    # 쓰기: 반복마다 새 과정을 만들고 수정/조회/삭제한다 (rows/sec = 초당 처리 건수)
+    program = {
+        '과정코드': 'BENCH_0001', '과정명': '벤치마크 과정', '회차': '1', '진행상태': '진행중',
+        '개강일': '2025.03.04', '종강일': '2025/08/29', '년도': 2025, '분기': 'Q3', '담당팀': '교육기획 1팀',
+        '교육시간': 920, 'HRD_확정': 30, '수료인원': 25,
+        'monthly_hours': {'1M': 160, '2M': 160}, 'monthly_enrollments': {'1M': 30, '2M': 29},
+    }
+    write_steps: Dict[Tuple[str, str], Tuple[List[float], List[int]]] = {}
+    rss_before = peak_rss_kb()
+    for _ in range(repeat):
+        ms, resp = timed(client, 'POST', '/api/programs', json=program)
+        pid = (resp.get_json() or {}).get('id')
+        steps = [(('POST', '/api/programs'), ms, resp.status_code)]
+        for method, url, kwargs in (
+            ('PUT', f'/api/programs/{pid}', {'json': {**program, '수료인원': 26}}),
+            ('GET', f'/api/programs/{pid}/monthly-hours', {}),
+            ('GET', f'/api/programs/{pid}/monthly-enrollments', {}),
+            ('DELETE', f'/api/programs/{pid}', {}),
+        ):
+            ms, resp = timed(client, method, url, **kwargs)
+            steps.append(((method, url.replace(str(pid), '<pid>')), ms, resp.status_code))
+        for key, ms, status in steps:
+            timings, statuses = write_steps.setdefault(key, ([], []))
+            timings.append(ms)
+            statuses.append(status)
+    for (method, url), (timings, statuses) in write_steps.items():
+        label = f"{method} {url}"
+        results[label] = summarize(timings, 1, statuses, rss_before)
+        exercised.add(adapter.match(url.replace('<pid>', '1'), method=method)[0])
+        print(f"{label:<75} {results[label]['ms_median']:>10.2f} ms", flush=True)
+
+    bulk = [{**program, '과정코드': f'BENCH_{i:04d}', '회차': str(i)} for i in range(BULK_ROWS)]
+    rss_before = peak_rss_kb()
+    timings, statuses = [], []
+    for _ in range(repeat):
+        ms, resp = timed(client, 'POST', '/api/programs/bulk', json=bulk)
+        timings.append(ms)
+        statuses.append(resp.status_code)
+    record('POST', '/api/programs/bulk', timings, statuses, BULK_ROWS, rss_before)
+
+    rss_before = peak_rss_kb()
+    ms, resp = timed(client, 'POST', '/api/admin/schema/refresh')
+    record('POST', '/api/admin/schema/refresh', [ms], [resp.status_code], 1, rss_before)
+
+    # 전체 삭제는 마지막에 한 번 (생성한 DB에서만)
+    if not reuse:
+        rss_before = peak_rss_kb()
+        ms, resp = timed(client, 'POST', '/api/programs/reset')
+        record('POST', '/api/programs/reset', [ms], [resp.status_code], program_count, rss_before)
+
+    missing = sorted({rule.endpoint for rule in app.url_map.iter_rules()} - exercised)
+    if missing:
+        print(f"not benchmarked: {', '.join(missing)}")
+
+    for pool in app.extensions['kdt_db_pool'].values():
+        if pool is not None:
+            pool.close_all()
+    return {
+        'meta': {
+            'rows': program_count,
+            'seed': seed,
+            'repeat': repeat,
+            'snapshot': snapshot,
+            'startup_ms': round(startup_ms, 1),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'created': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float, min_ms: float) -> bool:
+    """Print median changes per route; True if any route regressed by more than threshold."""
+    if baseline['meta'].get('rows') != current['meta'].get('rows'):
+        print(f"warning: baseline has {baseline['meta'].get('rows')} rows, current {current['meta'].get('rows')}")
+    regressed = False
+    base, cur = baseline['results'], current['results']
+    for label in cur:
+        if label not in base:
+            print(f"{'new':>8}  {label}")
+            continue
+        b, c = base[label]['ms_median'], cur[label]['ms_median']
+        ratio = c / b if b > 0 else float('inf')
+        # 짧은 요청의 잡음은 무시: 비율과 절대 차이 모두 넘어야 회귀
+        bad = ratio > 1 + threshold and c - b > min_ms
+        regressed = regressed or bad
+        print(f"{'REGRESS' if bad else 'ok':>8}  {label:<75} {b:>10.2f} -> {c:>10.2f} ms  x{ratio:.2f}")
+    for label in base:
+        if label not in cur:
+            print(f"{'missing':>8}  {label}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['generate', 'indexes', 'run', 'compare'])
+    parser.add_argument('files', nargs='*', help='compare: BASELINE CURRENT')
+    parser.add_argument('--db', default='/tmp/kdt_bench.db')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--reuse', action='store_true', help='run: benchmark the existing --db as is')
+    parser.add_argument('--snapshot', action='store_true', help='run: enable the columnar program snapshot')
+    parser.add_argument('--out', help='run: write results JSON here')
+    parser.add_argument('--baseline', help='run: compare against this results JSON')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed median slowdown (0.25 = 25%%)')
+    parser.add_argument('--min-ms', type=float, default=2.0, help='ignore slowdowns smaller than this')
+    args = parser.parse_args()
+    if args.command == 'generate':
+        generate(args.db, args.rows, args.seed)
+    elif args.command == 'indexes':
+        bench_indexes(args.db, args.rows)
+    elif args.command == 'run':
+        current = bench_routes(args.db, args.rows, args.seed, args.repeat, args.reuse, args.snapshot)
+        print(f"startup {current['meta']['startup_ms']} ms, {current['meta']['rows']} programs")
+        if args.out:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(current, f, ensure_ascii=False, indent=2)
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                if compare(json.load(f), current, args.threshold, args.min_ms):
+                    sys.exit(1)
+    elif args.command == 'compare':
+        if len(args.files) != 2:
+            parser.error('compare needs BASELINE and CURRENT files')
+        with open(args.files[0], encoding='utf-8') as f:
+            baseline = json.load(f)
+        with open(args.files[1], encoding='utf-8') as f:
+            current = json.load(f)
+        if compare(baseline, current, args.threshold, args.min_ms):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
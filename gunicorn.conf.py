@@ -0,0 +1,12 @@
+"""gunicorn settings for wsgi:app, read from the environment (see wsgi.py)."""
+import os
+
+bind = os.environ.get('KDT_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('KDT_WORKERS', os.cpu_count() or 1))
+threads = int(os.environ.get('KDT_THREADS', 4))
+worker_class = 'gthread'
+keepalive = int(os.environ.get('KDT_KEEPALIVE', 5))
+timeout = int(os.environ.get('KDT_TIMEOUT', 60))
+graceful_timeout = 30
+preload_app = os.environ.get('KDT_PRELOAD', '1') == '1'
+accesslog = os.environ.get('KDT_ACCESS_LOG') or None
@@ -8,6 +8,7 @@
         quarter: '',
         category: '',
         status: '',
+        trends: null,
         trendChart: null,
         revenueChart: null,
         programsCache: []
@@ -250,8 +251,11 @@
         if(this.state.quarter) params.set('quarter', this.state.quarter);
         if(this.state.category) params.set('category', this.state.category);
         if(this.state.status) params.set('status', this.state.status);
-        const kpiRes = await fetch(`/api/dashboard/kpi?${params.toString()}`);
-        const kpis = await kpiRes.json();
+        // KPI 카드와 추이 차트를 한 요청으로 받는다 (/api/views/dashboard → {kpi, trends})
+        const viewRes = await fetch(`/api/views/dashboard?${params.toString()}`);
+        const view = await viewRes.json();
+        const kpis = view.kpi || {};
+        this.state.trends = {year: this.state.year, data: view.trends || []};
         renderKpiCards(document.getElementById('dashboard-kpis'), [
           {label:'모객율', value: (kpis['모집률']||0).toFixed(2)+'%'},
           {label:'취업률', value: (kpis['취업률']||0).toFixed(2)+'%'},
@@ -281,10 +285,16 @@
 
     async updateTrendChart(metric){
       try{
-        const params = new URLSearchParams();
-        if(this.state.year) params.set('year', this.state.year);
-        const res = await fetch(`/api/dashboard/trends?${params.toString()}`);
-        const data = await res.json();
+        let data;
+        if(this.state.trends && this.state.trends.year === this.state.year){
+          data = this.state.trends.data;
+        }else{
+          const params = new URLSearchParams();
+          if(this.state.year) params.set('year', this.state.year);
+          const res = await fetch(`/api/dashboard/trends?${params.toString()}`);
+          data = await res.json();
+          this.state.trends = {year: this.state.year, data};
+        }
         const labels = data.map(d=>d.quarter);
         const datasets = [];
         const palette = {
@@ -909,22 +919,31 @@
       return '';
     }
     
-    // 과정 선택 드롭다운 초기화
-    async loadMonthlyProgramOptions() {
+    // 과정 선택 드롭다운 초기화: 전체 목록 대신 검색어에 맞는 과정만 받아온다
+    async loadMonthlyProgramOptions(query = document.querySelector('.program-search-input')?.value.trim() || '') {
       try {
-        const res = await fetch('/api/programs');
+        const seq = this._programSearchSeq = (this._programSearchSeq || 0) + 1;
+        const q = new URLSearchParams({ q: query, limit: '50' });
+        const res = await fetch(`/api/programs/search?${q.toString()}`);
         const programs = await res.json();
+        // 늦게 도착한 이전 검색 결과는 버린다
+        if (seq !== this._programSearchSeq) return;
         const menu = document.querySelector('.program-select-menu');
         
         if (menu) {
-          // 기존 메뉴 비우기 (전체 과정 옵션 제외)
-          const allOption = menu.querySelector('li:first-child');
-          menu.innerHTML = '';
-          if (allOption) menu.appendChild(allOption);
+          // 기존 과정 옵션 비우기 (검색창, 전체 과정 옵션 제외)
+          menu.querySelectorAll('li.program-option, li.program-empty').forEach(li => li.remove());
+          if (!programs.length) {
+            const li = document.createElement('li');
+            li.className = 'program-empty';
+            li.textContent = '검색 결과가 없습니다.';
+            menu.appendChild(li);
+          }
           
           // 과정 데이터로 옵션 추가
           programs.forEach(program => {
             const li = document.createElement('li');
+            li.className = 'program-option';
             const a = document.createElement('a');
             a.href = '#';
             a.dataset.value = program['과정명'] || program['HRD_Net_과정명'] || '';
@@ -952,11 +971,22 @@
       }
     }
     
-    // 과정 선택 드롭다운 이벤트 바인딩
+    // 과정 선택 드롭다운 이벤트 바인딩 (옵션을 다시 그려도 한 번만)
     bindProgramSelectEvents() {
+      if (this._programSelectBound) return;
+      this._programSelectBound = true;
       const toggle = document.querySelector('.program-select-toggle');
       const menu = document.querySelector('.program-select-menu');
       const dropdown = document.querySelector('.program-select-dropdown');
+      const search = menu?.querySelector('.program-search-input');
+      
+      // 검색어 입력이 멈추면(250ms) 검색
+      if (search) {
+        search.addEventListener('input', () => {
+          clearTimeout(this._programSearchTimer);
+          this._programSearchTimer = setTimeout(() => this.loadMonthlyProgramOptions(search.value.trim()), 250);
+        });
+      }
       
       if (toggle) {
         toggle.addEventListener('click', (e) => {
@@ -979,11 +1009,11 @@
       
       if (menu) {
         menu.addEventListener('click', (e) => {
-          e.preventDefault();
           e.stopPropagation();
           
           const link = e.target.closest('a');
           if (link) {
+            e.preventDefault();
             const value = link.dataset.value || '';
             const text = value ? link.querySelector('.program-name')?.textContent || '과정 선택...' : '전체 과정';
             
@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as dashboard  # noqa: E402
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+def insert_programs(db_path, rows):
+    """Insert raw kdt_programs rows (dicts of column -> value) without going through the API."""
+    conn = sqlite3.connect(db_path)
+    try:
+        for row in rows:
+            cols = list(row)
+            conn.execute(
+                f"INSERT INTO kdt_programs ({', '.join(quote_ident(c) for c in cols)}) "
+                f"VALUES ({', '.join('?' * len(cols))})",
+                [row[c] for c in cols],
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def make_app(tmp_path, monkeypatch):
+    """create_app() factory on a temporary DB (tmp_path/kdt.db); pools are closed on teardown."""
+    db_path = str(tmp_path / 'kdt.db')
+    monkeypatch.setattr(dashboard, 'DB_PATH', db_path)
+    apps = []
+
+    def factory():
+        flask_app = dashboard.create_app()
+        apps.append(flask_app)
+        return flask_app
+
+    factory.db_path = db_path
+    yield factory
+    for flask_app in apps:
+        for pool in flask_app.extensions['kdt_db_pool'].values():
+            if pool is not None:
+                pool.close_all()
+
+
+@pytest.fixture
+def read_conn():
+    """Read connection of an app, initialised like the app's own (kdt_date/kdt_int/... registered)."""
+    conns = []
+
+    def acquire(flask_app):
+        pool = flask_app.extensions['kdt_db_pool']['read']
+        if pool is None:
+            pytest.skip('KDT_DB_POOL_SIZE=0')
+        conns.append(pool.acquire())
+        return conns[-1]
+
+    yield acquire
+    for conn in conns:
+        conn.close()
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from conftest import dashboard
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+    client = make_app().test_client()
+    for i in range(12):
+        client.post('/api/programs', json={
+            '과정명': f'데이터 분석 {i % 3}', '회차': str(i % 4 + 1), '진행상태': '종강', '년도': 2025, '분기': 'Q2',
+            '개강일': f'2025-{i % 6 + 1:02d}-01', '종강일': f'2025-{i % 6 + 6:02d}-28', '교육시간': 760,
+            'HRD_확정': 20, '수료인원': 15, 'HRD_만족도': 4.5,
+            'monthly_hours': {'1M': 120, '2M': 160}, 'monthly_enrollments': {'1M': 20, '2M': 19},
+        })
+    return client
+
+
+@pytest.mark.parametrize('query', ['year=2025&month=2', 'year=2025&month=3&program_like=분석 1'])
+@pytest.mark.parametrize('tab', sorted(dashboard.BATCH_VIEWS))
+def test_view_parts_equal_individual_responses(client, tab, query):
+    view = client.get(f'/api/views/{tab}?{query}').get_json()
+    for key, path, args in dashboard.BATCH_VIEWS[tab]:
+        params = '&'.join(p for p in query.split('&') if p.split('=')[0] in args)
+        assert view[key] == client.get(f'{path}?{params}').get_json(), key
+
+
+def test_batch_keeps_request_order_and_ids(client):
+    resp = client.post('/api/batch', json={'requests': [
+        '/api/dashboard/kpi?year=2025',
+        {'id': 't', 'path': '/api/dashboard/trends', 'params': {'year': '2025'}},
+    ]})
+    results = json.loads(resp.get_data())['results']
+    assert resp.status_code == 200
+    assert [(r['id'], r['path'], r['status']) for r in results] == [
+        ('0', '/api/dashboard/kpi', 200), ('t', '/api/dashboard/trends', 200)]
+    assert results[1]['data'] == client.get('/api/dashboard/trends?year=2025').get_json()
+
+
+def test_business_view_shares_reads(client):
+    metrics = client.application.extensions['kdt_metrics']
+    query = 'year=2025&month=3&program_like=분석'
+
+    def statements(*urls):
+        metrics.reset()
+        for url in urls:
+            assert client.get(url).status_code == 200
+        return {sql: int(st[0]) for sql, st in metrics.statements.items() if st[0]}
+
+    separate = statements(*(f'{path}?{query}' for _, path, _ in dashboard.BATCH_VIEWS['business']))
+    view = statements(f'/api/views/business?{query}')
+    assert sum(view.values()) < sum(separate.values())
+    assert sum(n for sql, n in view.items() if 'FROM revenue_by_month' in sql) == 1
+    # kdt_programs 전체 행도 한 번만 읽는다 (필터는 id만 고른다)
+    assert sum(n for sql, n in view.items() if sql.startswith('SELECT *, ')) == 1
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from conftest import dashboard
+
+CHANGE_LOG_TRIGGERS = {'kdt_programs_insert_changelog', 'kdt_programs_update_changelog',
+                       'kdt_programs_delete_changelog', 'kdt_change_log_prune'}
+URLS = ['/api/dashboard/kpi', '/api/dashboard/trends?year=2025', '/api/analytics/metrics?granularity=month']
+
+
+def program(i):
+    return {'과정명': f'과정 {i % 7}', '진행상태': '종강' if i % 3 else '진행중', '개강일': f'2025-{i % 12 + 1:02d}-01',
+            '종강일': f'2025-{i % 12 + 1:02d}-20', '년도': 2025, '분기': f'Q{i % 4 + 1}', '담당팀': '교육기획 1팀',
+            '정원': 30, 'HRD_확정': 20 + i % 10, '수료인원': 15 + i % 5, '취업인원': i % 12, 'HRD_만족도': 4 + i % 10 / 10}
+
+
+def installed(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'kdt_change_log'").fetchone() is not None
+    finally:
+        conn.close()
+    return triggers & CHANGE_LOG_TRIGGERS, has_table
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+
+
+def test_triggers_follow_the_snapshot_setting(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', False)
+    make_app()
+    assert installed(make_app.db_path) == (set(), False)
+
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', True)
+    make_app()
+    assert installed(make_app.db_path) == (CHANGE_LOG_TRIGGERS, True)
+
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', False)
+    client = make_app().test_client()
+    assert installed(make_app.db_path) == (set(), False)
+    assert client.post('/api/programs', json=program(1)).get_json()['success']
+
+
+def test_snapshot_is_rebuilt_when_the_log_was_dropped(make_app, monkeypatch):
+    # 스냅샷을 쓰는 워커(A)가 있는 동안 스냅샷을 끈 프로세스(B)가 트리거를 지우고 쓴다
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', True)
+    a = make_app().test_client()
+    ids = [a.post('/api/programs', json=program(i)).get_json()['id'] for i in range(20)]
+    a.get(URLS[0])  # 스냅샷 생성
+
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', False)
+    b = make_app().test_client()
+    for i, pid in enumerate(ids[:5]):
+        assert b.put(f'/api/programs/{pid}', json=program(100 + i)).get_json()['success']
+    assert b.delete(f'/api/programs/{ids[5]}').get_json()['success']
+    expected = [a.get(url).get_json() for url in URLS]
+
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', True)
+    assert [a.get(url).get_json() for url in URLS] == expected
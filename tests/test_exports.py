@@ -0,0 +1,49 @@
+import csv
+import io
+
+import pytest
+
+EXPORT_ROUTES = ['/api/programs/export', '/api/business/revenue-metrics/export', '/api/business/monthly-revenue/export']
+
+
+@pytest.fixture
+def client(make_app):
+    return make_app().test_client()
+
+
+@pytest.mark.parametrize('route', EXPORT_ROUTES)
+def test_unknown_format_is_400(client, route):
+    resp = client.get(f'{route}?format=pdf')
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('route', EXPORT_ROUTES)
+@pytest.mark.parametrize('fmt', ['csv', 'xlsx'])
+def test_known_formats_stream(client, route, fmt):
+    resp = client.get(f'{route}?format={fmt}')
+    assert resp.status_code == 200
+    assert resp.headers['Content-Disposition'].endswith(f'.{fmt}"')
+
+
+def test_revenue_metrics_export_rows_match_json(client):
+    for i in range(6):
+        client.post('/api/programs', json={
+            'HRD_Net_과정명': f'과정 {i % 2}', '회차': str(i // 2 + 1), '진행상태': '종강' if i < 4 else '진행중',
+            '년도': 2025, '개강일': f'2025-0{i + 1}-01' if i != 3 else None, '교육시간': 640,
+            'HRD_확정': 20, '수료인원': 15 + i})
+    items = client.get('/api/business/revenue-metrics?year=2025').get_json()['items']
+    rows = list(csv.reader(io.StringIO(client.get('/api/business/revenue-metrics/export?year=2025').get_data(as_text=True))))
+    header = ['program', 'course_code', 'round', 'quarter', 'expected', 'actual', 'gap', 'max', 'start']
+    assert rows[0] == ['\ufeffprogram'] + header[1:]
+    assert rows[1:] == [['' if it[c] is None else str(it[c]) for c in header] for it in items]
+
+
+@pytest.mark.parametrize('route', EXPORT_ROUTES[1:])
+def test_filename_uses_the_parsed_year(client, route):
+    assert client.get(f'{route}?year=all').headers['Content-Disposition'] == \
+        f'attachment; filename="{route.split("/")[-2]}-all.csv"'
+    assert client.get(f'{route}?year=2024').headers['Content-Disposition'] == \
+        f'attachment; filename="{route.split("/")[-2]}-2024.csv"'
+    resp = client.get(f'{route}?year=2024%22%3B%20filename%3Dx.exe')
+    assert resp.status_code == 400 and 'Content-Disposition' not in resp.headers
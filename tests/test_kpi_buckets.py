@@ -0,0 +1,170 @@
+"""KPI buckets (incrementally maintained sums) vs the row engine after writes.
+
+만족도 sums are kept exactly (SATISFACTION_SCALE integer units) and the mean is
+rounded like the original row engine (round(mean, 2)), so an average that lands
+on x.xx5 rounds the same whichever engine or summation order is used.
+"""
+import random
+import sqlite3
+
+import pytest
+
+from conftest import dashboard
+
+# 평균이 정확히 4.265 (부동소수로 순서대로 더하면 4.26499...)
+TIE_SATISFACTION = [4.0, 4.6, 3.8, 3.69, 4.56, 4.94]
+SATISFACTION = TIE_SATISFACTION + [4.26, 4.27, 4.5, None]
+TEAMS = ['교육기획 1팀', '교육기획 2팀', 'impact hub', ' Impact Hub ']
+STATUSES = ['종강', '진행중']
+BUCKET_TRIGGERS = {f'kdt_programs_{op}_kpi_buckets' for op in ('insert', 'update', 'delete')}
+
+URLS = [f'/api/dashboard/trends?year={y}' for y in ('', 2024, 2025)] + [
+    f'/api/dashboard/kpi?year={y}&quarter={q}&status={s}'
+    for y in ('', 2025) for q in ('', 'Q1') for s in ('', '종강')
+] + ['/api/dashboard/kpi?period=2024', '/api/education/stats', '/api/analytics/metrics?group_by=quarter']
+
+
+def program(rng):
+    y = rng.choice([2024, 2025])
+    q = rng.randint(1, 4)
+    m = 3 * (q - 1) + rng.randint(1, 3)
+    return {
+        '과정코드': f'C{rng.randint(1, 20)}',
+        'HRD_Net_과정명': '데이터 분석 과정',
+        '진행상태': rng.choice(STATUSES),
+        '개강일': f'{y}-{m:02d}-01',
+        '종강일': f'{y}-{m:02d}-{rng.randint(2, 28):02d}',
+        '년도': y,
+        '분기': f'Q{q}',
+        '담당팀': rng.choice(TEAMS),
+        '정원': rng.randint(20, 40),
+        'HRD_확정': rng.randint(10, 40),
+        '수료인원': rng.randint(5, 30),
+        '취업인원': rng.randint(0, 20),
+        '근로자': rng.randint(0, 3),
+        '취업산정제외인원': rng.randint(0, 3),
+        '수료산정 제외인원': rng.randint(0, 3),
+        'HRD_만족도': rng.choice(SATISFACTION),
+    }
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    # 엔진을 바꿔 가며 같은 URL을 비교하므로 결과 캐시는 끈다
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', True)
+    return make_app().test_client()
+
+
+def responses(client, monkeypatch, engine):
+    monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', engine == 'snapshot')
+    monkeypatch.setattr(dashboard, 'KPI_BUCKETS', engine != 'rows')
+    return {url: client.get(url).get_json() for url in URLS}
+
+
+def post_satisfaction(client, values):
+    assert client.post('/api/programs/reset').get_json()['success']
+    for i, satisfaction in enumerate(values):
+        row = program(random.Random(i))
+        row.update({'진행상태': '종강', '년도': 2025, '분기': 'Q1', '종강일': f'2025-03-{i + 10}',
+                    '담당팀': '교육기획 1팀', 'HRD_만족도': satisfaction})
+        assert client.post('/api/programs', json=row).get_json()['success']
+
+
+def kpi_satisfaction(client, monkeypatch):
+    by_engine = {}
+    for engine in ('rows', 'buckets', 'snapshot'):
+        monkeypatch.setattr(dashboard, 'PROGRAM_SNAPSHOT', engine == 'snapshot')
+        monkeypatch.setattr(dashboard, 'KPI_BUCKETS', engine != 'rows')
+        kpi = client.get('/api/dashboard/kpi?year=2025&quarter=Q1').get_json()['만족도']
+        trends = client.get('/api/dashboard/trends?year=2025').get_json()[0]
+        assert trends['quarter'] == 'Q1' and trends['만족도'] == round(kpi / 5 * 100, 2), engine
+        by_engine[engine] = kpi
+    return by_engine
+
+
+def test_satisfaction_tie_rounds_the_same_in_every_engine(client, monkeypatch):
+    post_satisfaction(client, TIE_SATISFACTION)
+    assert kpi_satisfaction(client, monkeypatch) == {'rows': 4.26, 'buckets': 4.26, 'snapshot': 4.26}
+
+
+def is_tie(values):
+    # 평균이 정확히 x.xx5인지 (값은 소수 둘째 자리까지)
+    tenths_of_cents = sum(round(v * 100) for v in values) * 10
+    return tenths_of_cents % len(values) == 0 and tenths_of_cents // len(values) % 10 == 5
+
+
+def test_satisfaction_matches_the_original_engine(client, monkeypatch):
+    # 원래 엔진: 행 순서대로 float를 더해 round(sum / n, 2). x.xx5가 아닌 평균은 그대로 같다.
+    rng = random.Random(7)
+    cases = [[rng.randint(300, 500) / 100 for _ in range(rng.randint(1, 6))] for _ in range(40)]
+    for values in [v for v in cases if not is_tie(v)][:12]:
+        post_satisfaction(client, values)
+        assert set(kpi_satisfaction(client, monkeypatch).values()) == {round(sum(values) / len(values), 2)}, values
+
+    # x.xx5 평균은 float 합의 오차 방향에 따라 원래 엔진이 올리기도 한다 (3.09 + 3.22 = 6.3100000000000005).
+    # 정확한 합의 평균 3.155는 float로 3.15499...라 round(mean, 2)는 3.15 (차이는 최대 0.01)
+    post_satisfaction(client, [3.09, 3.22])
+    assert round((3.09 + 3.22) / 2, 2) == 3.16
+    assert kpi_satisfaction(client, monkeypatch) == {'rows': 3.15, 'buckets': 3.15, 'snapshot': 3.15}
+
+
+def test_buckets_match_rows_after_writes(client, monkeypatch):
+    rng = random.Random(23)
+    ids = []
+    for _ in range(60):
+        ids.append(client.post('/api/programs', json=program(rng)).get_json()['id'])
+    for _ in range(150):
+        op = rng.random()
+        if op < 0.6:
+            pid = rng.choice(ids)
+            assert client.put(f'/api/programs/{pid}', json=program(rng)).get_json()['success']
+        elif op < 0.8 or len(ids) < 10:
+            ids.append(client.post('/api/programs', json=program(rng)).get_json()['id'])
+        else:
+            pid = ids.pop(rng.randrange(len(ids)))
+            assert client.delete(f'/api/programs/{pid}').get_json()['success']
+
+    expected = responses(client, monkeypatch, 'rows')
+    assert responses(client, monkeypatch, 'buckets') == expected
+    assert responses(client, monkeypatch, 'snapshot') == expected
+
+
+def test_buckets_match_rows_after_reset(client, monkeypatch):
+    rng = random.Random(5)
+    for _ in range(20):
+        client.post('/api/programs', json=program(rng))
+    assert client.post('/api/programs/reset').get_json()['success']
+    for _ in range(10):
+        client.post('/api/programs', json=program(rng))
+
+    expected = responses(client, monkeypatch, 'rows')
+    assert responses(client, monkeypatch, 'buckets') == expected
+    assert responses(client, monkeypatch, 'snapshot') == expected
+
+
+def installed(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        has_table = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'kpi_buckets'").fetchone() is not None
+        state = conn.execute("SELECT version FROM kdt_derived_state WHERE name = 'kpi_buckets'").fetchall()
+    finally:
+        conn.close()
+    return triggers & BUCKET_TRIGGERS, has_table, state
+
+
+def test_disabling_buckets_drops_triggers_and_table(client, make_app, monkeypatch):
+    assert installed(make_app.db_path)[:2] == (BUCKET_TRIGGERS, True)
+
+    monkeypatch.setattr(dashboard, 'KPI_BUCKETS', False)
+    disabled = make_app().test_client()
+    assert installed(make_app.db_path) == (set(), False, [])
+    assert disabled.post('/api/programs', json=program(random.Random(1))).get_json()['success']
+    assert disabled.post('/api/admin/kpi-buckets/rebuild').status_code == 400
+    assert installed(make_app.db_path) == (set(), False, [])
+
+    monkeypatch.setattr(dashboard, 'KPI_BUCKETS', True)
+    client = make_app().test_client()
+    assert installed(make_app.db_path)[:2] == (BUCKET_TRIGGERS, True)
+    assert responses(client, monkeypatch, 'buckets') == responses(client, monkeypatch, 'rows')
@@ -0,0 +1,187 @@
+"""SQL KPI engine (kpi_groups_sql + calc_kpis_from_groups) vs the row engine (calc_kpis).
+
+The row engine is the reference: the dashboard rule is 모집률 from rows ending in the
+period year, 수료율/만족도 from those with status 종강, and 취업률 from 종강 rows
+ending inside the employment window with a 수료인원 value.
+"""
+import random
+import sqlite3
+from datetime import date
+
+import pytest
+
+from conftest import dashboard, insert_programs, quote_ident
+
+# 앱이 만드는 kdt_programs와 같은 열 (create_untyped_table에서 타입 없이 만든다)
+COLUMNS = [
+    '과정코드', 'HRD_Net_과정명', '과정명', '회차', '기수', '배치', '진행상태', '개강일', '종강일', '개강', '종강',
+    '년도', '분기', '담당팀', '팀', '과정구분', '교육시간', '정원', 'HRD_확정', '중도이탈', '수료인원', '취업인원',
+    '근로자', '취업산정제외인원', '수료산정 제외인원', '제외', 'HRD_만족도',
+]
+
+TEAMS = ['교육기획 1팀', '교육기획 2팀', 'impact hub', ' Impact Hub ', 'IMPACT HUB', '　impact hub　',
+         '교육운영팀', None, '']
+STATUSES = ['종강', ' 종강 ', '진행중', '모집중', None, '']
+# 숫자로 읽히지 않는 값들: parse_int/parse_float에서 0 (None은 만족도 집계에서도 빠짐)
+ODD_NUMBERS = [None, '', ' ', 'x', '3.5', '1,200', '12']
+ODD_SATISFACTION = [None, '', 'x', '4.5', ' 4.25 ', 5, 4]
+
+PERIODS = [
+    dashboard.DEFAULT_KPI_PERIOD,
+    dashboard.make_kpi_period(2024),
+    dashboard.make_kpi_period(2025, date(2024, 3, 15), date(2025, 2, 10)),
+    dashboard.make_kpi_period(2025, excluded_teams='교육운영팀, Impact Hub'),
+    dashboard.make_kpi_period(2026, excluded_teams=''),
+]
+
+FILTERS = [
+    {'year': year, 'quarter': quarter, 'category': category, 'status': status}
+    for year in (None, '2024', '2025')
+    for quarter in (None, 'Q1', 'Q3')
+    for category in (None, '교육기획 1팀', 'impact hub')
+    for status in (None, '종강')
+]
+
+
+def fmt_date(rng, y, m, d):
+    k = rng.random()
+    if k < 0.55:
+        return f"{y:04d}-{m:02d}-{d:02d}"
+    if k < 0.7:
+        return f"{y}.{m}.{d}"
+    if k < 0.8:
+        return f"{y}/{m:02d}/{d:02d}"
+    if k < 0.88:
+        return f"{y}-{m}-{d}"
+    if k < 0.92:
+        return f"{y}-02-30"
+    return rng.choice([None, ''])
+
+
+def number(rng, hi):
+    return rng.choice(ODD_NUMBERS) if rng.random() < 0.15 else rng.randint(0, hi)
+
+
+def seed_rows(n=400, seed=20250101):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        y = rng.choice([2023, 2024, 2025, 2026])
+        m = rng.randint(1, 12)
+        end_m = m + rng.randint(1, 10)
+        ey, em = y + (end_m - 1) // 12, (end_m - 1) % 12 + 1
+        end = fmt_date(rng, ey, em, rng.randint(1, 28))
+        if rng.random() < 0.2:
+            satisfaction = rng.choice(ODD_SATISFACTION)
+        else:
+            satisfaction = round(rng.uniform(3.5, 5.0), 2)
+        rows.append({
+            '진행상태': rng.choice(STATUSES),
+            '개강일': fmt_date(rng, y, m, rng.randint(1, 28)),
+            '종강일': end,
+            '종강': fmt_date(rng, ey, em, 5) if rng.random() < 0.2 else None,
+            '년도': rng.choice([y, ey, str(ey)]),
+            '분기': rng.choice(['Q1', 'Q2', 'Q3', 'Q4', '', None]),
+            '담당팀': rng.choice(TEAMS),
+            '정원': number(rng, 60),
+            'HRD_확정': number(rng, 60),
+            '수료인원': number(rng, 50),
+            '취업인원': number(rng, 40),
+            '근로자': number(rng, 5),
+            '취업산정제외인원': number(rng, 5),
+            '수료산정 제외인원': number(rng, 5),
+            'HRD_만족도': satisfaction,
+        })
+    return rows
+
+
+def create_untyped_table(db_path):
+    # 엑셀 등에서 가져온 테이블처럼 숫자 열에 타입이 없어 '12' 같은 TEXT 값이 그대로 남는 스키마
+    conn = sqlite3.connect(db_path)
+    try:
+        cols = ', '.join(quote_ident(c) for c in COLUMNS)
+        conn.execute(f"CREATE TABLE kdt_programs (id INTEGER PRIMARY KEY AUTOINCREMENT, {cols})")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def seeded_app(make_app, schema, rows):
+    if schema == 'typed':
+        make_app()  # 앱 스키마로 테이블 생성
+    else:
+        create_untyped_table(make_app.db_path)
+    insert_programs(make_app.db_path, rows)
+    # 날짜 정규화는 처음 시작할 때 한 번뿐이므로 typed 스키마에는 ISO가 아닌 날짜가 그대로 남는다
+    return make_app()
+
+
+def reference_kpis(kpi, conn, mapping, where, params, period):
+    calc_kpis, row_end_date = kpi['calc_kpis'], kpi['row_end_date']
+    rows = [dict(r) for r in conn.execute(f"SELECT * FROM kdt_programs {where} ORDER BY id", params).fetchall()]
+    end_col, status_col, completed_col = mapping.get('end'), mapping.get('status'), mapping.get('completed')
+
+    def done(r):
+        return bool(status_col) and str(r.get(status_col, '')).strip() == '종강'
+
+    def in_window(r):
+        if not done(r):
+            return False
+        cv = r.get(completed_col) if completed_col else 0
+        if cv is None or (isinstance(cv, str) and cv.strip() == ''):
+            return False
+        dt = row_end_date(r, end_col)
+        return bool(dt and period.window_start <= dt <= period.window_end)
+
+    end_year_rows = [r for r in rows if (row_end_date(r, end_col) or date.min).year == period.year]
+    return {
+        'all': calc_kpis(rows, mapping, period),
+        'dashboard': kpi['dashboard_kpi_set'](
+            calc_kpis(end_year_rows, mapping, period),
+            calc_kpis([r for r in end_year_rows if done(r)], mapping, period),
+            calc_kpis([r for r in rows if in_window(r)], mapping, period),
+        ),
+    }
+
+
+def sql_kpis(kpi, conn, mapping, where, params, period):
+    from_groups = kpi['calc_kpis_from_groups']
+    groups = kpi['kpi_groups_sql'](conn, mapping, where, params, period)
+    return {
+        'all': from_groups(groups, lambda g: True),
+        'dashboard': kpi['dashboard_kpi_set'](
+            from_groups(groups, lambda g: g['end_year']),
+            from_groups(groups, lambda g: g['end_year'] and g['done']),
+            from_groups(groups, lambda g: g['in_window']),
+        ),
+    }
+
+
+@pytest.mark.parametrize('schema', ['typed', 'untyped'])
+def test_sql_engine_matches_row_engine(make_app, read_conn, schema):
+    flask_app = seeded_app(make_app, schema, seed_rows())
+    kpi = flask_app.extensions['kdt_kpi']
+    conn = read_conn(flask_app)
+    mapping = kpi['get_schema_mapping'](conn)
+    for filters in FILTERS:
+        where, params = kpi['build_program_filters'](filters, mapping)
+        for period in PERIODS:
+            expected = reference_kpis(kpi, conn, mapping, where, params, period)
+            assert sql_kpis(kpi, conn, mapping, where, params, period) == expected, (filters, period)
+
+
+def test_text_numbers_read_like_parse_int(make_app, read_conn):
+    # TEXT로 남은 숫자: '12'/' 6 '은 숫자로, '1,200'/'3.5'(정수 열)/'x'/''는 0으로 (parse_int/parse_float)
+    rows = [
+        {'진행상태': '종강', '종강일': '2025-03-01', '담당팀': '교육기획 1팀', '정원': '12', 'HRD_확정': ' 6 ',
+         '수료인원': '5', '취업인원': 'x', '근로자': '', 'HRD_만족도': '4.5'},
+        {'진행상태': '종강', '종강일': '2025.3.2', '담당팀': '교육기획 1팀', '정원': '1,200', 'HRD_확정': '3.5',
+         '수료인원': '', '취업인원': '2', '근로자': None, 'HRD_만족도': ''},
+    ]
+    flask_app = seeded_app(make_app, 'untyped', rows)
+    kpi = flask_app.extensions['kdt_kpi']
+    conn = read_conn(flask_app)
+    mapping = kpi['get_schema_mapping'](conn)
+    expected = {'모집률': 50.0, '수료율': 83.33, '취업률': 40.0, '만족도': 2.25}
+    assert kpi['calc_kpis'](list(map(dict, conn.execute("SELECT * FROM kdt_programs"))), mapping) == expected
+    assert kpi['calc_kpis_from_groups'](kpi['kpi_groups_sql'](conn, mapping), lambda g: True) == expected
@@ -0,0 +1,35 @@
+import logging
+
+import pytest
+
+from conftest import dashboard
+
+KPI_ROUTES = ['/api/dashboard/kpi', '/api/dashboard/trends', '/api/education/stats',
+              '/api/analytics/metrics', '/api/filters/kpi-periods']
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+    return make_app().test_client()
+
+
+@pytest.mark.parametrize('route', KPI_ROUTES)
+@pytest.mark.parametrize('query', ['period=20x5', 'window_start=2025-13-01', 'period=2025&window_start=2025-07-01'])
+def test_bad_period_args_are_400(client, route, query):
+    resp = client.get(f'{route}?{query}')
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('route', KPI_ROUTES)
+def test_internal_value_error_is_logged_not_400(client, route, monkeypatch, caplog):
+    def broken(*args, **kwargs):
+        raise ValueError('internal')
+
+    monkeypatch.setattr(dashboard, 'make_kpi_period', broken)
+    monkeypatch.setattr(dashboard.logger, 'handlers', dashboard.logger.handlers + [caplog.handler])
+    with caplog.at_level(logging.ERROR, logger=dashboard.logger.name):
+        resp = client.get(f'{route}?period=2024')
+    assert resp.status_code == 200
+    assert any('internal' in r.getMessage() for r in caplog.records)
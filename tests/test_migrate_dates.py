@@ -0,0 +1,59 @@
+import sqlite3
+
+import pytest
+
+from conftest import dashboard, insert_programs
+
+LEGACY_ROWS = [
+    {'과정명': '데이터 분석', '진행상태': '종강', '개강일': '2024.9.2', '종강일': '2025/03/01', '년도': 2025,
+     'HRD_확정': 20, '수료인원': 18, '취업인원': 9},
+    {'과정명': '클라우드', '진행상태': '종강', '개강일': '2024-10-01', '종강일': '2025-2-30', '년도': 2025,
+     'HRD_확정': 10, '수료인원': 10, '취업인원': 10},
+]
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(autouse=True)
+def no_result_cache(monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+
+
+def test_dates_are_normalized_once_and_originals_kept(make_app, monkeypatch):
+    # 예전 DB: 마커 없이 ISO가 아닌 날짜가 저장돼 있다
+    monkeypatch.setattr(dashboard, 'MIGRATE_DATES', False)
+    make_app()
+    insert_programs(make_app.db_path, LEGACY_ROWS)
+
+    monkeypatch.setattr(dashboard, 'MIGRATE_DATES', True)
+    make_app()
+    assert query(make_app.db_path, "SELECT 개강일, 종강일 FROM kdt_programs ORDER BY id") == [
+        ('2024-09-02', '2025-03-01'), ('2024-10-01', '2025-2-30')]
+    assert query(make_app.db_path, "SELECT program_id, column_name, original FROM kdt_date_backfill ORDER BY 1, 2") == [
+        (1, '개강일', '2024.9.2'), (1, '종강일', '2025/03/01')]
+
+    # 이후 시작에서는 다시 고치지 않는다
+    insert_programs(make_app.db_path, [dict(LEGACY_ROWS[0], 종강일='2025.4.1')])
+    make_app()
+    assert query(make_app.db_path, "SELECT 종강일 FROM kdt_programs WHERE id = 3") == [('2025.4.1',)]
+
+
+def test_unmigrated_dates_read_like_iso(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'KPI_BUCKETS', False)
+    client = make_app().test_client()
+    insert_programs(make_app.db_path, LEGACY_ROWS)
+    raw = [client.get(url).get_json() for url in ('/api/dashboard/kpi', '/api/dashboard/trends?year=2025')]
+
+    conn = sqlite3.connect(make_app.db_path)
+    conn.execute("UPDATE kdt_programs SET 개강일 = '2024-09-02', 종강일 = '2025-03-01' WHERE id = 1")
+    conn.commit()
+    conn.close()
+    assert [client.get(url).get_json() for url in ('/api/dashboard/kpi', '/api/dashboard/trends?year=2025')] == raw
+    # 종강일 2025/03/01은 대상 연도 종강, 2025-2-30은 날짜가 아니다
+    assert raw[0]['수료율'] == 90.0
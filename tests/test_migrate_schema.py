@@ -0,0 +1,21 @@
+import sqlite3
+
+
+def test_legacy_column_is_renamed_on_startup(make_app):
+    # 예전 DB: "수료산정 제외인원" 대신 산정제외 열
+    conn = sqlite3.connect(make_app.db_path)
+    conn.execute("CREATE TABLE kdt_programs (id INTEGER PRIMARY KEY AUTOINCREMENT, 과정명 TEXT, 진행상태 TEXT, "
+                 "종강일 TEXT, HRD_확정 INTEGER, 수료인원 INTEGER, 산정제외 INTEGER)")
+    conn.execute("INSERT INTO kdt_programs (과정명, 진행상태, 종강일, HRD_확정, 수료인원, 산정제외) "
+                 "VALUES ('데이터 분석', '종강', '2025-03-01', 22, 18, 2)")
+    conn.commit()
+    conn.close()
+
+    client = make_app().test_client()
+
+    conn = sqlite3.connect(make_app.db_path)
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(kdt_programs)")]
+    conn.close()
+    assert '산정제외' not in cols and '수료산정 제외인원' in cols
+    # 수료율 = 18 / (22 - 2)
+    assert client.get('/api/dashboard/kpi').get_json()['수료율'] == 90.0
@@ -0,0 +1,83 @@
+"""Read fan-out (concurrent_reads, asgi.py's business page) with a small pool and concurrent requests.
+
+Every request already holds one read connection when it fans out; if the
+extra loads waited on the same pool, concurrent requests would deadlock until
+the pool timeout and come back empty.
+"""
+import asyncio
+import importlib
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import dashboard
+
+URLS = ['/api/business/yearly-monthly-revenue?year=2025', '/api/business/monthly-revenue?year=2025']
+
+
+def program(i):
+    return {'과정명': f'과정 {i}', '회차': '1', '진행상태': '진행중', '년도': 2025, '개강일': f'2025-0{i + 1}-03',
+            '종강일': '2025-09-30', '교육시간': 760, 'HRD_확정': 20,
+            'monthly_hours': {'1M': 100, '2M': 120}, 'monthly_enrollments': {'1M': 10, '2M': 9}}
+
+
+@pytest.fixture
+def flask_app(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+    monkeypatch.setattr(dashboard, 'DB_POOL_SIZE', 2)
+    monkeypatch.setattr(dashboard, 'DB_POOL_TIMEOUT', 2)
+    monkeypatch.setattr(dashboard, 'READ_FANOUT_WORKERS', 2)
+    flask_app = make_app()
+    client = flask_app.test_client()
+    for i in range(5):
+        assert client.post('/api/programs', json=program(i)).get_json()['success']
+    return flask_app
+
+
+def test_concurrent_requests_share_a_small_pool(flask_app):
+    expected = {url: flask_app.test_client().get(url).get_json() for url in URLS}
+    assert expected[URLS[0]]['monthly_totals']['3'] > 0 and expected[URLS[1]]['items']
+
+    def fetch(n):
+        url = URLS[n % len(URLS)]
+        return url, flask_app.test_client().get(url).get_json()
+
+    with ThreadPoolExecutor(16) as executor:
+        results = list(executor.map(fetch, range(64)))
+    for url, body in results:
+        assert body == expected[url], url
+
+
+def test_asgi_business_page_under_load(flask_app, monkeypatch):
+    monkeypatch.setenv('KDT_WARMUP', '0')
+    for name in ('wsgi', 'asgi'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    asgi = importlib.import_module('asgi')
+    sys.modules['wsgi'].release_connections(asgi.flask_app)
+    monkeypatch.setattr(asgi, 'flask_app', flask_app)
+
+    async def page():
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': asgi.BUSINESS_PAGE_PATH,
+                 'query_string': b'year=2025&month=3', 'headers': []}
+        await asgi.app(scope, None, send)
+        return messages
+
+    async def pages():
+        return await asyncio.gather(*(page() for _ in range(12)))
+
+    try:
+        results = asyncio.run(pages())
+    finally:
+        asgi.executor.shutdown()
+    expected = flask_app.test_client().get('/api/views/business?year=2025&month=3').get_json()
+    assert expected['yearly_monthly_revenue']['monthly_totals']['3'] > 0
+    for start, body in results:
+        assert start['status'] == 200
+        assert json.loads(body['body']) == expected
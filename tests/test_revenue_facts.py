@@ -0,0 +1,53 @@
+"""revenue_by_month after writes made outside the app (other tools editing the DB directly)."""
+import sqlite3
+
+import pytest
+
+from conftest import dashboard
+
+URLS = ['/api/business/yearly-monthly-revenue?year=2025', '/api/business/monthly-expected?year=2025&month=3',
+        '/api/business/monthly-revenue?year=2025']
+
+
+def program(i):
+    return {'과정명': f'과정 {i}', '회차': '1', '진행상태': '진행중', '년도': 2025, '개강일': '2025-02-03',
+            '종강일': '2025-07-31', '교육시간': 760, 'HRD_확정': 20,
+            'monthly_hours': {'1M': 100, '2M': 120}, 'monthly_enrollments': {'1M': 10, '2M': 10}}
+
+
+def execute(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(sql)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def client(make_app, monkeypatch):
+    monkeypatch.setattr(dashboard, 'RESULT_CACHE_SIZE', 0)
+    client = make_app().test_client()
+    for i in range(3):
+        assert client.post('/api/programs', json=program(i)).get_json()['success']
+    return client
+
+
+def test_reads_see_direct_writes(client, make_app):
+    before = client.get(URLS[0]).get_json()['monthly_totals']
+    assert before['3'] == 3 * 120 * 10 * 18150
+    execute(make_app.db_path, 'UPDATE kdt_monthly_enrollments SET "2M" = 20')
+
+    responses = [client.get(url).get_json() for url in URLS]
+    assert responses[0]['monthly_totals']['3'] == 3 * 120 * 20 * 18150
+    assert responses[1]['total'] == 3 * 120 * 20 * 18150
+    # 다시 시작해 전부 다시 계산한 결과와 같다
+    restarted = make_app().test_client()
+    assert [restarted.get(url).get_json() for url in URLS] == responses
+
+
+def test_app_write_after_direct_write_rebuilds_all(client, make_app):
+    execute(make_app.db_path, 'UPDATE kdt_monthly_hours SET "2M" = 0 WHERE id = 1')
+    assert client.put('/api/programs/2', json=dict(program(1), 교육시간=800)).get_json()['success']
+
+    assert client.get(URLS[0]).get_json()['monthly_totals']['3'] == 2 * 120 * 10 * 18150
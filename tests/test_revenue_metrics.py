@@ -0,0 +1,61 @@
+"""/api/business/revenue-metrics response bytes against golden files.
+
+The golden files were produced by the per-group implementation that
+revenue_metrics_report() replaced (group rows into lists, re-sum the previous
+round for every group), run on the rows seeded below.
+"""
+import os
+import random
+
+import pytest
+
+from conftest import dashboard, insert_programs
+
+GOLDEN_DIR = os.path.join(os.path.dirname(__file__), 'golden')
+YEARS = ['2023', '2024', '2025', 'all']
+
+NAMES = ['AI 서비스 기획 개발 과정', '데이터 분석 스쿨', ' 클라우드 엔지니어링 ', '', None]
+# 회차: 앞뒤 공백/0 채움/숫자가 아닌 값/위 첨자(isdigit()은 참이지만 int()는 실패)
+ROUNDS = ['1', '2', '3', '02', ' 3 ', '10', '²', 'x', '', None]
+
+
+def seed_rows(n=300, seed=13):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        y = rng.choice([2023, 2024, 2025])
+        m = rng.randint(1, 12)
+        start = rng.choice([f'{y}-{m:02d}-{rng.randint(1, 28):02d}', f'{y}.{m}.{rng.randint(1, 28)}',
+                            f'{y}-02-30', '', None])
+        rows.append({
+            '과정코드': rng.choice([f'K{rng.randint(1, 9)}', ' K1 ', '', None]),
+            'HRD_Net_과정명': rng.choice(NAMES),
+            '과정명': rng.choice(['대체 과정명', '', None]),
+            '기수': rng.choice(ROUNDS),
+            '진행상태': rng.choice(['종강', ' 종강 ', '진행중', None]),
+            '개강일': start,
+            '개강': rng.choice([f'{y}-{m:02d}-05', None]) if not start else None,
+            '년도': rng.choice([y, str(y)]),
+            '분기': rng.choice(['Q1', 'Q2', 'Q3', 'Q4', None]),
+            '교육시간': rng.choice([640, 760, 920, '', None]),
+            'HRD_확정': rng.choice([rng.randint(0, 40), rng.randint(0, 40), '', 'x']),
+            '수료인원': rng.choice([rng.randint(0, 30), rng.randint(0, 30), '', None]),
+            '수료산정 제외인원': rng.choice([0, 0, 1, 2, None]),
+        })
+    return rows
+
+
+@pytest.fixture
+def client(make_app):
+    make_app()
+    insert_programs(make_app.db_path, seed_rows())
+    return make_app().test_client()
+
+
+@pytest.mark.parametrize('year', YEARS)
+def test_revenue_metrics_matches_golden(client, year):
+    with open(os.path.join(GOLDEN_DIR, f'revenue_metrics_{year}.json'), 'rb') as f:
+        expected = f.read()
+    resp = client.get(f'/api/business/revenue-metrics?year={year}')
+    assert resp.status_code == 200
+    assert resp.get_data() == expected